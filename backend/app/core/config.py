@@ -1,6 +1,6 @@
 """Core application settings and configuration"""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -59,6 +59,50 @@ class Settings(BaseSettings):
     AGENT_TIMEOUT: int = 300  # 5 minutes
     AGENT_MAX_RETRIES: int = 3
 
+    # Workflow Execution
+    WORKFLOW_MAX_PARALLEL_NODES: int = 8  # Concurrent nodes per run
+    WORKFLOW_PLAN_CACHE_SIZE: int = 256  # Compiled workflow versions kept in process
+    RELEASE_NODE_OUTPUTS: bool = True  # Drop in-memory node outputs once every node reading them has finished
+    RUN_STATE_FLUSH_INTERVAL: float = 0.25  # Seconds to coalesce run state updates before writing
+    RUN_STATE_MAX_PENDING: int = 50  # Flush early once this many updates are buffered
+    STREAM_BATCH_SIZE: int = 500  # Records per batch streamed between nodes
+    STREAM_MAX_BUFFERED_BATCHES: int = 4  # Batches a stream producer may run ahead of its consumer
+    NODE_MEMO_TTLS: Dict[str, int] = {}  # Node type -> seconds to reuse results across runs, e.g. {"transformer": 3600}
+    NODE_PLUGINS: Dict[str, Any] = {}  # Custom node type -> "module:function" or {"handler": ..., "cacheable": true, ...}
+
+    # Run Queue Configuration
+    RUN_QUEUE_WORKERS: int = 4  # Concurrent runs per process (keep below Mongo pool size)
+    RUN_QUEUE_MAX_DEPTH: int = 1000  # Reject new runs beyond this many queued (0 = unbounded)
+    RUN_QUEUE_POLL_INTERVAL: float = 1.0  # Seconds between queue polls when idle
+    RUN_QUEUE_BACKEND: str = "local"  # "local" (in-process workers) or "redis-stream" (app.worker processes)
+    RUN_STREAM_KEY: str = "workflow:runs"
+    RUN_STREAM_GROUP: str = "workflow-workers"
+    RUN_STREAM_CLAIM_IDLE_MS: int = 60000  # Reclaim entries of workers silent for this long
+    RUN_QUEUE_DRAIN_TIMEOUT: float = 20.0  # Seconds in-flight runs may finish on shutdown before being interrupted
+    RUN_HEARTBEAT_INTERVAL: float = 15.0  # Seconds between liveness updates of running runs
+    RUN_STALE_AFTER: float = 90.0  # Running runs without a heartbeat for this long are recovered on startup
+    RUN_TIMER_KEY: str = "workflow:timers"  # Sorted set of parked runs' wake-up times (redis-stream backend)
+    RUN_TIMER_POLL_INTERVAL: float = 1.0  # Seconds between checks for parked runs that are due
+    DELAY_INLINE_MAX: float = 30.0  # Delays up to this many seconds sleep in process; longer ones park the run
+
+    # HTTP Client (webhook nodes)
+    HTTP_POOL_LIMIT: int = 200  # Open connections in total
+    HTTP_POOL_LIMIT_PER_HOST: int = 20  # Open connections per host
+    HTTP_KEEPALIVE_TIMEOUT: float = 30.0  # Seconds idle connections are kept for reuse
+    HTTP_DNS_CACHE_TTL: int = 300  # Seconds resolved addresses are cached
+
+    # SMTP Pool (email nodes and OTP emails)
+    SMTP_POOL_SIZE: int = 4  # Open sessions per SMTP server
+    SMTP_POOL_IDLE_TIMEOUT: float = 60.0  # Seconds idle sessions are kept for reuse
+    SMTP_POOL_MAX_MESSAGES: int = 100  # Messages per session before it is recycled (0 = unlimited)
+    SMTP_TIMEOUT: float = 30.0  # Seconds to wait on SMTP commands
+    SMTP_BULK_PER_DOMAIN_RATE: float = 5.0  # Bulk emails per second per recipient domain (0 = unthrottled)
+
+    # Resilience (webhook, email and LLM calls)
+    CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive failures that open a target's circuit
+    CIRCUIT_RECOVERY_TIMEOUT: float = 30.0  # Seconds a circuit stays open before a trial call
+    RETRY_MAX_DELAY: float = 30.0  # Longest backoff (and Retry-After) waited between retries
+
     # Model Configuration
     DEFAULT_COMMUNICATION_MODEL: str = "google/gemini-2.0-flash-exp:free"
     DEFAULT_REASONING_MODEL: str = "meta-llama/llama-3.3-70b-instruct:free"
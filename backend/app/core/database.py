@@ -37,14 +37,14 @@ async def connect_to_mongo():
         await client.admin.command('ping')
 
         # Initialize Beanie with document models
-        from app.models.workflow import Workflow, WorkflowRun
+        from app.models.workflow import Workflow, WorkflowRun, RunEvent
 
         database = client[settings.DATABASE_NAME]
         await init_beanie(
             database=database,
-            document_models=[Workflow, WorkflowRun]
+            document_models=[Workflow, WorkflowRun, RunEvent]
         )
-        logger.info("Beanie initialized with collections: Workflow, WorkflowRun")
+        logger.info("Beanie initialized with collections: Workflow, WorkflowRun, RunEvent")
 
     except Exception as e:
         # Log error and raise - don't start app without database
@@ -16,6 +16,10 @@ from app.core.config import settings
 from app.routes import auth_router, users_router, workflow_router
 from app.routes.ai import router as ai_router
 from app.services.ai_service_manager import ai_service_manager
+from app.services.run_queue import run_queue
+from app.services.timer_service import timer_service
+from app.services.http_client import http_client
+from app.services.smtp_pool import smtp_pool
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -46,8 +50,34 @@ async def lifespan(app: FastAPI):
         await ai_service_manager.initialize()
         logger.info("Startup: AI services initialized")
 
+        # Start run queue workers
+        await run_queue.start()
+        logger.info("Startup: Run queue workers started")
+
+        # Requeue runs interrupted by the previous shutdown or crash
+        recovered = await run_queue.recover()
+        logger.info(f"Startup: Recovered {len(recovered)} interrupted runs")
+
+        # Requeue runs parked by delay nodes when their wake-up time comes
+        await timer_service.start(wake=run_queue.wake)
+        logger.info("Startup: Timer service started")
+
         yield
     finally:
+        # Stop waking parked runs (their wake-up times stay persisted)
+        await timer_service.stop()
+
+        # Stop accepting runs and drain in-flight ones (interrupted runs stay resumable)
+        await run_queue.stop()
+        logger.info("Shutdown: Run queue drained and workers stopped")
+
+        # Close pooled outbound HTTP connections
+        await http_client.close()
+        logger.info("Shutdown: HTTP client pool closed")
+
+        # Close pooled SMTP sessions
+        await smtp_pool.close()
+
         # Shutdown AI services
         await ai_service_manager.shutdown()
         logger.info("Shutdown: AI services closed")
@@ -3,12 +3,14 @@ from .workflow import (
     VariableType,
     VariableScope,
     ExecutionStatus,
+    RunEventKind,
     Node,
     Edge,
     WorkflowVariable,
     Metadata,
     Workflow,
-    WorkflowRun
+    WorkflowRun,
+    RunEvent
 )
 
 __all__ = [
@@ -16,10 +18,12 @@ __all__ = [
     "VariableType",
     "VariableScope",
     "ExecutionStatus",
+    "RunEventKind",
     "Node",
     "Edge",
     "WorkflowVariable",
     "Metadata",
     "Workflow",
-    "WorkflowRun"
+    "WorkflowRun",
+    "RunEvent"
 ]
\ No newline at end of file
@@ -4,6 +4,7 @@ from datetime import datetime
 from beanie import Document
 from pydantic import BaseModel, Field
 from bson import ObjectId
+from pymongo import IndexModel, ASCENDING, DESCENDING
 
 # Enums
 class WorkflowStatus(str, Enum):
@@ -29,6 +30,12 @@ class ExecutionStatus(str, Enum):
     SUCCESS = "success"
     ERROR = "error"
     PAUSED = "paused"
+    WAITING = "waiting"  # Parked by a delay node until its wake-up time
+
+class RunEventKind(str, Enum):
+    LOG = "log"
+    ERROR = "error"
+    COMMUNICATION = "communication"
 
 # Nested Models
 class Node(BaseModel):
@@ -40,6 +47,7 @@ class Node(BaseModel):
 class Edge(BaseModel):
     from_: str = Field(..., alias="from")
     to: str
+    branch: Optional[str] = None  # Taken only when the source node's result selects this branch
 
     model_config = {
         "populate_by_name": True
@@ -60,6 +68,11 @@ class Metadata(BaseModel):
     author: Optional[str] = None
     version: Optional[str] = None
 
+    # Execution options (e.g. communication_mode, max_parallel_nodes)
+    model_config = {
+        "extra": "allow"
+    }
+
 # Main Document Models
 class Workflow(Document):
     name: str
@@ -89,13 +102,64 @@ class WorkflowRun(Document):
     logs: Optional[List[Dict[str, Any]]] = []
     communication_log: Optional[List[Dict[str, Any]]] = []
 
+    # Run queue bookkeeping
+    priority: int = 0
+    queued_at: Optional[datetime] = None
+    claimed_at: Optional[datetime] = None
+    worker_id: Optional[str] = None
+    attempts: int = 0
+    heartbeat_at: Optional[datetime] = None  # Last liveness update of the process executing the run
+    interrupted_at: Optional[datetime] = None  # Set when shutdown interrupted the run; cleared when requeued
+    wake_at: Optional[datetime] = None  # When a run parked by a delay node is requeued
+
+    # Number of times the run was resumed from its checkpoint
+    resume_count: int = 0
+
+    # Run whose unchanged node results an incremental run reused
+    baseline_execution_id: Optional[str] = None
+
     class Settings:
         name = "workflow_runs"
         indexes = [
             "workflow_id",
-            "execution_id"
+            "execution_id",
+            IndexModel([
+                ("status", ASCENDING),
+                ("priority", DESCENDING),
+                ("queued_at", ASCENDING)
+            ]),
+            IndexModel([("status", ASCENDING), ("wake_at", ASCENDING)]),
+            IndexModel([("workflow_id", ASCENDING), ("status", ASCENDING), ("start_time", DESCENDING)])
         ]
 
     model_config = {
         "arbitrary_types_allowed": True
-    }
\ No newline at end of file
+    }
+
+class RunEvent(Document):
+    """Append-only log, error or communication record of a workflow run"""
+    execution_id: str
+    seq: int
+    kind: RunEventKind
+    node_id: Optional[str] = None
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    data: Dict[str, Any] = Field(default_factory=dict)
+
+    class Settings:
+        name = "workflow_run_events"
+        indexes = [
+            IndexModel(
+                [("execution_id", ASCENDING), ("seq", ASCENDING)],
+                unique=True
+            ),
+            IndexModel([("execution_id", ASCENDING), ("kind", ASCENDING), ("seq", ASCENDING)])
+        ]
+
+    def to_entry(self) -> Dict[str, Any]:
+        """Render in the shape of the legacy embedded log entries"""
+        return {
+            "seq": self.seq,
+            "timestamp": self.timestamp.isoformat(),
+            "node_id": self.node_id,
+            **self.data
+        }
@@ -1,5 +1,5 @@
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel, Field
 from datetime import datetime
 from bson import ObjectId
@@ -16,9 +16,21 @@ from ..models.workflow import (
     WorkflowStatus,
     Metadata,
     WorkflowRun,
-    ExecutionStatus
+    ExecutionStatus,
+    RunEvent,
+    RunEventKind
 )
 from ..services.workflow_executor import workflow_executor
+from ..services.run_queue import run_queue, RunQueueFullError
+from ..services.http_client import http_client
+from ..services.smtp_pool import smtp_pool
+from ..services.resilience import circuit_breakers
+from ..services.timer_service import timer_service
+from ..services.execution.incremental import plan_incremental
+from ..services.execution.plan import PlanValidationError, plan_cache, validate_workflow
+from ..services.execution.analysis import analyze_plan, estimate_durations
+from ..core.config import settings
+from ..core.database import get_database
 
 router = APIRouter(
     prefix="/workflows",
@@ -54,9 +66,21 @@ class WorkflowSummary(BaseModel):
             updated_at=workflow.updated_at
         )
 
+def compile_or_reject(workflow: Workflow):
+    """Validate a workflow graph before saving it"""
+    try:
+        return validate_workflow(workflow)
+    except PlanValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "Invalid workflow graph", "errors": e.errors}
+        )
+
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=Workflow)
 async def create_workflow(workflow: Workflow) -> Workflow:
+    plan = compile_or_reject(workflow)
     await workflow.insert()
+    plan_cache.put(plan, workflow)
     return workflow
 
 @router.get("/", response_model=List[WorkflowSummary])
@@ -108,8 +132,10 @@ async def update_workflow(workflow_id: str, update_data: WorkflowUpdate) -> Work
     # Apply updates to the workflow
     for key, value in update_dict.items():
         setattr(workflow, key, value)
-    
+
+    plan = compile_or_reject(workflow)
     await workflow.save()
+    plan_cache.put(plan, workflow)
     return workflow
 
 @router.delete("/{workflow_id}")
@@ -130,6 +156,7 @@ async def delete_workflow(workflow_id: str) -> Dict[str, str]:
         )
 
     await workflow.delete()
+    plan_cache.invalidate(workflow_id)
     return {"message": f"Workflow {workflow_id} successfully deleted"}
 
 
@@ -139,11 +166,26 @@ class ExecuteWorkflowRequest(BaseModel):
     """Request model for workflow execution"""
     inputs: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Input variables for workflow")
     async_execution: bool = Field(default=False, description="Execute workflow asynchronously")
+    priority: int = Field(default=0, description="Queue priority for async execution (higher runs first)")
+    baseline_execution_id: Optional[str] = Field(
+        default=None,
+        description="Execute incrementally: reuse results of nodes unchanged since this run"
+    )
 
     class Config:
         from_attributes = True
 
 
+class ResumeExecutionRequest(BaseModel):
+    """Request model for resuming a failed execution"""
+    inputs: Optional[Dict[str, Any]] = Field(default=None, description="Input variables to override before resuming")
+    async_execution: bool = Field(default=False, description="Resume the execution asynchronously")
+    priority: int = Field(default=0, description="Queue priority for async execution (higher runs first)")
+
+
+RESUMABLE_STATUSES = {ExecutionStatus.ERROR, ExecutionStatus.PAUSED}
+
+
 class ExecutionResponse(BaseModel):
     """Response model for workflow execution"""
     execution_id: str
@@ -167,27 +209,65 @@ class ExecutionStatusResponse(BaseModel):
     logs: List[Dict[str, Any]] = Field(default_factory=list)
     errors: List[Dict[str, Any]] = Field(default_factory=list)
     communication_log: List[Dict[str, Any]] = Field(default_factory=list, description="Inter-node communication log")
+    last_seq: Optional[int] = Field(None, description="Sequence number of the newest run event")
 
     class Config:
         from_attributes = True
 
 
+class RunEventsResponse(BaseModel):
+    """Response model for a page of run events"""
+    execution_id: str
+    events: List[Dict[str, Any]] = Field(default_factory=list)
+    has_more: bool = False
+    next_after_seq: Optional[int] = Field(None, description="Pass as after_seq to fetch the next page")
+
+
+EVENT_LISTS = {
+    RunEventKind.LOG: "logs",
+    RunEventKind.ERROR: "errors",
+    RunEventKind.COMMUNICATION: "communication_log"
+}
+
+
+def build_status_response(run: WorkflowRun, events: List[RunEvent]) -> ExecutionStatusResponse:
+    """Combine a run with its recent events (plus entries embedded by older versions)"""
+    lists = {
+        "logs": list(run.logs or []),
+        "errors": list(run.errors or []),
+        "communication_log": list(run.communication_log or [])
+    }
+    for event in events:
+        lists[EVENT_LISTS[event.kind]].append(event.to_entry())
+
+    return ExecutionStatusResponse(
+        execution_id=run.execution_id,
+        workflow_id=str(run.workflow_id),
+        status=run.status.value,
+        start_time=run.start_time,
+        end_time=run.end_time,
+        node_states=run.node_states,
+        last_seq=events[-1].seq if events else None,
+        **lists
+    )
+
+
 @router.post("/{workflow_id}/execute", response_model=ExecutionResponse, status_code=status.HTTP_202_ACCEPTED)
 async def execute_workflow(
     workflow_id: str,
-    request: ExecuteWorkflowRequest,
-    background_tasks: BackgroundTasks
+    request: ExecuteWorkflowRequest
 ) -> ExecutionResponse:
     """
     Execute a workflow.
 
     This endpoint triggers workflow execution. The workflow is executed node by node,
     with AI nodes using Redis-cached LLM calls for improved performance.
+    Async executions are persisted to the run queue and picked up by the
+    bounded executor worker pool.
 
     Args:
         workflow_id: The ID of the workflow to execute
         request: Execution request with input variables
-        background_tasks: FastAPI background tasks for async execution
 
     Returns:
         Execution response with execution ID and status
@@ -196,8 +276,12 @@ async def execute_workflow(
         POST /workflows/{workflow_id}/execute
         {
           "inputs": {"user_name": "John", "email": "john@example.com"},
-          "async_execution": true
+          "async_execution": true,
+          "priority": 0
         }
+
+        Pass "baseline_execution_id" to re-execute only the nodes whose
+        config or inputs changed since that run (plus everything downstream).
     """
     try:
         # Validate workflow ID
@@ -236,15 +320,56 @@ async def execute_workflow(
             errors=[],
             logs=[]
         )
-        await workflow_run.insert()
+
+        # Incremental mode: only changed nodes and their downstream closure execute
+        incremental_note = ""
+        if request.baseline_execution_id:
+            baseline = await WorkflowRun.find_one(
+                WorkflowRun.execution_id == request.baseline_execution_id
+            )
+            if not baseline or baseline.workflow_id != object_id:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Baseline execution {request.baseline_execution_id} not found for this workflow"
+                )
+
+            # Inferred data dependencies count as edges when propagating dirtiness
+            try:
+                plan = plan_cache.get(workflow)
+            except PlanValidationError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={"message": "Invalid workflow graph", "errors": e.errors}
+                )
+
+            reused, dirty = plan_incremental(
+                workflow.nodes,
+                plan.edges,
+                baseline.node_states or {},
+                baseline.variables or {},
+                workflow_run.variables or {}
+            )
+            workflow_run.node_states = {
+                node_id: {**state, "reused_from": baseline.execution_id}
+                for node_id, state in reused.items()
+            }
+            workflow_run.baseline_execution_id = baseline.execution_id
+            incremental_note = f" (incremental: {len(reused)} nodes reused, {len(dirty)} re-executed)"
 
         # Execute workflow
         if request.async_execution:
-            # Execute in background
-            background_tasks.add_task(workflow_executor.execute, workflow, workflow_run)
-            message = "Workflow execution started in background"
+            # Persist to the run queue; a worker picks it up when capacity allows
+            try:
+                workflow_run = await run_queue.enqueue(workflow_run, priority=request.priority)
+            except RunQueueFullError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=str(e)
+                )
+            message = "Workflow execution queued"
         else:
             # Execute synchronously (blocks until complete)
+            await workflow_run.insert()
             try:
                 workflow_run = await workflow_executor.execute(workflow, workflow_run)
                 message = "Workflow execution completed"
@@ -255,7 +380,7 @@ async def execute_workflow(
             execution_id=execution_id,
             workflow_id=workflow_id,
             status=workflow_run.status.value,
-            message=message,
+            message=message + incremental_note,
             started_at=workflow_run.start_time
         )
 
@@ -268,12 +393,97 @@ async def execute_workflow(
         )
 
 
+@router.post("/executions/{execution_id}/resume", response_model=ExecutionResponse, status_code=status.HTTP_202_ACCEPTED)
+async def resume_execution(
+    execution_id: str,
+    request: ResumeExecutionRequest
+) -> ExecutionResponse:
+    """
+    Resume a failed or interrupted workflow execution.
+
+    Nodes that completed in an earlier attempt are restored from the run's
+    checkpointed node states instead of being executed again, so only the
+    first incomplete nodes and everything after them run.
+
+    Example:
+        POST /workflows/executions/{execution_id}/resume
+        {"async_execution": true}
+    """
+    try:
+        workflow_run = await WorkflowRun.find_one(WorkflowRun.execution_id == execution_id)
+        if not workflow_run:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Execution with ID {execution_id} not found"
+            )
+
+        if workflow_run.status not in RESUMABLE_STATUSES:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Execution status is {workflow_run.status.value}, cannot resume"
+            )
+
+        workflow = await Workflow.get(workflow_run.workflow_id)
+        if not workflow:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Workflow with ID {workflow_run.workflow_id} not found"
+            )
+
+        # Keep only completed nodes; failed and skipped ones are evaluated again
+        workflow_run.node_states = {
+            node_id: state
+            for node_id, state in (workflow_run.node_states or {}).items()
+            if isinstance(state, dict) and state.get("status") == "completed"
+        }
+        if request.inputs:
+            workflow_run.variables = {**(workflow_run.variables or {}), **request.inputs}
+        workflow_run.end_time = None
+        workflow_run.resume_count += 1
+
+        if request.async_execution:
+            try:
+                workflow_run = await run_queue.enqueue(workflow_run, priority=request.priority)
+            except RunQueueFullError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=str(e)
+                )
+            message = "Workflow execution resume queued"
+        else:
+            workflow_run.status = ExecutionStatus.QUEUED
+            await workflow_run.save()
+            try:
+                workflow_run = await workflow_executor.execute(workflow, workflow_run)
+                message = "Workflow execution resumed and completed"
+            except Exception as e:
+                message = f"Resumed workflow execution failed: {str(e)}"
+
+        return ExecutionResponse(
+            execution_id=execution_id,
+            workflow_id=str(workflow_run.workflow_id),
+            status=workflow_run.status.value,
+            message=message,
+            started_at=workflow_run.start_time
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to resume execution: {str(e)}"
+        )
+
+
 @router.get("/{workflow_id}/executions", response_model=List[ExecutionStatusResponse])
 async def list_workflow_executions(workflow_id: str) -> List[ExecutionStatusResponse]:
     """
     List all executions for a workflow.
 
-    Returns execution history including status, logs, and results.
+    Returns execution history including status and node results. Run events
+    (logs, errors, communication) are paged via
+    ``GET /workflows/executions/{execution_id}/events``.
     """
     try:
         object_id = ObjectId(workflow_id)
@@ -286,32 +496,85 @@ async def list_workflow_executions(workflow_id: str) -> List[ExecutionStatusResp
     # Query all runs for this workflow
     runs = await WorkflowRun.find(WorkflowRun.workflow_id == object_id).to_list()
 
-    return [
-        ExecutionStatusResponse(
-            execution_id=run.execution_id,
-            workflow_id=workflow_id,
-            status=run.status.value,
-            start_time=run.start_time,
-            end_time=run.end_time,
-            node_states=run.node_states,
-            logs=run.logs or [],
-            errors=run.errors or [],
-            communication_log=run.communication_log or []
+    return [build_status_response(run, []) for run in runs]
+
+
+@router.get("/{workflow_id}/analysis")
+async def analyze_workflow(
+    workflow_id: str,
+    history: int = Query(50, ge=0, le=1000, description="Number of recent successful runs to take node timings from")
+) -> Dict[str, Any]:
+    """
+    Analyze a workflow graph before running it.
+
+    Returns the parallel width of every dependency level (the concurrency
+    the workflow can use), the critical path and its slowest node, nodes
+    no start node leads to, and an end-to-end latency estimate based on
+    node timings of past runs, plus the edges inferred from the outputs
+    nodes read and the plan's warnings.
+    """
+    try:
+        object_id = ObjectId(workflow_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid workflow ID format"
         )
-        for run in runs
-    ]
+
+    workflow = await Workflow.get(object_id)
+    if not workflow:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Workflow with ID {workflow_id} not found"
+        )
+
+    try:
+        plan = plan_cache.get(workflow)
+    except PlanValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "Invalid workflow graph", "errors": e.errors}
+        )
+
+    # Only the timings are read, not the (possibly large) node outputs
+    node_states = []
+    if history:
+        db = await get_database()
+        cursor = db[WorkflowRun.Settings.name].find(
+            {"workflow_id": object_id, "status": ExecutionStatus.SUCCESS.value},
+            {f"node_states.{node_id}.duration_ms": 1 for node_id in plan.nodes}
+        ).sort("start_time", -1).limit(history)
+        node_states = [document.get("node_states", {}) async for document in cursor]
+
+    max_concurrency = workflow_executor._get_workflow_option(
+        workflow, "max_parallel_nodes", settings.WORKFLOW_MAX_PARALLEL_NODES
+    )
+    analysis = analyze_plan(plan, estimate_durations(plan, node_states), max_concurrency=max_concurrency)
+    return {
+        "workflow_id": workflow_id,
+        "runs_sampled": len(node_states),
+        "max_parallel_nodes": max_concurrency,
+        **analysis,
+        "inferred_edges": [{"from": edge.from_, "to": edge.to} for edge in plan.inferred_edges],
+        "warnings": plan.warnings
+    }
 
 
 @router.get("/executions/{execution_id}", response_model=ExecutionStatusResponse)
-async def get_execution_status(execution_id: str) -> ExecutionStatusResponse:
+async def get_execution_status(
+    execution_id: str,
+    event_limit: int = Query(100, ge=0, le=1000, description="Number of most recent run events to include")
+) -> ExecutionStatusResponse:
     """
     Get the status and results of a specific workflow execution.
 
     Returns detailed execution information including:
     - Current status (queued, running, success, error)
     - Node execution states
-    - Logs and errors
+    - The most recent logs, errors and communication events
     - Execution timing
+
+    Older events are paged via ``GET /workflows/executions/{execution_id}/events``.
     """
     try:
         # Find workflow run by execution ID
@@ -323,17 +586,14 @@ async def get_execution_status(execution_id: str) -> ExecutionStatusResponse:
                 detail=f"Execution with ID {execution_id} not found"
             )
 
-        return ExecutionStatusResponse(
-            execution_id=run.execution_id,
-            workflow_id=str(run.workflow_id),
-            status=run.status.value,
-            start_time=run.start_time,
-            end_time=run.end_time,
-            node_states=run.node_states,
-            logs=run.logs or [],
-            errors=run.errors or [],
-            communication_log=run.communication_log or []
-        )
+        events = []
+        if event_limit:
+            events = await RunEvent.find(
+                RunEvent.execution_id == execution_id
+            ).sort("-seq").limit(event_limit).to_list()
+            events.reverse()
+
+        return build_status_response(run, events)
 
     except HTTPException:
         raise
@@ -344,6 +604,101 @@ async def get_execution_status(execution_id: str) -> ExecutionStatusResponse:
         )
 
 
+@router.get("/executions/{execution_id}/events", response_model=RunEventsResponse)
+async def list_execution_events(
+    execution_id: str,
+    kind: Optional[RunEventKind] = Query(None, description="Only return events of this kind"),
+    after_seq: int = Query(-1, ge=-1, description="Return events with a greater sequence number"),
+    limit: int = Query(100, ge=1, le=1000)
+) -> RunEventsResponse:
+    """
+    Page through the append-only events (logs, errors, communication) of an execution.
+
+    Example:
+        GET /workflows/executions/{execution_id}/events?kind=error&after_seq=41&limit=100
+    """
+    query = [RunEvent.execution_id == execution_id, RunEvent.seq > after_seq]
+    if kind:
+        query.append(RunEvent.kind == kind)
+
+    # Fetch one extra event to know whether another page exists
+    events = await RunEvent.find(*query).sort("+seq").limit(limit + 1).to_list()
+    has_more = len(events) > limit
+    events = events[:limit]
+
+    return RunEventsResponse(
+        execution_id=execution_id,
+        events=[{"kind": event.kind.value, **event.to_entry()} for event in events],
+        has_more=has_more,
+        next_after_seq=events[-1].seq if events else after_seq
+    )
+
+
+@router.get("/queue/stats")
+async def get_run_queue_stats() -> Dict[str, Any]:
+    """
+    Get run queue statistics.
+
+    Returns queue depth, worker utilisation, processed/failed counts and
+    queue wait-time percentiles (milliseconds).
+    """
+    return await run_queue.get_stats()
+
+
+@router.get("/http/stats")
+async def get_http_client_stats() -> Dict[str, Any]:
+    """
+    Get statistics of the shared HTTP connection pool used by webhook nodes.
+
+    Returns request counts, new vs reused connections, DNS cache hits and
+    idle keep-alive connections.
+    """
+    return http_client.get_stats()
+
+
+@router.get("/smtp/stats")
+async def get_smtp_pool_stats() -> Dict[str, Any]:
+    """
+    Get statistics of the pooled SMTP sessions used by email nodes.
+
+    Returns messages sent, new vs reused sessions, reconnects and open/idle
+    sessions per server.
+    """
+    return smtp_pool.get_stats()
+
+
+@router.get("/resilience/stats")
+async def get_resilience_stats() -> Dict[str, Any]:
+    """
+    Get circuit breaker states and retry statistics of outbound calls.
+
+    Returns retry counts, retries abandoned at their deadline and the state
+    of every webhook host, SMTP server and LLM model breaker.
+    """
+    return circuit_breakers.get_stats()
+
+
+@router.get("/timers/stats")
+async def get_timer_stats() -> Dict[str, Any]:
+    """
+    Get statistics of the timer service waking runs parked by delay nodes.
+
+    Returns pending wake-ups, parked and woken counts and how late runs
+    were woken.
+    """
+    return await timer_service.get_stats()
+
+
+@router.get("/plans/stats")
+async def get_plan_cache_stats() -> Dict[str, Any]:
+    """
+    Get statistics of the cache of compiled workflow execution plans.
+
+    Returns cached workflow versions, hits, misses and evictions.
+    """
+    return plan_cache.get_stats()
+
+
 # Template Management Endpoints
 
 @router.get("/templates/list", response_model=List[str])
@@ -0,0 +1,44 @@
+from .scheduler import DAGScheduler, GraphCycleError
+from .persistence import RunStateWriter
+from .templates import compile_template, render_template, render_value
+from .expressions import CompiledExpression, ExpressionError, compile_expression
+from .transformer import Frame, TransformError, apply_transforms
+from .fanout import MAP_NODE_TYPE, find_map_bodies, plan_level
+from .memo import NodeMemoizer, node_inputs
+from .incremental import config_hash, plan_incremental
+from .streams import RecordStream, iter_items, plan_streams
+from .registry import NodeHandler, NodeRegistry, node_registry
+from .plan import ExecutionPlan, PlanCache, PlanValidationError, compile_plan, plan_cache
+
+__all__ = [
+    "DAGScheduler",
+    "GraphCycleError",
+    "RunStateWriter",
+    "compile_template",
+    "render_template",
+    "render_value",
+    "CompiledExpression",
+    "ExpressionError",
+    "compile_expression",
+    "Frame",
+    "TransformError",
+    "apply_transforms",
+    "MAP_NODE_TYPE",
+    "find_map_bodies",
+    "plan_level",
+    "NodeMemoizer",
+    "node_inputs",
+    "config_hash",
+    "plan_incremental",
+    "RecordStream",
+    "iter_items",
+    "plan_streams",
+    "NodeHandler",
+    "NodeRegistry",
+    "node_registry",
+    "ExecutionPlan",
+    "PlanCache",
+    "PlanValidationError",
+    "compile_plan",
+    "plan_cache",
+]
@@ -0,0 +1,155 @@
+"""
+Static analysis of a workflow graph.
+
+Runs over a compiled ExecutionPlan in O(V+E), before the workflow is
+executed:
+
+- levels: each node's depth (longest chain of dependencies above it); the
+  number of nodes per level is how many can run at once, so the maximum
+  width is the concurrency the run can actually use
+- critical path: the chain of dependent nodes with the largest estimated
+  total latency, which bounds the run's latency however much concurrency
+  is available; its slowest node is the bottleneck
+- unreachable nodes: nodes no start node leads to
+
+Node latencies come from ``duration_ms`` of past runs' node states: the
+median of the node itself, else the median of its node type in this
+workflow, else its configured delay (delay nodes), else a default. Map
+nodes are analysed as one node whose duration includes their body.
+Conditional branches are all assumed taken, so the estimate is an upper
+bound for workflows that branch.
+"""
+from statistics import median
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .plan import ExecutionPlan
+
+DEFAULT_NODE_LATENCY_MS = 100.0
+
+
+def estimate_durations(
+    plan: ExecutionPlan,
+    node_states: Iterable[Dict[str, Any]],
+    default_ms: float = DEFAULT_NODE_LATENCY_MS
+) -> Dict[str, Tuple[float, str]]:
+    """
+    Estimate the latency of every node of a plan.
+
+    Args:
+        plan: Compiled plan of the workflow
+        node_states: ``node_states`` of past runs of the workflow
+        default_ms: Latency assumed for nodes without history
+
+    Returns:
+        Node ID -> (milliseconds, source) where source is "node", "type",
+        "config" or "default"
+    """
+    by_node: Dict[str, List[float]] = {}
+    by_type: Dict[str, List[float]] = {}
+    for states in node_states:
+        for node_id, state in (states or {}).items():
+            node = plan.nodes.get(node_id)
+            duration = state.get("duration_ms") if isinstance(state, dict) else None
+            if node is None or not isinstance(duration, (int, float)):
+                continue
+            by_node.setdefault(node_id, []).append(float(duration))
+            by_type.setdefault(node.type.lower(), []).append(float(duration))
+
+    estimates: Dict[str, Tuple[float, str]] = {}
+    for node_id, node in plan.nodes.items():
+        node_type = node.type.lower()
+        delay = (node.config or {}).get("delay_seconds")
+        if node_id in by_node:
+            estimates[node_id] = (median(by_node[node_id]), "node")
+        elif node_type in by_type:
+            estimates[node_id] = (median(by_type[node_type]), "type")
+        elif node_type == "delay" and isinstance(delay, (int, float)):
+            estimates[node_id] = (float(delay) * 1000, "config")
+        else:
+            estimates[node_id] = (default_ms, "default")
+    return estimates
+
+
+def analyze_plan(
+    plan: ExecutionPlan,
+    durations: Dict[str, Tuple[float, str]],
+    max_concurrency: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Analyze the top-level graph of a plan.
+
+    Args:
+        plan: Compiled plan of the workflow
+        durations: Node latency estimates from ``estimate_durations``
+        max_concurrency: Nodes the run may execute at once, to bound the
+            latency estimate by the total work
+
+    Returns:
+        Levels and widths, critical path, bottleneck, unreachable nodes and
+        the end-to-end latency estimate
+    """
+    scheduler = plan.scheduler
+    level: Dict[str, int] = {}
+    finish: Dict[str, float] = {}
+    previous: Dict[str, Optional[str]] = {}
+
+    # Topological order: every predecessor is final before its successors
+    for node in scheduler.order:
+        node_id = node.id
+        level.setdefault(node_id, 0)
+        finish[node_id] = finish.get(node_id, 0.0) + durations[node_id][0]
+        previous.setdefault(node_id, None)
+        for successor in scheduler.successors[node_id]:
+            level[successor] = max(level.get(successor, 0), level[node_id] + 1)
+            # finish[successor] holds its latest start until it is visited
+            if finish[node_id] > finish.get(successor, -1.0):
+                finish[successor] = finish[node_id]
+                previous[successor] = node_id
+
+    widths: List[int] = []
+    for depth in level.values():
+        while len(widths) <= depth:
+            widths.append(0)
+        widths[depth] += 1
+
+    critical_path: List[str] = []
+    if finish:
+        node_id = max(finish, key=finish.get)
+        while node_id is not None:
+            critical_path.append(node_id)
+            node_id = previous[node_id]
+        critical_path.reverse()
+
+    critical_ms = max(finish.values(), default=0.0)
+    total_work_ms = sum(durations[node.id][0] for node in scheduler.order)
+    estimate_ms = critical_ms
+    if max_concurrency:
+        estimate_ms = max(critical_ms, total_work_ms / max(1, max_concurrency))
+
+    bottleneck = max(critical_path, key=lambda node_id: durations[node_id][0], default=None)
+    sources: Dict[str, int] = {}
+    for node in scheduler.order:
+        source = durations[node.id][1]
+        sources[source] = sources.get(source, 0) + 1
+
+    return {
+        "nodes": len(scheduler.order),
+        "edges": sum(len(successors) for successors in scheduler.successors.values()),
+        "levels": len(widths),
+        "width_per_level": widths,
+        "max_width": max(widths, default=0),
+        "critical_path": [
+            {"node_id": node_id, "type": plan.nodes[node_id].type, "estimated_ms": round(durations[node_id][0], 1)}
+            for node_id in critical_path
+        ],
+        "bottleneck": {
+            "node_id": bottleneck,
+            "type": plan.nodes[bottleneck].type,
+            "estimated_ms": round(durations[bottleneck][0], 1)
+        } if bottleneck else None,
+        "unreachable": plan.unreachable,
+        "estimated_latency_ms": round(estimate_ms, 1),
+        "critical_path_ms": round(critical_ms, 1),
+        "total_work_ms": round(total_work_ms, 1),
+        "estimate_sources": sources
+    }
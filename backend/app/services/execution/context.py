@@ -0,0 +1,107 @@
+"""
+Per-run execution context.
+
+Holds all mutable state of a single workflow run (shared context, node
+registry, outputs, the run record) so one executor instance can drive many
+runs concurrently without them overwriting each other. The active context
+is tracked with a ContextVar, which asyncio copies into every task spawned
+by the run.
+"""
+from contextvars import ContextVar, Token
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set
+
+from ...models.workflow import Workflow, WorkflowRun, Node
+from .persistence import RunStateWriter
+
+
+class ExecutionContext:
+    """Isolated state for one workflow run"""
+
+    def __init__(
+        self,
+        workflow: Workflow,
+        run: WorkflowRun,
+        communication_mode: str,
+        writer: Optional[RunStateWriter] = None,
+        plan: Optional[Any] = None
+    ):
+        """
+        Initialize execution context.
+
+        Args:
+            workflow: Workflow definition being executed
+            run: Run record tracking this execution
+            communication_mode: Node communication mode for this run
+            writer: Write-behind persistence for the run record
+            plan: Compiled ExecutionPlan of the workflow version
+        """
+        self.workflow = workflow
+        self.run = run
+        self.execution_id = run.execution_id
+        self.communication_mode = communication_mode
+        self.writer = writer or RunStateWriter(run)
+        self.plan = plan
+
+        # Node communication state (read-only, shared with the plan)
+        self.node_registry: Dict[str, Node] = (
+            plan.nodes if plan is not None else {node.id: node for node in workflow.nodes}
+        )
+        self.shared: Dict[str, Any] = {}
+
+        # Sub-graphs run once per item by map nodes (map node ID -> body node IDs)
+        self.map_bodies: Dict[str, Set[str]] = plan.map_bodies if plan is not None else {}
+
+        # Results of nodes completed by an earlier attempt of this run
+        self.checkpoint: Dict[str, Dict[str, Any]] = {}
+
+        # Nodes streaming their output to their consumer, and the open streams
+        self.streaming: Set[str] = plan.streaming if plan is not None else set()
+        self.streams: List[Any] = []
+
+        # Unfinished readers of each output; outputs are dropped once unread
+        self.liveness: Optional[Any] = None
+
+        # Earliest wake-up time of the delay nodes that parked this run
+        self.wake_at: Optional[datetime] = None
+
+        # Runtime context handed to node handlers
+        self.runtime: Dict[str, Any] = {
+            "workflow_id": str(workflow.id),
+            "execution_id": run.execution_id,
+            "variables": dict(run.variables or {}),
+            "outputs": {},  # Store node outputs for downstream nodes
+            "shared": self.shared,  # Shared context for inter-node communication
+            "communication_mode": communication_mode
+        }
+
+    @property
+    def variables(self) -> Dict[str, Any]:
+        """Workflow variables for this run"""
+        return self.runtime["variables"]
+
+    @property
+    def outputs(self) -> Dict[str, Any]:
+        """Node outputs produced so far"""
+        return self.runtime["outputs"]
+
+
+_current_context: ContextVar[Optional[ExecutionContext]] = ContextVar(
+    "workflow_execution_context",
+    default=None
+)
+
+
+def get_current_context() -> Optional[ExecutionContext]:
+    """Get the execution context of the run owning the current task"""
+    return _current_context.get()
+
+
+def set_current_context(context: Optional[ExecutionContext]) -> Token:
+    """Bind an execution context to the current task"""
+    return _current_context.set(context)
+
+
+def reset_current_context(token: Token) -> None:
+    """Restore the execution context active before ``set_current_context``"""
+    _current_context.reset(token)
@@ -0,0 +1,189 @@
+"""
+Data dependencies inferred from node configs.
+
+A node reads another node's output through:
+
+- ``{{outputs.node-id...}}`` placeholders in any config string
+- ``source``/``with`` references naming the node, or expressions reading
+  ``outputs["node-id"]`` / ``outputs.node_id``
+- expressions in the config of transformer, filter and condition nodes
+
+A node that may read any output (an expression indexing ``outputs``
+dynamically, an AI node asking other nodes, or a plugin node type whose
+handler gets the whole run context) is recorded as a reader of every node,
+without edges. A node whose config references no output at all is opaque:
+whatever it reads reaches it through its edges, so its upstream outputs
+must be kept for it (see execution.liveness).
+
+Drawn edges alone may miss such a read (the consumer could run before its
+producer) or be the only thing ordering two nodes. The inferred reads are
+merged into the edges: a producer -> consumer edge is added unless the
+consumer already runs after the producer. Explicit edges are always kept,
+as they may order side effects no template reveals.
+
+Reads that cannot be honoured are reported as warnings instead:
+
+- the consumer runs before the producer (an added edge would form a cycle)
+- the producer is in a map body the consumer is outside of (body outputs
+  only exist per item, inside the map)
+- the reference names no node of the workflow
+"""
+from collections import deque
+from typing import Dict, List, Set, Tuple
+
+from ...models.workflow import Node, Edge
+from .expressions import ExpressionError, compile_expression
+from .incremental import CONTEXT_EXPRESSION_TYPES
+from .memo import config_sources, config_strings
+from .registry import node_registry
+from .templates import compile_template
+
+# Node types that read no node output whatever their config
+INPUTLESS_TYPES = {"start", "end", "delay"}
+
+
+def node_reads(node: Node, node_ids: Set[str]) -> Tuple[Set[str], Set[str], bool]:
+    """
+    Outputs a node reads.
+
+    Args:
+        node: Node to inspect
+        node_ids: IDs of all workflow nodes
+
+    Returns:
+        (IDs of the nodes read, unresolved ``outputs.`` references, whether
+        the node may read any output)
+    """
+    reads: Set[str] = set()
+    unknown: Set[str] = set()
+    config = node.config or {}
+    spec = node_registry.get(node.type)
+    reads_any = bool(config.get("can_communicate")) or bool(spec and not spec.is_method)
+
+    def expression_outputs(source: str):
+        nonlocal reads_any
+        try:
+            expression = compile_expression(source)
+        except ExpressionError:
+            return
+        reads.update(expression.output_ids)
+        reads_any = reads_any or expression.reads_any_output
+
+    for text in config_strings(config):
+        for placeholder in compile_template(text).placeholders:
+            candidates = placeholder.output_ids
+            matched = [node_id for node_id in candidates if node_id in node_ids]
+            if matched:
+                reads.add(matched[0])
+            elif candidates:
+                unknown.add(placeholder.expression)
+
+    for source in config_sources(config):
+        if source in node_ids:
+            reads.add(source)
+        else:
+            expression_outputs(source)
+
+    if node.type in CONTEXT_EXPRESSION_TYPES:
+        for text in config_strings(config):
+            if "{{" not in text:
+                expression_outputs(text)
+
+    reads.discard(node.id)
+    unknown.update(f"outputs.{node_id}" for node_id in reads - node_ids)
+    return reads & node_ids, unknown, reads_any
+
+
+def _reaches(successors: Dict[str, List[str]], source: str, target: str) -> bool:
+    seen = {source}
+    queue = deque([source])
+    while queue:
+        node_id = queue.popleft()
+        if node_id == target:
+            return True
+        for successor in successors[node_id]:
+            if successor not in seen:
+                seen.add(successor)
+                queue.append(successor)
+    return False
+
+
+def merge_dependencies(
+    nodes: List[Node],
+    edges: List[Edge],
+    bodies: Dict[str, Set[str]]
+) -> Tuple[List[Edge], Dict[str, Set[str]], Set[str], List[str]]:
+    """
+    Merge inferred data dependencies into the explicit edges.
+
+    Args:
+        nodes: Workflow nodes
+        edges: Explicit workflow edges
+        bodies: Map bodies from ``find_map_bodies`` over the explicit edges
+
+    Returns:
+        (edges with the inferred ones appended, producer ID -> IDs of the
+        nodes reading its output, IDs of the opaque nodes, warnings)
+    """
+    node_ids = {node.id for node in nodes}
+    successors: Dict[str, List[str]] = {node_id: [] for node_id in node_ids}
+    for edge in edges:
+        if edge.from_ in node_ids and edge.to in node_ids:
+            successors[edge.from_].append(edge.to)
+
+    # Innermost map body of every body node
+    owner: Dict[str, str] = {}
+    for map_id, body in sorted(bodies.items(), key=lambda entry: -len(entry[1])):
+        for node_id in body:
+            owner[node_id] = map_id
+
+    def visible(producer: str, consumer: str) -> bool:
+        """Whether the producer's output exists where the consumer runs"""
+        body = owner.get(producer)
+        while body is not None:
+            if consumer not in bodies[body]:
+                return False
+            body = owner.get(body)
+        return True
+
+    def runs_before(consumer: str, producer: str) -> bool:
+        """Whether the producer only runs after the consumer (or after the map running it)"""
+        node_id = consumer
+        while node_id is not None:
+            if _reaches(successors, node_id, producer):
+                return True
+            node_id = owner.get(node_id)
+            if node_id is not None and producer in bodies[node_id]:
+                break
+        return False
+
+    merged = list(edges)
+    readers: Dict[str, Set[str]] = {}
+    opaque: Set[str] = set()
+    warnings: List[str] = []
+
+    for node in nodes:
+        reads, unknown, reads_any = node_reads(node, node_ids)
+        for reference in sorted(unknown):
+            warnings.append(f"Node {node.id} references {reference}, which is not a node of the workflow")
+        if reads_any:
+            for producer in node_ids - {node.id}:
+                readers.setdefault(producer, set()).add(node.id)
+        elif not reads and node.type not in INPUTLESS_TYPES:
+            opaque.add(node.id)
+
+        for producer in sorted(reads):
+            readers.setdefault(producer, set()).add(node.id)
+            if not visible(producer, node.id):
+                warnings.append(
+                    f"Node {node.id} reads {producer}, whose output only exists inside map {owner[producer]}"
+                )
+            elif _reaches(successors, producer, node.id):
+                continue
+            elif runs_before(node.id, producer):
+                warnings.append(f"Node {node.id} reads {producer}, which only runs after it")
+            else:
+                merged.append(Edge(**{"from": producer, "to": node.id}))
+                successors[producer].append(node.id)
+
+    return merged, readers, opaque, warnings
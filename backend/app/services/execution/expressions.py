@@ -0,0 +1,723 @@
+"""
+Safe expression engine for filter and condition nodes.
+
+Expressions use a small, sandboxed subset of Python syntax:
+
+    age >= 18 and status in ["active", "trial"]
+    outputs["http-1"].status_code == 200 and not variables.dry_run
+    endswith(lower(item.email), "@example.com")
+
+They are parsed once into an AST, checked against a whitelist (no imports,
+attribute access to private names, lambdas, comprehensions or arbitrary
+calls) and compiled into a tree of closures. Compiled expressions are cached
+by their source text, so a workflow version's expressions are compiled once
+and reused for every run and every item.
+
+Name resolution:
+- ``variables`` / ``outputs``: the run's workflow variables and node outputs
+- ``item``: the current element when filtering a list
+- any other name: field of the current item, falling back to a workflow variable
+- ``true`` / ``false`` / ``null`` (and the Python spellings) are constants
+
+Filters over list outputs are evaluated vectorized: each referenced item
+field is gathered into a NumPy column once and the whole expression is
+evaluated column-wise. Expressions (or data) the vectorized path cannot
+handle fall back to per-item evaluation with identical semantics.
+"""
+import ast
+import operator
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Callable, Set, Tuple
+
+import numpy as np
+
+MAX_EXPRESSION_LENGTH = 2000
+MAX_SEQUENCE_REPEAT = 100000
+INT64_LIMIT = 2.0 ** 63
+VECTORIZE_MIN_ITEMS = 64
+
+CONSTANT_NAMES = {
+    "true": True, "false": False, "null": None, "none": None,
+    "True": True, "False": False, "None": None
+}
+SCOPE_NAMES = {"variables", "outputs"}
+
+_NO_ITEM = object()
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression is invalid or uses unsupported syntax"""
+    pass
+
+
+class NotVectorizable(Exception):
+    """Internal: expression has no column-wise form"""
+    pass
+
+
+def _safe_mul(left: Any, right: Any) -> Any:
+    # Guard against "x" * 10**9 style memory blow-ups; the result length is
+    # bounded so chained repetitions cannot multiply past the limit
+    for sequence, count in ((left, right), (right, left)):
+        if (
+            isinstance(sequence, (str, list, tuple))
+            and isinstance(count, int)
+            and len(sequence) * count > MAX_SEQUENCE_REPEAT
+        ):
+            raise ExpressionError("Sequence repetition too large")
+    return operator.mul(left, right)
+
+
+def _contains(container: Any, value: Any) -> bool:
+    return container is not None and value in container
+
+
+def _get(container: Any, key: Any) -> Any:
+    """Sandboxed item/field access: dict keys and list indexes only"""
+    if isinstance(container, dict):
+        return container.get(key)
+    if isinstance(container, (list, tuple, str)) and isinstance(key, int) and not isinstance(key, bool):
+        return container[key] if -len(container) <= key < len(container) else None
+    return None
+
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: _safe_mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod
+}
+
+COMPARE_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda left, right: _contains(right, left),
+    ast.NotIn: lambda left, right: not _contains(right, left),
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not
+}
+
+FUNCTIONS: Dict[str, Callable] = {
+    "len": len,
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "round": round,
+    "lower": lambda value: str(value).lower(),
+    "upper": lambda value: str(value).upper(),
+    "startswith": lambda value, prefix: str(value).startswith(prefix),
+    "endswith": lambda value, suffix: str(value).endswith(suffix),
+    "contains": _contains,
+    "exists": lambda value: value is not None
+}
+
+
+class Scope:
+    """Name lookup for one evaluation"""
+
+    __slots__ = ("variables", "outputs", "item")
+
+    def __init__(self, variables: Dict[str, Any], outputs: Dict[str, Any], item: Any = _NO_ITEM):
+        self.variables = variables
+        self.outputs = outputs
+        self.item = item
+
+    def lookup(self, name: str) -> Any:
+        if name == "variables":
+            return self.variables
+        if name == "outputs":
+            return self.outputs
+        if name == "item":
+            # Outside list filters, ``item`` may be bound by an enclosing map node
+            return self.variables.get("item") if self.item is _NO_ITEM else self.item
+        if isinstance(self.item, dict) and name in self.item:
+            return self.item[name]
+        return self.variables.get(name)
+
+
+# ==================== SCALAR COMPILATION ====================
+
+def _compile(node: ast.AST) -> Callable[[Scope], Any]:
+    """Compile a whitelisted AST node into a closure over a Scope"""
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if not isinstance(value, (str, int, float, bool, type(None))):
+            raise ExpressionError(f"Unsupported constant: {value!r}")
+        return lambda scope: value
+
+    if isinstance(node, ast.Name):
+        if node.id in CONSTANT_NAMES:
+            value = CONSTANT_NAMES[node.id]
+            return lambda scope: value
+        if node.id.startswith("_"):
+            raise ExpressionError(f"Access to private name '{node.id}' is not allowed")
+        name = node.id
+        return lambda scope: scope.lookup(name)
+
+    if isinstance(node, ast.Attribute):
+        if node.attr.startswith("_"):
+            raise ExpressionError(f"Access to private attribute '{node.attr}' is not allowed")
+        value, attr = _compile(node.value), node.attr
+        return lambda scope: _get(value(scope), attr)
+
+    if isinstance(node, ast.Subscript):
+        if isinstance(node.slice, ast.Slice):
+            raise ExpressionError("Slices are not supported")
+        value, key = _compile(node.value), _compile(node.slice)
+        return lambda scope: _get(value(scope), key(scope))
+
+    if isinstance(node, ast.BoolOp):
+        operands = [_compile(value) for value in node.values]
+        if isinstance(node.op, ast.And):
+            def evaluate_and(scope):
+                result = True
+                for operand in operands:
+                    result = operand(scope)
+                    if not result:
+                        return result
+                return result
+            return evaluate_and
+
+        def evaluate_or(scope):
+            result = False
+            for operand in operands:
+                result = operand(scope)
+                if result:
+                    return result
+            return result
+        return evaluate_or
+
+    if isinstance(node, ast.UnaryOp):
+        operand = _compile(node.operand)
+        if isinstance(node.op, ast.Not):
+            return lambda scope: not operand(scope)
+        if isinstance(node.op, ast.USub):
+            return lambda scope: -operand(scope)
+        if isinstance(node.op, ast.UAdd):
+            return lambda scope: +operand(scope)
+        raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+
+    if isinstance(node, ast.BinOp):
+        function = BINARY_OPERATORS.get(type(node.op))
+        if function is None:
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        left, right = _compile(node.left), _compile(node.right)
+        return lambda scope: function(left(scope), right(scope))
+
+    if isinstance(node, ast.Compare):
+        left = _compile(node.left)
+        steps = []
+        for op, comparator in zip(node.ops, node.comparators):
+            function = COMPARE_OPERATORS.get(type(op))
+            if function is None:
+                raise ExpressionError(f"Unsupported comparison: {type(op).__name__}")
+            steps.append((function, _compile(comparator)))
+
+        def evaluate_compare(scope):
+            current = left(scope)
+            for function, comparator in steps:
+                following = comparator(scope)
+                if not function(current, following):
+                    return False
+                current = following
+            return True
+        return evaluate_compare
+
+    if isinstance(node, ast.IfExp):
+        test, body, orelse = _compile(node.test), _compile(node.body), _compile(node.orelse)
+        return lambda scope: body(scope) if test(scope) else orelse(scope)
+
+    if isinstance(node, (ast.List, ast.Tuple)):
+        elements = [_compile(element) for element in node.elts]
+        return lambda scope: [element(scope) for element in elements]
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ExpressionError("Only built-in expression functions can be called")
+        if node.keywords:
+            raise ExpressionError("Keyword arguments are not supported")
+        function = FUNCTIONS[node.func.id]
+        arguments = [_compile(argument) for argument in node.args]
+        return lambda scope: function(*[argument(scope) for argument in arguments])
+
+    raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+
+
+# ==================== VECTORIZED COMPILATION ====================
+
+def _references_item(node: ast.AST) -> bool:
+    """True if evaluating ``node`` depends on the current item"""
+    if isinstance(node, ast.Name):
+        return node.id not in CONSTANT_NAMES and node.id not in SCOPE_NAMES
+    if isinstance(node, ast.Call):
+        return any(_references_item(argument) for argument in node.args)
+    return any(_references_item(child) for child in ast.iter_child_nodes(node))
+
+
+def _truth(value: Any) -> Any:
+    """Element-wise Python truthiness"""
+    if not isinstance(value, np.ndarray):
+        return np.bool_(bool(value))
+    if value.dtype.kind == "b":
+        return value
+    if value.dtype.kind == "U":
+        return np.char.str_len(value) > 0
+    if value.dtype.kind == "O":
+        return np.fromiter((bool(element) for element in value), dtype=bool, count=len(value))
+    return value != 0
+
+
+def _is_none(value: Any) -> Any:
+    if not isinstance(value, np.ndarray):
+        return np.bool_(value is None)
+    if value.dtype.kind != "O":
+        return np.zeros(len(value), dtype=bool)
+    return np.fromiter((element is None for element in value), dtype=bool, count=len(value))
+
+
+def _require_kind(value: Any, kinds: str):
+    if isinstance(value, np.ndarray) and value.dtype.kind not in kinds:
+        raise TypeError(f"Unsupported column type {value.dtype} for this operation")
+
+
+def _vector_numeric(function: Callable) -> Callable:
+    def apply(left, right):
+        _require_kind(left, "iufb")
+        _require_kind(right, "iufb")
+        result = function(left, right)
+        if np.asarray(result).dtype.kind in "iu":
+            # int64 arithmetic wraps around silently where Python ints grow;
+            # an ArithmeticError sends the expression to per-item evaluation
+            magnitude = np.abs(function(np.asarray(left, dtype=np.float64), np.asarray(right, dtype=np.float64)))
+            if (magnitude >= INT64_LIMIT).any():
+                raise OverflowError("Integer overflow in column arithmetic")
+        return result
+    return apply
+
+
+def _vector_negate(value):
+    if isinstance(value, np.ndarray) and value.dtype.kind == "i" and (value == np.iinfo(value.dtype).min).any():
+        raise OverflowError("Integer overflow in column arithmetic")
+    return -value
+
+
+def _vector_string(function: Callable) -> Callable:
+    def apply(value):
+        _require_kind(value, "U")
+        return function(value)
+    return apply
+
+
+def _is_text(value: Any) -> bool:
+    return isinstance(value, str) or (isinstance(value, np.ndarray) and value.dtype.kind == "U")
+
+
+def _vector_add(left, right):
+    if _is_text(left) or _is_text(right):
+        # String concatenation requires text on both sides, as in Python
+        if not (_is_text(left) and _is_text(right)):
+            raise TypeError("Cannot concatenate text and non-text values")
+        return np.char.add(left, right)
+    return _vector_numeric(operator.add)(left, right)
+
+
+def _vector_abs(value):
+    _require_kind(value, "iuf")
+    return np.abs(value)
+
+
+VECTOR_BINARY_OPERATORS = {
+    ast.Add: _vector_add,
+    ast.Sub: _vector_numeric(operator.sub),
+    ast.Mult: _vector_numeric(operator.mul),
+    ast.Div: _vector_numeric(operator.truediv),
+    ast.FloorDiv: _vector_numeric(operator.floordiv),
+    ast.Mod: _vector_numeric(operator.mod)
+}
+
+VECTOR_COMPARE_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge
+}
+
+VECTOR_FUNCTIONS = {
+    "lower": _vector_string(np.char.lower),
+    "upper": _vector_string(np.char.upper),
+    "len": _vector_string(np.char.str_len),
+    "abs": _vector_abs,
+    "exists": lambda value: ~_is_none(value)
+}
+
+
+def _vector_affix(function: Callable) -> Callable:
+    def apply(value, affix):
+        _require_kind(value, "U")
+        if not isinstance(affix, str):
+            raise TypeError("Prefix/suffix must be a string")
+        return function(value, affix)
+    return apply
+
+
+# Functions whose second argument must not depend on the item
+VECTOR_FUNCTIONS_WITH_ARGUMENT = {
+    "startswith": _vector_affix(np.char.startswith),
+    "endswith": _vector_affix(np.char.endswith)
+}
+
+
+class VectorEnv:
+    """Columns gathered from a list of items plus the run scope"""
+
+    __slots__ = ("scope", "columns")
+
+    def __init__(self, scope: Scope, columns: Dict[Tuple[str, ...], np.ndarray]):
+        self.scope = scope
+        self.columns = columns
+
+
+class _VectorCompiler:
+    """Compiles an expression into a column-wise evaluator"""
+
+    def __init__(self):
+        self.columns: List[Tuple[str, ...]] = []
+
+    def _column_path(self, node: ast.AST) -> Optional[Tuple[str, ...]]:
+        """Field path if ``node`` is a (nested) field of the current item"""
+        if isinstance(node, ast.Name):
+            return (node.id,)
+        if isinstance(node, ast.Attribute):
+            base = self._column_path(node.value)
+            return base + (node.attr,) if base is not None else None
+        if (
+            isinstance(node, ast.Subscript)
+            and isinstance(node.slice, ast.Constant)
+            and isinstance(node.slice.value, (str, int))
+        ):
+            base = self._column_path(node.value)
+            return base + (node.slice.value,) if base is not None else None
+        return None
+
+    def compile(self, node: ast.AST) -> Callable[[VectorEnv], Any]:
+        if not _references_item(node):
+            # Item independent: evaluate once and broadcast
+            scalar = _compile(node)
+            return lambda env: scalar(env.scope)
+
+        path = self._column_path(node)
+        if path is not None:
+            if path == ("item",):
+                raise NotVectorizable("whole-item comparison")
+            if path not in self.columns:
+                self.columns.append(path)
+            return lambda env: env.columns[path]
+
+        if isinstance(node, ast.Compare):
+            return self._compile_compare(node)
+
+        if isinstance(node, ast.BoolOp):
+            operands = [self.compile(value) for value in node.values]
+            combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+
+            def evaluate_bool(env):
+                result = _truth(operands[0](env))
+                for operand in operands[1:]:
+                    result = combine(result, _truth(operand(env)))
+                return result
+            return evaluate_bool
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self.compile(node.operand)
+            if isinstance(node.op, ast.Not):
+                return lambda env: ~_truth(operand(env))
+            if isinstance(node.op, ast.USub):
+                return lambda env: _vector_negate(operand(env))
+            raise NotVectorizable(type(node.op).__name__)
+
+        if isinstance(node, ast.BinOp) and type(node.op) in VECTOR_BINARY_OPERATORS:
+            function = VECTOR_BINARY_OPERATORS[type(node.op)]
+            left, right = self.compile(node.left), self.compile(node.right)
+            return lambda env: function(left(env), right(env))
+
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id in VECTOR_FUNCTIONS
+            and len(node.args) == 1
+            and not node.keywords
+        ):
+            function = VECTOR_FUNCTIONS[node.func.id]
+            argument = self.compile(node.args[0])
+            return lambda env: function(argument(env))
+
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id in VECTOR_FUNCTIONS_WITH_ARGUMENT
+            and len(node.args) == 2
+            and not node.keywords
+            and not _references_item(node.args[1])
+        ):
+            function = VECTOR_FUNCTIONS_WITH_ARGUMENT[node.func.id]
+            value, argument = self.compile(node.args[0]), _compile(node.args[1])
+            return lambda env: function(value(env), argument(env.scope))
+
+        raise NotVectorizable(type(node).__name__)
+
+    def _compile_compare(self, node: ast.Compare) -> Callable[[VectorEnv], Any]:
+        left = self.compile(node.left)
+        steps = []
+        for op, comparator in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.In, ast.NotIn)):
+                if _references_item(comparator):
+                    raise NotVectorizable("membership in an item field")
+                steps.append((op, _compile(comparator)))
+            elif isinstance(op, (ast.Is, ast.IsNot)):
+                if not (isinstance(comparator, ast.Constant) and comparator.value is None) and not (
+                    isinstance(comparator, ast.Name) and comparator.id in ("null", "none", "None")
+                ):
+                    raise NotVectorizable("identity comparison")
+                steps.append((op, None))
+            elif type(op) in VECTOR_COMPARE_OPERATORS:
+                steps.append((op, self.compile(comparator)))
+            else:
+                raise NotVectorizable(type(op).__name__)
+
+        def evaluate_compare(env):
+            current = left(env)
+            result = np.bool_(True)
+            for op, comparator in steps:
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    options = comparator(env.scope)
+                    if not isinstance(options, list):
+                        raise TypeError("Vectorized membership requires a list")
+                    matched = np.isin(current, np.array(options, dtype=object))
+                    result = result & (matched if isinstance(op, ast.In) else ~matched)
+                    continue
+                if isinstance(op, (ast.Is, ast.IsNot)):
+                    matched = _is_none(current)
+                    result = result & (matched if isinstance(op, ast.Is) else ~matched)
+                    continue
+                following = comparator(env)
+                outcome = VECTOR_COMPARE_OPERATORS[type(op)](current, following)
+                if not isinstance(outcome, (np.ndarray, np.bool_, bool)):
+                    raise TypeError("Comparison did not produce booleans")
+                result = result & _truth(outcome)
+                current = following
+            return result
+        return evaluate_compare
+
+
+def to_column(values: List[Any], promote: bool = True) -> np.ndarray:
+    """
+    Build the tightest NumPy column for a list of Python values.
+
+    Args:
+        values: Column values
+        promote: Store mixed ints and floats as float64 (for arithmetic);
+            otherwise they stay Python objects, so ints round-trip as ints
+    """
+    kinds = {type(value) for value in values}
+    try:
+        if kinds == {bool}:
+            return np.array(values, dtype=bool)
+        if kinds == {int}:
+            return np.array(values, dtype=np.int64)
+        if promote and kinds and kinds <= {int, float}:
+            return np.array(values, dtype=np.float64)
+        if kinds == {str}:
+            return np.array(values, dtype=str)
+    except OverflowError:
+        pass
+
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+# ==================== COMPILED EXPRESSION ====================
+
+def _output_references(tree: ast.AST) -> Tuple[Set[str], bool]:
+    """
+    Node IDs read as ``outputs["id"]`` or ``outputs.id``.
+
+    Returns:
+        (node IDs, whether ``outputs`` is also used in a way that may read
+        any node, e.g. ``outputs[variables.key]``)
+    """
+    references: Set[str] = set()
+    uses = static = 0
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id == "outputs":
+            uses += 1
+        target = getattr(node, "value", None)
+        if not (isinstance(target, ast.Name) and target.id == "outputs"):
+            continue
+        if isinstance(node, ast.Attribute):
+            references.add(node.attr)
+            static += 1
+        elif (
+            isinstance(node, ast.Subscript)
+            and isinstance(node.slice, ast.Constant)
+            and isinstance(node.slice.value, str)
+        ):
+            references.add(node.slice.value)
+            static += 1
+    return references, uses > static
+
+
+class CompiledExpression:
+    """A parsed, validated and compiled expression"""
+
+    def __init__(self, source: str):
+        """
+        Compile an expression.
+
+        Args:
+            source: Expression source text
+
+        Raises:
+            ExpressionError: If the expression is invalid or unsafe
+        """
+        self.source = source
+        text = source.strip() or "true"
+        if len(text) > MAX_EXPRESSION_LENGTH:
+            raise ExpressionError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+
+        try:
+            tree = ast.parse(text, mode="eval")
+        except (SyntaxError, RecursionError) as e:
+            raise ExpressionError(f"Invalid expression '{source}': {e}")
+
+        self._evaluate = _compile(tree.body)
+        self.output_ids, self.reads_any_output = _output_references(tree)
+
+        compiler = _VectorCompiler()
+        try:
+            self._vector: Optional[Callable[[VectorEnv], Any]] = compiler.compile(tree.body)
+        except NotVectorizable:
+            self._vector = None
+        self._columns = compiler.columns
+
+    @property
+    def vectorizable(self) -> bool:
+        return self._vector is not None
+
+    def evaluate(self, context: Dict[str, Any], item: Any = _NO_ITEM) -> Any:
+        """
+        Evaluate against a run context.
+
+        Args:
+            context: Runtime context with "variables" and "outputs"
+            item: Current list element (for per-item filters)
+
+        Returns:
+            Expression value
+        """
+        scope = Scope(context.get("variables") or {}, context.get("outputs") or {}, item)
+        return self._evaluate(scope)
+
+    def test(self, context: Dict[str, Any], item: Any = _NO_ITEM) -> bool:
+        """Evaluate as a boolean condition"""
+        return bool(self.evaluate(context, item))
+
+    def filter(self, items: List[Any], context: Dict[str, Any]) -> Tuple[List[Any], bool]:
+        """
+        Keep the items for which the expression is true.
+
+        Items whose evaluation fails (e.g. comparing a missing field) are dropped.
+
+        Args:
+            items: List output to filter
+            context: Runtime context with "variables" and "outputs"
+
+        Returns:
+            (kept items, whether the vectorized path was used)
+        """
+        variables = context.get("variables") or {}
+        outputs = context.get("outputs") or {}
+
+        if self._vector is not None and len(items) >= VECTORIZE_MIN_ITEMS:
+            mask = self._vector_mask(items, variables, outputs)
+            if mask is not None:
+                return [item for item, keep in zip(items, mask) if keep], True
+
+        kept = []
+        for item in items:
+            try:
+                if self._evaluate(Scope(variables, outputs, item)):
+                    kept.append(item)
+            except (TypeError, ValueError, ArithmeticError):
+                continue
+        return kept, False
+
+    def _vector_mask(self, items: List[Any], variables: Dict[str, Any], outputs: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Evaluate column-wise; None if the data needs the per-item path"""
+        def gather(path: Tuple[str, ...]) -> np.ndarray:
+            root, rest = path[0], path[1:]
+            values = []
+            for item in items:
+                if root == "item":
+                    value = item
+                elif isinstance(item, dict) and root in item:
+                    value = item[root]
+                else:
+                    value = variables.get(root)
+                for key in rest:
+                    value = _get(value, key)
+                values.append(value)
+            return to_column(values)
+
+        result = self.evaluate_columns(gather, len(items), {"variables": variables, "outputs": outputs})
+        return None if result is None else _truth(result)
+
+    def evaluate_columns(
+        self,
+        column: Callable[[Tuple[str, ...]], np.ndarray],
+        length: int,
+        context: Dict[str, Any]
+    ) -> Optional[np.ndarray]:
+        """
+        Evaluate column-wise over ``length`` rows.
+
+        Args:
+            column: Returns the column for a field path referenced by the expression
+            length: Number of rows
+            context: Runtime context with "variables" and "outputs"
+
+        Returns:
+            Result column, or None if the expression or data needs per-row evaluation
+        """
+        if self._vector is None:
+            return None
+
+        scope = Scope(context.get("variables") or {}, context.get("outputs") or {})
+        try:
+            columns = {path: column(path) for path in self._columns}
+            with np.errstate(all="raise"):
+                result = self._vector(VectorEnv(scope, columns))
+        except (TypeError, ValueError, ArithmeticError, ExpressionError):
+            return None
+
+        if not isinstance(result, np.ndarray):
+            return to_column([result.item() if isinstance(result, np.generic) else result] * length)
+        return result
+
+
+@lru_cache(maxsize=2048)
+def compile_expression(source: str) -> CompiledExpression:
+    """Compile an expression once; workflows reuse the cached instance"""
+    return CompiledExpression(source)
@@ -0,0 +1,130 @@
+"""
+Fan-out (map) node planning.
+
+A ``map`` node iterates over a list and runs a sub-graph (its *body*) once
+per item. The body is every node reachable from the map node's outgoing
+edges labelled ``branch: "each"``; the map node's other outgoing edges lead
+to the nodes that run once after all items are done:
+
+    fetch -> map -(each)-> ai -> email
+             map ---------> end
+
+Body nodes are hidden from the enclosing level's schedule and run by the map
+node instead. Edges from outside a body into it become dependencies of the
+map node, so the map only starts once everything its body reads is ready.
+Maps may be nested; sibling maps may not share body nodes.
+"""
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from ...models.workflow import Node, Edge
+from .scheduler import GraphCycleError
+
+MAP_NODE_TYPE = "map"
+EACH_BRANCH = "each"
+
+
+def is_each_edge(edge: Edge) -> bool:
+    return getattr(edge, "branch", None) == EACH_BRANCH
+
+
+def find_map_bodies(nodes: List[Node], edges: List[Edge]) -> Dict[str, Set[str]]:
+    """
+    Compute the body of every map node.
+
+    Args:
+        nodes: Workflow nodes
+        edges: Workflow edges
+
+    Returns:
+        Map node ID -> IDs of the nodes in its body
+
+    Raises:
+        GraphCycleError: If a body leads back to its own map node
+        ValueError: If two sibling maps share body nodes
+    """
+    successors: Dict[str, List[str]] = {node.id: [] for node in nodes}
+    for edge in edges:
+        if edge.from_ in successors and edge.to in successors:
+            successors[edge.from_].append(edge.to)
+
+    bodies: Dict[str, Set[str]] = {}
+    for node in nodes:
+        if node.type != MAP_NODE_TYPE:
+            continue
+
+        body: Set[str] = set()
+        queue = deque(
+            edge.to for edge in edges
+            if edge.from_ == node.id and is_each_edge(edge) and edge.to in successors
+        )
+        while queue:
+            node_id = queue.popleft()
+            if node_id in body:
+                continue
+            body.add(node_id)
+            queue.extend(successors[node_id])
+
+        if node.id in body:
+            raise GraphCycleError(f"Body of map node {node.id} leads back to the map node")
+        bodies[node.id] = body
+
+    # Bodies must be disjoint unless one map is nested inside the other's body
+    map_ids = list(bodies)
+    for index, first in enumerate(map_ids):
+        for second in map_ids[index + 1:]:
+            if first in bodies[second] or second in bodies[first]:
+                continue
+            shared = bodies[first] & bodies[second]
+            if shared:
+                raise ValueError(f"Map nodes {first} and {second} share body nodes: {sorted(shared)}")
+
+    return bodies
+
+
+def plan_level(
+    nodes: List[Node],
+    edges: List[Edge],
+    bodies: Dict[str, Set[str]],
+    level: Optional[Set[str]] = None
+) -> Tuple[List[Node], List[Edge]]:
+    """
+    Nodes and edges scheduled at one level of the graph.
+
+    Args:
+        nodes: Workflow nodes
+        edges: Workflow edges
+        bodies: Map bodies from ``find_map_bodies``
+        level: Node IDs of the level (None for the top level)
+
+    Returns:
+        (nodes, edges) with the bodies of the level's map nodes removed and
+        their inbound dependencies moved onto the map nodes
+    """
+    level = set(level) if level is not None else {node.id for node in nodes}
+    level_maps = [map_id for map_id in bodies if map_id in level]
+    hidden: Set[str] = set()
+    for map_id in level_maps:
+        hidden |= bodies[map_id]
+    visible = level - hidden
+
+    level_nodes = [node for node in nodes if node.id in visible]
+    level_edges = [
+        edge for edge in edges
+        if edge.from_ in visible and edge.to in visible and not is_each_edge(edge)
+    ]
+
+    # Outside dependencies of body nodes must finish before their map starts
+    existing = {(edge.from_, edge.to) for edge in level_edges}
+    for edge in edges:
+        if edge.to not in hidden or edge.from_ not in visible or is_each_edge(edge):
+            continue
+        owner = next(
+            (map_id for map_id in level_maps if map_id in visible and edge.to in bodies[map_id]),
+            None
+        )
+        if owner and owner != edge.from_ and (edge.from_, owner) not in existing:
+            level_edges.append(Edge(**{"from": edge.from_, "to": owner}))
+            existing.add((edge.from_, owner))
+
+    return level_nodes, level_edges
@@ -0,0 +1,146 @@
+"""
+Incremental re-execution against a baseline run.
+
+Every executed node records a hash of its type and config in its node state.
+Given a baseline run of the same workflow, a node is *dirty* when:
+
+- its config changed (or the baseline has no usable state for it),
+- a run variable it reads changed, or
+- it belongs to a map node with a dirty body node (bodies re-run as a whole)
+
+Dirty nodes and everything downstream of them are executed again; the
+completed results of all other nodes are copied from the baseline and
+restored like a checkpoint, so they are not executed at all.
+"""
+import hashlib
+import json
+from collections import deque
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ...models.workflow import Node, Edge
+from .fanout import find_map_bodies
+from .memo import EXPRESSION_TYPES, IGNORED_KEYS, config_sources, config_strings
+from .templates import compile_template
+
+# Node types whose config holds expressions over the run context
+CONTEXT_EXPRESSION_TYPES = EXPRESSION_TYPES | {"condition"}
+
+# Baseline node states that can stand in for executing the node
+REUSABLE_STATUSES = {"completed"}
+
+# Baseline node states that do not make a node dirty (re-evaluated by the scheduler)
+SETTLED_STATUSES = {"completed", "skipped"}
+
+
+def config_hash(node: Node) -> str:
+    """Hash of the parts of a node that determine its result"""
+    config = {key: value for key, value in node.config.items() if key not in IGNORED_KEYS}
+    payload = json.dumps({"type": node.type, "config": config}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def variables_read(node: Node, variables: Dict[str, Any], node_ids: Set[str]) -> Optional[Set[str]]:
+    """
+    Names of the run variables a node reads.
+
+    Args:
+        node: Node to inspect
+        variables: Variables of the run
+        node_ids: IDs of all workflow nodes (sources naming them read outputs)
+
+    Returns:
+        Variable names, or None if the node may read any variable
+    """
+    if node.type in CONTEXT_EXPRESSION_TYPES:
+        return None
+
+    names: Set[str] = set()
+    for text in config_strings(node.config):
+        for placeholder in compile_template(text).placeholders:
+            names.update(key for key, _ in placeholder.variable_candidates)
+
+    for source in config_sources(node.config):
+        if source in node_ids:
+            continue
+        if source in variables or source.isidentifier():
+            names.add(source)
+        else:
+            # An expression source may read anything
+            return None
+
+    return names
+
+
+def changed_variables(baseline: Dict[str, Any], current: Dict[str, Any]) -> Set[str]:
+    """Names of variables whose value differs between two runs"""
+    return {
+        name for name in set(baseline) | set(current)
+        if baseline.get(name) != current.get(name)
+    }
+
+
+def plan_incremental(
+    nodes: List[Node],
+    edges: List[Edge],
+    baseline_states: Dict[str, Any],
+    baseline_variables: Dict[str, Any],
+    variables: Dict[str, Any]
+) -> Tuple[Dict[str, Dict[str, Any]], Set[str]]:
+    """
+    Decide which nodes to execute again and which baseline results to reuse.
+
+    Args:
+        nodes: Current workflow nodes
+        edges: Current workflow edges
+        baseline_states: node_states of the baseline run
+        baseline_variables: Variables of the baseline run
+        variables: Variables of the new run
+
+    Returns:
+        (reused node states, dirty node IDs including their downstream closure)
+    """
+    changed = changed_variables(baseline_variables or {}, variables or {})
+    node_ids = {node.id for node in nodes}
+
+    dirty: Set[str] = set()
+    for node in nodes:
+        state = baseline_states.get(node.id)
+        if not isinstance(state, dict) or state.get("status") not in SETTLED_STATUSES:
+            dirty.add(node.id)
+        elif state.get("status") == "completed" and state.get("config_hash") != config_hash(node):
+            dirty.add(node.id)
+        elif changed:
+            read = variables_read(node, variables, node_ids)
+            if read is None or read & changed:
+                dirty.add(node.id)
+
+    # A map node re-runs its whole body, so a dirty body node dirties its map
+    bodies = find_map_bodies(nodes, edges)
+    for map_id, body in bodies.items():
+        if body & dirty:
+            dirty.add(map_id)
+
+    # Everything downstream of a dirty node sees new inputs
+    successors: Dict[str, List[str]] = {node.id: [] for node in nodes}
+    for edge in edges:
+        if edge.from_ in successors and edge.to in successors:
+            successors[edge.from_].append(edge.to)
+
+    queue = deque(dirty)
+    while queue:
+        for successor in successors[queue.popleft()]:
+            if successor not in dirty:
+                dirty.add(successor)
+                queue.append(successor)
+
+    # Map bodies only make sense next to their map's output
+    for map_id, body in bodies.items():
+        if map_id in dirty:
+            dirty |= body
+
+    reused = {
+        node.id: baseline_states[node.id]
+        for node in nodes
+        if node.id not in dirty and baseline_states[node.id].get("status") in REUSABLE_STATUSES
+    }
+    return reused, dirty
@@ -0,0 +1,102 @@
+"""
+Liveness of node outputs within a run.
+
+Every node output used to stay in ``context["outputs"]`` until the run
+ended, so a long pipeline held all of its intermediate results at once.
+The compiled plan knows which nodes read each output (see
+execution.dependencies), so an output is released as soon as its producer
+and every node reading it have finished (completed or skipped); peak
+memory then follows the live frontier of the graph instead of the sum of
+all intermediates.
+
+An opaque node (one whose config references no output, so whatever it
+reads is unknown) keeps every output upstream of it alive until it
+finishes. Released outputs stay persisted in the run's node states; only the
+in-memory copies are dropped. Liveness is tracked at the top level of the
+graph: a read from inside a map body counts until its map node finishes.
+Without inferred dependencies (``infer_dependencies: false``) the readers
+of an output are unknown and nothing is released.
+"""
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+from .plan import ExecutionPlan
+
+
+class OutputLiveness:
+    """Tracks the unfinished readers of every top-level output of one run"""
+
+    def __init__(self, readers: Dict[str, Set[str]]):
+        """
+        Initialize liveness tracking.
+
+        Args:
+            readers: Producer ID -> IDs of the scheduled nodes reading its output
+        """
+        self._pending: Dict[str, Set[str]] = {producer: set(nodes) for producer, nodes in readers.items()}
+        self._reads: Dict[str, Set[str]] = {}
+        for producer, nodes in readers.items():
+            for node_id in nodes:
+                self._reads.setdefault(node_id, set()).add(producer)
+        self._finished: Set[str] = set()
+        self.released = 0
+
+    @classmethod
+    def from_plan(cls, plan: ExecutionPlan) -> Optional["OutputLiveness"]:
+        """Liveness of a plan's top-level outputs, None if their readers are unknown"""
+        if plan.readers is None:
+            return None
+
+        level = {node.id for node in plan.level_nodes}
+        # Body nodes read through the top-level map running them
+        owner: Dict[str, str] = {}
+        for map_id, body in plan.map_bodies.items():
+            if map_id in level:
+                for node_id in body:
+                    owner[node_id] = map_id
+
+        readers: Dict[str, Set[str]] = {}
+        for producer in level:
+            readers[producer] = {
+                owner.get(node_id, node_id)
+                for node_id in plan.readers.get(producer, set())
+            } - {producer}
+
+        # Opaque nodes may read anything upstream of them
+        predecessors: Dict[str, List[str]] = {node_id: [] for node_id in level}
+        for edge in plan.level_edges:
+            if edge.from_ in level and edge.to in level:
+                predecessors[edge.to].append(edge.from_)
+        for reader in {owner.get(node_id, node_id) for node_id in plan.opaque} & level:
+            seen = {reader}
+            queue = deque([reader])
+            while queue:
+                for producer in predecessors[queue.popleft()]:
+                    if producer not in seen:
+                        seen.add(producer)
+                        readers[producer].add(reader)
+                        queue.append(producer)
+        return cls(readers)
+
+    def finished(self, node_id: str) -> List[str]:
+        """
+        Record a finished node.
+
+        Returns:
+            IDs of the outputs no longer needed
+        """
+        self._finished.add(node_id)
+        candidates = [node_id]
+        for producer in self._reads.pop(node_id, ()):
+            self._pending[producer].discard(node_id)
+            candidates.append(producer)
+
+        released = [
+            producer for producer in candidates
+            if producer in self._finished and not self._pending.get(producer)
+        ]
+        for producer in released:
+            self._pending.pop(producer, None)
+            self._finished.discard(producer)
+        self.released += len(released)
+        return released
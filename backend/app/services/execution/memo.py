@@ -0,0 +1,206 @@
+"""
+Content-addressed memoization of node results across runs.
+
+A node's result is stored under a hash of its type, its config and the
+resolved inputs it reads, so a later run that would execute the same node on
+the same inputs reuses the stored result instead:
+
+- every ``{{...}}`` placeholder in the config, rendered against the run
+- every ``source``/``with`` reference (node output, variable or expression)
+- the run variables, for node types whose config holds expressions
+
+Memoization is opt-in per node type (``NODE_MEMO_TTLS``, type -> TTL in
+seconds) and can be overridden per node with ``config.memoize`` (false, true
+or a TTL). Only node types that can be deterministic are eligible; webhooks
+only for GET requests. Results are kept in the Redis cache. Nodes reading a
+streamed output are never memoized: a stream has no content to hash until
+it is consumed.
+"""
+import hashlib
+import json
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from loguru import logger
+
+from ...models.workflow import Node
+from .registry import node_registry
+from .streams import RecordStream
+from .templates import compile_template, render_template
+
+KEY_PREFIX = "node:result"
+
+# Node types whose config holds expressions that may read any variable
+EXPRESSION_TYPES = {"transformer", "filter"}
+
+# Config keys naming another node's output, a variable or an expression
+SOURCE_KEYS = ("source", "with")
+
+# Config keys that do not affect a node's result
+IGNORED_KEYS = {"memoize", "name", "timeout"}
+
+
+def config_strings(value: Any) -> Iterator[str]:
+    """All strings nested in a node config"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from config_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from config_strings(item)
+
+
+def config_sources(value: Any) -> Iterator[str]:
+    """All ``source``/``with`` references nested in a node config"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in SOURCE_KEYS and isinstance(item, str):
+                yield item
+            else:
+                yield from config_sources(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from config_sources(item)
+
+
+class StreamedInputError(ValueError):
+    """Raised when a node reads a streamed output, which cannot be hashed"""
+    pass
+
+
+def node_inputs(
+    node: Node,
+    context: Dict[str, Any],
+    resolve_source: Callable[[str, Dict[str, Any]], Any]
+) -> Dict[str, Any]:
+    """
+    Collect the resolved inputs a node reads from the run context.
+
+    Args:
+        node: Node about to execute
+        context: Runtime context with variables and outputs
+        resolve_source: Resolver for ``source``-style references
+
+    Returns:
+        Mapping of each reference to its resolved value
+
+    Raises:
+        StreamedInputError: If an input is a RecordStream
+    """
+    outputs = context.get("outputs", {})
+    inputs: Dict[str, Any] = {}
+    for text in config_strings(node.config):
+        for placeholder in compile_template(text).placeholders:
+            if any(isinstance(outputs.get(node_id), RecordStream) for node_id in placeholder.output_ids):
+                raise StreamedInputError(f"Node {node.id} reads a streamed output")
+            if placeholder.raw not in inputs:
+                inputs[placeholder.raw] = render_template(placeholder.raw, context)
+
+    for source in config_sources(node.config):
+        value = resolve_source(source, context)
+        if isinstance(value, RecordStream):
+            raise StreamedInputError(f"Node {node.id} reads streamed source '{source}'")
+        inputs[f"source:{source}"] = value
+
+    if node.type in EXPRESSION_TYPES:
+        inputs["variables"] = context.get("variables", {})
+
+    return inputs
+
+
+class NodeMemoizer:
+    """Stores and replays node results keyed by their content hash"""
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, int]] = None,
+        cache_provider: Optional[Callable[[], Any]] = None
+    ):
+        """
+        Initialize memoizer.
+
+        Args:
+            ttls: Node type -> TTL in seconds for types memoized by default
+            cache_provider: Returns the RedisCache to use (None disables memoization)
+        """
+        self.ttls = dict(ttls or {})
+        self.cache_provider = cache_provider or (lambda: None)
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @property
+    def cache(self):
+        return self.cache_provider()
+
+    def ttl_for(self, node: Node) -> Optional[int]:
+        """
+        TTL to memoize a node's result for.
+
+        Returns:
+            TTL in seconds, or None if the node is not memoized
+        """
+        # Only types registered as cacheable (result a pure function of config and inputs)
+        if not node_registry.is_cacheable(node.type):
+            return None
+        if node.type == "webhook" and str(node.config.get("method", "POST")).upper() != "GET":
+            return None
+
+        ttl = self.ttls.get(node.type)
+        override = node.config.get("memoize")
+        if override is False:
+            return None
+        if override is True:
+            ttl = ttl or 3600
+        elif isinstance(override, int) and override > 0:
+            ttl = override
+
+        return ttl or None
+
+    def key(self, node: Node, inputs: Dict[str, Any]) -> str:
+        """Content hash of a node's type, config and resolved inputs"""
+        config = {key: value for key, value in node.config.items() if key not in IGNORED_KEYS}
+        payload = json.dumps(
+            {"type": node.type, "config": config, "inputs": inputs},
+            sort_keys=True,
+            default=str
+        )
+        return f"{KEY_PREFIX}:{node.type}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored result for a key, if any"""
+        cache = self.cache
+        result = await cache.get(key) if cache else None
+        if isinstance(result, dict):
+            self.hits += 1
+            return result
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, result: Dict[str, Any], ttl: int):
+        """Store a completed node result"""
+        cache = self.cache
+        if not cache:
+            return
+        try:
+            # Mongo documents may hold ObjectIds and datetimes; store them as strings
+            value = json.dumps(result, default=str)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Node result is not memoizable: {e}")
+            return
+        if await cache.set(key, value, ttl):
+            self.stores += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Memoization hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "ttls": self.ttls
+        }
@@ -0,0 +1,200 @@
+"""
+Write-behind persistence for workflow runs.
+
+Instead of rewriting the whole WorkflowRun document after every node, the
+writer buffers targeted ``$set``/``$push`` operations and coalesces them
+into a single ``update_one`` per flush interval. Logs, errors and
+communication records are not embedded in the run document at all; they
+are appended to the ``workflow_run_events`` collection with unordered bulk
+inserts, numbered by a per-run sequence. Terminal state changes are flushed
+immediately by the executor via ``close()``.
+"""
+import asyncio
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from loguru import logger
+from pymongo import DESCENDING
+from pymongo.errors import BulkWriteError
+
+from ...core.database import get_database
+from ...models.workflow import WorkflowRun, RunEvent, RunEventKind
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+class RunStateWriter:
+    """Buffers and coalesces incremental updates for one WorkflowRun"""
+
+    def __init__(self, run: WorkflowRun, flush_interval: float = 0.25, max_pending: int = 50):
+        """
+        Initialize run state writer.
+
+        Args:
+            run: Persisted run record to update
+            flush_interval: Seconds to wait before flushing buffered updates
+            max_pending: Flush immediately once this many operations are buffered
+        """
+        self.run = run
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._set: Dict[str, Any] = {}
+        self._push: Dict[str, List[Any]] = {}
+        self._events: List[Dict[str, Any]] = []
+        self._seq = 0
+        self._pending = 0
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.writes = 0
+        self.operations = 0
+        self.events_written = 0
+
+    async def load_sequence(self):
+        """Continue numbering after events left by earlier attempts of this run"""
+        if self.run.id is None:
+            return
+
+        db = await get_database()
+        last = await db[RunEvent.Settings.name].find_one(
+            {"execution_id": self.run.execution_id},
+            projection={"seq": 1},
+            sort=[("seq", DESCENDING)]
+        )
+        if last:
+            self._seq = max(self._seq, last["seq"] + 1)
+
+    def set(self, field: str, value: Any):
+        """Buffer a ``$set`` of a (dotted) field; later values win"""
+        self._set[field] = value
+        self._buffered()
+
+    def set_node_state(self, node_id: str, state: Dict[str, Any]):
+        """Buffer the state of a single node"""
+        self.set(f"node_states.{node_id}", state)
+
+    def push(self, field: str, entry: Any):
+        """Buffer an append to an array field"""
+        self._push.setdefault(field, []).append(entry)
+        self._buffered()
+
+    def append_event(
+        self,
+        kind: RunEventKind,
+        node_id: Optional[str],
+        data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Buffer an append-only run event.
+
+        Args:
+            kind: Event kind (log, error, communication)
+            node_id: Node the event belongs to
+            data: Event payload
+
+        Returns:
+            The event document as it will be stored
+        """
+        event = {
+            "execution_id": self.run.execution_id,
+            "seq": self._seq,
+            "kind": kind.value,
+            "node_id": node_id,
+            "timestamp": datetime.utcnow(),
+            "data": data
+        }
+        self._seq += 1
+        self._events.append(event)
+        self._buffered()
+        return event
+
+    def _buffered(self):
+        self._pending += 1
+        self.operations += 1
+
+        if self._pending >= self.max_pending:
+            self._cancel_scheduled()
+            asyncio.create_task(self._background_flush())
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+        await self._background_flush()
+
+    async def _background_flush(self):
+        try:
+            await self.flush()
+        except Exception:
+            # Already logged; operations stay buffered for the next flush
+            pass
+
+    def _cancel_scheduled(self):
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._flush_task = None
+
+    async def flush(self):
+        """Write all buffered operations in a single update"""
+        async with self._lock:
+            if not self._set and not self._push and not self._events:
+                return
+
+            sets, pushes, events = self._set, self._push, self._events
+            self._set, self._push, self._events, self._pending = {}, {}, [], 0
+
+            if self.run.id is None:
+                # Run was never persisted (e.g. dry runs); nothing to update
+                return
+
+            update: Dict[str, Any] = {}
+            if sets:
+                update["$set"] = sets
+            if pushes:
+                update["$push"] = {field: {"$each": entries} for field, entries in pushes.items()}
+
+            try:
+                db = await get_database()
+                if events:
+                    await self._insert_events(db, events)
+                    events = []
+                if update:
+                    await db[WorkflowRun.Settings.name].update_one({"_id": self.run.id}, update)
+                    self.writes += 1
+            except Exception as e:
+                logger.error(f"Failed to persist state of run {self.run.execution_id}: {e}")
+                # Re-buffer so the next flush retries; newer values take precedence
+                self._set = {**sets, **self._set}
+                for field, entries in pushes.items():
+                    self._push[field] = entries + self._push.get(field, [])
+                self._events = events + self._events
+                self._pending = (
+                    len(self._set)
+                    + sum(len(e) for e in self._push.values())
+                    + len(self._events)
+                )
+                raise
+
+    async def _insert_events(self, db, events: List[Dict[str, Any]]):
+        """Bulk insert events; (execution_id, seq) makes retries idempotent"""
+        try:
+            # insert_many adds _id to the dicts; insert copies so retries stay clean
+            await db[RunEvent.Settings.name].insert_many(
+                [dict(event) for event in events],
+                ordered=False
+            )
+        except BulkWriteError as e:
+            # Events already stored by a partially successful earlier attempt
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+                raise
+        self.events_written += len(events)
+        self.writes += 1
+
+    async def close(self):
+        """Flush everything still buffered (called on terminal status)"""
+        self._cancel_scheduled()
+        await self.flush()
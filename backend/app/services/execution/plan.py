@@ -0,0 +1,293 @@
+"""
+Compiled execution plans.
+
+Everything the executor derives from a workflow's graph alone is computed
+once per workflow version instead of on every run:
+
+- the top-level schedule (map bodies hidden) and one schedule per map body,
+  each with its dependency structure and topological order
+- the data dependencies read from node configs, merged into the edges
+  (see execution.dependencies; disabled by the ``infer_dependencies: false``
+  workflow option)
+- which nodes stream their output (see execution.streams)
+- the parsed templates of every node config string
+- validation: cycles, dangling edges and overlapping map bodies are errors;
+  nodes no start node leads to, conditions that do not compile and data
+  reads the graph cannot honour are reported as warnings
+
+Plans are compiled when a workflow is saved and kept in an in-process LRU
+keyed by workflow ID and ``updated_at``, so repeated triggers of the same
+workflow version skip the graph work. Any process missing a plan (e.g. a
+worker after a restart) compiles it on first use.
+"""
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from ...core.config import settings
+from ...models.workflow import Node, Edge
+from .scheduler import DAGScheduler, GraphCycleError
+from .fanout import find_map_bodies, plan_level
+from .streams import plan_streams
+from .dependencies import merge_dependencies
+from .templates import CompiledTemplate, compile_template
+from .expressions import ExpressionError, compile_expression
+from .memo import config_strings
+
+# Node types whose ``condition`` is an expression
+CONDITION_TYPES = {"condition", "filter"}
+
+
+class PlanValidationError(ValueError):
+    """Raised when a workflow graph cannot be executed"""
+
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__("; ".join(errors))
+
+
+def plan_version(workflow: Any) -> Optional[Tuple[str, int]]:
+    """
+    Cache key of a workflow version: (workflow ID, ``updated_at`` in ms).
+
+    Milliseconds match what MongoDB stores, so a workflow compiled when it
+    is saved has the same key as the copy later loaded to run it. Returns
+    None for workflows without an ID or timestamp (never cached).
+    """
+    workflow_id = getattr(workflow, "id", None)
+    updated_at = getattr(workflow, "updated_at", None)
+    if workflow_id is None or not isinstance(updated_at, datetime):
+        return None
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return str(workflow_id), int(updated_at.timestamp() * 1000)
+
+
+class ExecutionPlan:
+    """Graph-derived, run-independent execution structure of a workflow version"""
+
+    def __init__(
+        self,
+        nodes: List[Node],
+        edges: List[Edge],
+        version: Optional[Tuple[str, int]] = None,
+        infer_dependencies: bool = True
+    ):
+        """
+        Compile a plan.
+
+        Args:
+            nodes: Workflow nodes
+            edges: Workflow edges
+            version: Cache key of the workflow version (see ``plan_version``)
+            infer_dependencies: Add edges for outputs nodes read without one
+
+        Raises:
+            PlanValidationError: If the graph has cycles or overlapping map
+                bodies (dangling edges are only recorded in ``errors``, and
+                ignored when running, so workflows saved before validation
+                still run)
+        """
+        self.version = version
+        self.nodes: Dict[str, Node] = {node.id: node for node in nodes}
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+
+        self.dangling = [
+            (edge.from_, edge.to) for edge in edges
+            if edge.from_ not in self.nodes or edge.to not in self.nodes
+        ]
+        for source, target in self.dangling:
+            self.errors.append(f"Edge {source} -> {target} references an unknown node")
+
+        self.map_bodies: Dict[str, Set[str]] = {}
+        self.edges: List[Edge] = list(edges)
+        self.inferred_edges: List[Edge] = []
+        self.readers: Optional[Dict[str, Set[str]]] = None
+        self.opaque: Set[str] = set()
+        self.level_nodes: List[Node] = []
+        self.level_edges: List[Edge] = []
+        self.scheduler: Optional[DAGScheduler] = None
+        self.body_schedulers: Dict[str, DAGScheduler] = {}
+        try:
+            self.map_bodies = find_map_bodies(nodes, edges)
+            if infer_dependencies:
+                self.edges, self.readers, self.opaque, inference_warnings = merge_dependencies(
+                    nodes, edges, self.map_bodies
+                )
+                self.inferred_edges = self.edges[len(edges):]
+                self.warnings.extend(inference_warnings)
+            self.level_nodes, self.level_edges = plan_level(nodes, self.edges, self.map_bodies)
+            self.scheduler = DAGScheduler(self.level_nodes, self.level_edges)
+            for map_id, body in self.map_bodies.items():
+                if body:
+                    self.body_schedulers[map_id] = DAGScheduler(
+                        *plan_level(nodes, self.edges, self.map_bodies, level=body)
+                    )
+        except (GraphCycleError, ValueError) as e:
+            self.errors.append(str(e))
+            raise PlanValidationError(self.errors)
+
+        self.streaming: Set[str] = plan_streams(nodes, self.edges, self.readers)
+        self.unreachable: List[str] = self._find_unreachable(nodes, edges)
+        if self.unreachable:
+            self.warnings.append(f"Nodes not reachable from a start node: {self.unreachable}")
+
+        # Parsed templates per node
+        self.templates: Dict[str, List[CompiledTemplate]] = {}
+        for node in nodes:
+            self.templates[node.id] = [
+                compile_template(text) for text in config_strings(node.config or {}) if "{{" in text
+            ]
+
+            condition = (node.config or {}).get("condition")
+            if node.type in CONDITION_TYPES and isinstance(condition, str):
+                try:
+                    compile_expression(condition)
+                except ExpressionError as e:
+                    self.warnings.append(f"Condition of node {node.id} does not compile: {e}")
+
+    @property
+    def order(self) -> List[Node]:
+        """Top-level execution order"""
+        return self.scheduler.order
+
+    @staticmethod
+    def _find_unreachable(nodes: List[Node], edges: List[Edge]) -> List[str]:
+        """Nodes no start node leads to (only checked when the workflow has a start node)"""
+        starts = [node.id for node in nodes if node.type == "start"]
+        if not starts:
+            return []
+
+        successors: Dict[str, List[str]] = {node.id: [] for node in nodes}
+        for edge in edges:
+            if edge.from_ in successors and edge.to in successors:
+                successors[edge.from_].append(edge.to)
+
+        seen = set(starts)
+        queue = deque(starts)
+        while queue:
+            for successor in successors[queue.popleft()]:
+                if successor not in seen:
+                    seen.add(successor)
+                    queue.append(successor)
+        return [node.id for node in nodes if node.id not in seen]
+
+
+def compile_plan(workflow: Any) -> ExecutionPlan:
+    """Compile the execution plan of a workflow (model or any object with nodes/edges)"""
+    metadata = getattr(workflow, "metadata", None)
+    if isinstance(metadata, dict):
+        infer = metadata.get("infer_dependencies")
+    else:
+        infer = getattr(metadata, "infer_dependencies", None)
+    return ExecutionPlan(
+        list(workflow.nodes),
+        list(workflow.edges),
+        version=plan_version(workflow),
+        infer_dependencies=infer is not False
+    )
+
+
+class PlanCache:
+    """LRU of compiled plans keyed by workflow version"""
+
+    def __init__(self, max_size: int = 256):
+        """
+        Initialize plan cache.
+
+        Args:
+            max_size: Plans kept before the least recently used is evicted
+        """
+        self.max_size = max(1, int(max_size))
+        self._plans: "OrderedDict[Tuple[str, int], ExecutionPlan]" = OrderedDict()
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, workflow: Any) -> ExecutionPlan:
+        """
+        Plan of a workflow version, compiled on a miss.
+
+        Raises:
+            PlanValidationError: If the workflow graph is invalid
+        """
+        version = plan_version(workflow)
+        plan = self._plans.get(version) if version else None
+        if plan is not None:
+            self._plans.move_to_end(version)
+            self._hits += 1
+            return plan
+
+        self._misses += 1
+        plan = compile_plan(workflow)
+        if version:
+            self.put(plan)
+        return plan
+
+    def put(self, plan: ExecutionPlan, workflow: Any = None):
+        """
+        Cache a compiled plan; older versions of the same workflow are dropped.
+
+        Args:
+            plan: Compiled plan
+            workflow: Saved workflow the plan was compiled from, to key a plan
+                compiled before the workflow had its ID or final ``updated_at``
+        """
+        if workflow is not None:
+            plan.version = plan_version(workflow)
+        if not plan.version:
+            return
+        self.invalidate(plan.version[0])
+        self._plans[plan.version] = plan
+        while len(self._plans) > self.max_size:
+            self._plans.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, workflow_id: str):
+        """Drop every cached plan of a workflow"""
+        for version in [version for version in self._plans if version[0] == str(workflow_id)]:
+            del self._plans[version]
+
+    def clear(self):
+        self._plans.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get plan cache statistics.
+
+        Returns:
+            Dictionary with cache size, hits, misses and evictions
+        """
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._plans),
+            "max_size": self.max_size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 3) if lookups else None,
+            "evictions": self._evictions
+        }
+
+
+def validate_workflow(workflow: Any) -> ExecutionPlan:
+    """
+    Compile a workflow being saved.
+
+    Raises:
+        PlanValidationError: If the graph has any error, dangling edges included
+    """
+    plan = compile_plan(workflow)
+    if plan.errors:
+        raise PlanValidationError(plan.errors)
+    for warning in plan.warnings:
+        logger.warning(f"Workflow {getattr(workflow, 'name', '')}: {warning}")
+    return plan
+
+
+# Global plan cache shared by the API (filled on save) and the executor
+plan_cache = PlanCache(max_size=settings.WORKFLOW_PLAN_CACHE_SIZE)
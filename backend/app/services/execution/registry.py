@@ -0,0 +1,177 @@
+"""
+Node handler registry.
+
+Maps a node type to the handler executing it, so dispatch is one dict
+lookup however many node types exist, and declares what the engine may do
+with the type's nodes:
+
+- cacheable: results may be memoized across runs (see execution.memo)
+- produces_stream / consumes_stream: the node may output a RecordStream,
+  or read one given as its ``source`` (see execution.streams)
+- cpu_bound: the handler is run off the event loop, at most one per core
+
+A handler is either the name of a WorkflowExecutor method (the built-in
+types), a callable, or an import path "package.module:function" that is
+only imported when a node of that type first runs, so custom node types
+cost nothing at startup. Callables and imported handlers are called as
+``handler(executor, node, context, run)`` and may be sync or async.
+
+Custom types are registered in code with ``node_registry.register`` or
+through the NODE_PLUGINS setting, e.g.
+``{"slack": {"handler": "plugins.slack:execute", "cacheable": true}}``.
+"""
+import asyncio
+import importlib
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Set, Union
+
+from loguru import logger
+
+from ...core.config import settings
+from .fanout import MAP_NODE_TYPE
+
+
+@dataclass
+class NodeHandler:
+    """Handler and capabilities of one node type"""
+    node_type: str
+    handler: Union[str, Callable]
+    cacheable: bool = False
+    produces_stream: bool = False
+    consumes_stream: bool = False
+    cpu_bound: bool = False
+    needs_run: bool = False  # Built-in methods only: also pass the run record
+    _resolved: Optional[Callable] = field(default=None, repr=False)
+
+    @property
+    def is_method(self) -> bool:
+        return isinstance(self.handler, str) and ":" not in self.handler
+
+    def resolve(self) -> Callable:
+        """Import a plugin handler on first use"""
+        if self._resolved is None:
+            if callable(self.handler):
+                self._resolved = self.handler
+            else:
+                module_path, _, attribute = self.handler.partition(":")
+                module = importlib.import_module(module_path)
+                self._resolved = getattr(module, attribute)
+                logger.info(f"Loaded handler for node type '{self.node_type}' from {self.handler}")
+        return self._resolved
+
+
+class NodeRegistry:
+    """Node type -> handler lookup"""
+
+    def __init__(self, cpu_slots: Optional[int] = None):
+        """
+        Initialize registry.
+
+        Args:
+            cpu_slots: CPU-bound handlers running at once (defaults to the core count)
+        """
+        self._handlers: Dict[str, NodeHandler] = {}
+        self._cpu_slots = cpu_slots or os.cpu_count() or 1
+        self._cpu_semaphore: Optional[asyncio.Semaphore] = None
+        self._cpu_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def register(
+        self,
+        node_type: str,
+        handler: Union[str, Callable],
+        replace: bool = False,
+        **capabilities: bool
+    ) -> NodeHandler:
+        """
+        Register the handler of a node type.
+
+        Args:
+            node_type: Node type (case-insensitive)
+            handler: Executor method name, callable, or "module:function" import path
+            replace: Allow overriding an existing registration
+            **capabilities: cacheable, produces_stream, consumes_stream, cpu_bound
+
+        Raises:
+            ValueError: If the type is already registered and ``replace`` is not set
+        """
+        key = node_type.lower()
+        if key in self._handlers and not replace:
+            raise ValueError(f"Node type '{node_type}' is already registered")
+        spec = NodeHandler(node_type=key, handler=handler, **capabilities)
+        self._handlers[key] = spec
+        return spec
+
+    def unregister(self, node_type: str):
+        self._handlers.pop(node_type.lower(), None)
+
+    def get(self, node_type: str) -> Optional[NodeHandler]:
+        """Handler of a node type, None if unknown"""
+        return self._handlers.get(node_type.lower())
+
+    def types(self) -> Set[str]:
+        return set(self._handlers)
+
+    def is_cacheable(self, node_type: str) -> bool:
+        spec = self.get(node_type)
+        return bool(spec and spec.cacheable)
+
+    def produces_stream(self, node_type: str) -> bool:
+        spec = self.get(node_type)
+        return bool(spec and spec.produces_stream)
+
+    def consumes_stream(self, node_type: str) -> bool:
+        spec = self.get(node_type)
+        return bool(spec and spec.consumes_stream)
+
+    def load_plugins(self, plugins: Dict[str, Any]):
+        """Register custom node types from config (handlers stay unimported until used)"""
+        for node_type, plugin in plugins.items():
+            if isinstance(plugin, str):
+                plugin = {"handler": plugin}
+            self.register(node_type, replace=True, **plugin)
+
+    async def call(self, spec: NodeHandler, executor: Any, node: Any, context: Dict[str, Any], run: Any) -> Dict[str, Any]:
+        """Invoke a node's handler"""
+        if spec.is_method:
+            method = getattr(executor, spec.handler)
+            if spec.needs_run:
+                return await method(node, context, run)
+            return await method(node, context)
+
+        handler = spec.resolve()
+        if not spec.cpu_bound:
+            result = handler(executor, node, context, run)
+            return await result if asyncio.iscoroutine(result) else result
+
+        async with self._cpu_slot():
+            if asyncio.iscoroutinefunction(handler):
+                return await handler(executor, node, context, run)
+            return await asyncio.to_thread(handler, executor, node, context, run)
+
+    def _cpu_slot(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._cpu_loop is not loop:
+            self._cpu_semaphore = asyncio.Semaphore(self._cpu_slots)
+            self._cpu_loop = loop
+        return self._cpu_semaphore
+
+
+# Global registry with the built-in node types
+node_registry = NodeRegistry()
+
+node_registry.register("start", "_execute_start_node")
+node_registry.register("end", "_execute_end_node")
+node_registry.register("condition", "_execute_condition_node")
+node_registry.register("delay", "_execute_delay_node")
+node_registry.register("ai-processor", "_execute_ai_node", cacheable=True)
+node_registry.register("transformer", "_execute_transformer_node", cacheable=True)
+node_registry.register("webhook", "_execute_webhook_node", cacheable=True)
+node_registry.register("data-source", "_execute_data_source_node", cacheable=True, produces_stream=True)
+node_registry.register(
+    "filter", "_execute_filter_node", cacheable=True, produces_stream=True, consumes_stream=True
+)
+node_registry.register("email", "_execute_email_node", consumes_stream=True)
+node_registry.register(MAP_NODE_TYPE, "_execute_map_node", consumes_stream=True, needs_run=True)
+
+node_registry.load_plugins(settings.NODE_PLUGINS)
@@ -0,0 +1,182 @@
+"""
+DAG Scheduler for workflow execution.
+
+Computes node dependencies once (O(V+E)) and runs every node as soon as all
+of its upstream nodes have finished, so independent branches overlap instead
+of adding their latencies together.
+
+Branching: an edge may carry a ``branch`` label. When a node finishes, its
+labelled outgoing edges are taken only if the label matches the ``branch``
+in the node's result; unlabelled edges are taken unless the result sets
+``halt``. A node runs once all of its incoming edges are resolved and at
+least one was taken; if none was taken it is skipped, and its own outgoing
+edges are resolved as not taken. This dead-path elimination only visits the
+pruned region, so reachability is updated incrementally rather than
+recomputed over the whole graph.
+
+Parking: a result with ``park`` set (e.g. a long delay) leaves the node's
+outgoing edges unresolved, so everything downstream of it stays pending
+while independent branches run to completion. The run is resumed later and
+re-scheduled from its checkpoint.
+"""
+import asyncio
+from collections import deque
+from typing import Dict, List, Any, Callable, Awaitable, Optional, Set, Tuple
+
+from loguru import logger
+
+from ...models.workflow import Node
+
+
+class GraphCycleError(Exception):
+    """Raised when the workflow graph contains a cycle"""
+    pass
+
+
+class DAGScheduler:
+    """
+    Dependency-aware scheduler for a workflow graph.
+
+    Nodes with no pending upstream dependencies are launched concurrently,
+    bounded by ``max_concurrency`` per run.
+    """
+
+    def __init__(self, nodes: List[Node], edges: List, max_concurrency: int = 8):
+        """
+        Initialize scheduler and build the dependency structure.
+
+        Args:
+            nodes: Workflow nodes
+            edges: Workflow edges (``from_`` -> ``to``)
+            max_concurrency: Maximum number of nodes executing at once
+
+        Raises:
+            GraphCycleError: If the graph contains a cycle
+        """
+        self.nodes: Dict[str, Node] = {node.id: node for node in nodes}
+        self.successors: Dict[str, List[str]] = {node_id: [] for node_id in self.nodes}
+        self.out_edges: Dict[str, List[Tuple[str, Optional[str]]]] = {node_id: [] for node_id in self.nodes}
+        self.in_degree: Dict[str, int] = {node_id: 0 for node_id in self.nodes}
+        self.max_concurrency = max(1, int(max_concurrency))
+
+        for edge in edges:
+            if edge.from_ not in self.nodes or edge.to not in self.nodes:
+                logger.warning(f"Ignoring dangling edge {edge.from_} -> {edge.to}")
+                continue
+            self.successors[edge.from_].append(edge.to)
+            self.out_edges[edge.from_].append((edge.to, getattr(edge, "branch", None)))
+            self.in_degree[edge.to] += 1
+
+        self.order: List[Node] = self._topological_order()
+
+    def _topological_order(self) -> List[Node]:
+        """Kahn's algorithm; ties are broken by the original node order"""
+        remaining = dict(self.in_degree)
+        queue = deque(node_id for node_id, degree in remaining.items() if degree == 0)
+        order = []
+
+        while queue:
+            node_id = queue.popleft()
+            order.append(self.nodes[node_id])
+            for successor in self.successors[node_id]:
+                remaining[successor] -= 1
+                if remaining[successor] == 0:
+                    queue.append(successor)
+
+        if len(order) != len(self.nodes):
+            cyclic = [node_id for node_id, degree in remaining.items() if degree > 0]
+            raise GraphCycleError(f"Workflow graph contains a cycle involving nodes: {cyclic}")
+
+        return order
+
+    @staticmethod
+    def edge_taken(branch: Optional[str], result: Any) -> bool:
+        """Whether an outgoing edge with ``branch`` label is followed given a node result"""
+        if not isinstance(result, dict):
+            return branch is None
+        if branch is None:
+            return not result.get("halt", False)
+        chosen = result.get("branch")
+        return chosen is not None and str(chosen).lower() == str(branch).lower()
+
+    async def run(
+        self,
+        execute_node: Callable[[Node], Awaitable[Any]],
+        on_skip: Optional[Callable[[Node], None]] = None,
+        max_concurrency: Optional[int] = None
+    ) -> List[str]:
+        """
+        Execute all reachable nodes, launching every ready node concurrently.
+
+        Args:
+            execute_node: Coroutine function executing a single node and
+                returning its result. An exception raised by it aborts the
+                run and cancels the nodes still in flight.
+            on_skip: Called for every node pruned because none of its
+                incoming edges was taken
+            max_concurrency: Overrides the scheduler's limit for this run
+                (a compiled scheduler is shared by every run of a workflow)
+
+        Returns:
+            IDs of the skipped nodes (nodes downstream of a parked node are
+            neither run nor skipped)
+        """
+        remaining = dict(self.in_degree)
+        live_inputs = {node_id: 0 for node_id in self.nodes}
+        ready = deque(node_id for node_id, degree in remaining.items() if degree == 0)
+        skipped: List[str] = []
+        semaphore = asyncio.Semaphore(max(1, int(max_concurrency or self.max_concurrency)))
+        running: Set[asyncio.Task] = set()
+        task_nodes: Dict[asyncio.Task, str] = {}
+
+        async def run_bounded(node: Node):
+            async with semaphore:
+                return await execute_node(node)
+
+        def resolve(resolved: deque):
+            """Propagate resolved (target, taken) edges; skipped nodes kill their out-edges"""
+            while resolved:
+                target, taken = resolved.popleft()
+                remaining[target] -= 1
+                if taken:
+                    live_inputs[target] += 1
+                if remaining[target] > 0:
+                    continue
+
+                if live_inputs[target]:
+                    ready.append(target)
+                else:
+                    skipped.append(target)
+                    if on_skip:
+                        on_skip(self.nodes[target])
+                    resolved.extend((successor, False) for successor, _ in self.out_edges[target])
+
+        try:
+            while ready or running:
+                while ready:
+                    node_id = ready.popleft()
+                    task = asyncio.create_task(run_bounded(self.nodes[node_id]))
+                    task_nodes[task] = node_id
+                    running.add(task)
+
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    node_id = task_nodes.pop(task)
+                    # Re-raise node failures
+                    result = task.result()
+                    if isinstance(result, dict) and result.get("park"):
+                        continue
+
+                    resolve(deque(
+                        (successor, self.edge_taken(branch, result))
+                        for successor, branch in self.out_edges[node_id]
+                    ))
+
+            return skipped
+
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
@@ -0,0 +1,173 @@
+"""
+Streaming node-to-node pipelines.
+
+By default a node's output is fully materialized in ``context["outputs"]``
+before its successors start. A node configured with ``stream: true`` may
+instead output a RecordStream: record batches produced in the background
+(e.g. from a Motor cursor read with ``batch_size``) into a small bounded
+buffer. Its consumer starts right away and pulls batches as they arrive;
+when the consumer falls behind the buffer fills up and the producer waits,
+so memory stays bounded by a few batches.
+
+A stream has exactly one consumer, so a node only streams when its single
+successor is a stream-capable node reading it as ``source``; otherwise its
+output is materialized as usual.
+"""
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+from ...models.workflow import Node, Edge
+from .fanout import is_each_edge
+from .registry import node_registry
+
+_END = object()
+
+
+class _StreamFailure:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class RecordStream:
+    """Bounded, single-consumer stream of record batches"""
+
+    def __init__(
+        self,
+        batches: AsyncIterator[List[Any]],
+        max_buffered_batches: int = 4,
+        upstream: Optional["RecordStream"] = None
+    ):
+        """
+        Initialize record stream.
+
+        Args:
+            batches: Async iterator producing lists of records
+            max_buffered_batches: Batches buffered ahead of the consumer
+            upstream: Stream this one reads from (closed along with it)
+        """
+        self._batches = batches
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_buffered_batches))
+        self._upstream = upstream
+        self._task: Optional[asyncio.Task] = None
+        self._consumed = False
+
+        # Metrics
+        self.batches_produced = 0
+        self.records_produced = 0
+
+    def start(self):
+        """Start producing in the background (ahead of the consumer)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._produce())
+
+    async def _produce(self):
+        try:
+            async for batch in self._batches:
+                if not batch:
+                    continue
+                # Blocks while the buffer is full: backpressure on the source
+                await self._queue.put(batch)
+                self.batches_produced += 1
+                self.records_produced += len(batch)
+            await self._queue.put(_END)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._queue.put(_StreamFailure(e))
+
+    async def iter_batches(self) -> AsyncIterator[List[Any]]:
+        """
+        Consume the stream batch by batch.
+
+        Raises:
+            RuntimeError: If the stream was already consumed
+            Exception: Whatever the producer raised
+        """
+        if self._consumed:
+            raise RuntimeError("Record stream can only be consumed once")
+        self._consumed = True
+        self.start()
+
+        while True:
+            batch = await self._queue.get()
+            if batch is _END:
+                return
+            if isinstance(batch, _StreamFailure):
+                raise batch.error
+            yield batch
+
+    async def iter_records(self) -> AsyncIterator[Any]:
+        """Consume the stream record by record"""
+        async for batch in self.iter_batches():
+            for record in batch:
+                yield record
+
+    async def collect(self) -> List[Any]:
+        """Materialize the remaining stream into a list"""
+        records: List[Any] = []
+        async for batch in self.iter_batches():
+            records.extend(batch)
+        return records
+
+    def pipe(self, transform: Callable[[List[Any]], List[Any]]) -> "RecordStream":
+        """Stream of ``transform`` applied to every batch of this stream"""
+        async def transformed():
+            async for batch in self.iter_batches():
+                yield transform(batch)
+
+        return RecordStream(transformed(), self._queue.maxsize, upstream=self)
+
+    async def aclose(self):
+        """Stop producing and release the source (e.g. a database cursor)"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if self._upstream:
+            await self._upstream.aclose()
+
+
+async def iter_items(source: Any) -> AsyncIterator[Any]:
+    """Iterate over a list or a RecordStream alike"""
+    if isinstance(source, RecordStream):
+        async for record in source.iter_records():
+            yield record
+    else:
+        for record in source:
+            yield record
+
+
+def plan_streams(
+    nodes: List[Node],
+    edges: List[Edge],
+    readers: Optional[Dict[str, Set[str]]] = None
+) -> Set[str]:
+    """
+    IDs of the nodes that stream their output to their consumer.
+
+    A node streams when it asks to (``stream: true``), its type can produce
+    a stream, and its only successor is of a type consuming streams (see
+    execution.registry) and reads it as ``source``. Given the nodes reading
+    each output (see execution.dependencies), no other node may read it.
+    """
+    by_id: Dict[str, Node] = {node.id: node for node in nodes}
+    successors: Dict[str, List[str]] = {node.id: [] for node in nodes}
+    for edge in edges:
+        if edge.from_ in successors and edge.to in by_id and not is_each_edge(edge):
+            successors[edge.from_].append(edge.to)
+
+    streaming: Set[str] = set()
+    for node in nodes:
+        if not node.config.get("stream") or not node_registry.produces_stream(node.type):
+            continue
+        consumers = successors[node.id]
+        if len(consumers) != 1:
+            continue
+        consumer = by_id[consumers[0]]
+        if readers is not None and readers.get(node.id, set()) - {consumer.id}:
+            continue
+        if node_registry.consumes_stream(consumer.type) and consumer.config.get("source") == node.id:
+            streaming.add(node.id)
+
+    return streaming
@@ -0,0 +1,204 @@
+"""
+Compiled template engine for node configuration strings.
+
+Templates are parsed once into a cached token list. Each ``{{...}}``
+placeholder is compiled into the lookups it may need, so rendering is a
+single pass that touches only the variables and node outputs the template
+actually references.
+
+Supported placeholders:
+- ``{{name}}``: workflow variable (dotted variable names are matched exactly first)
+- ``{{user.address.city}}``: path into a workflow variable
+- ``{{outputs.node-id}}``: output of a node
+- ``{{outputs.node-id.email}}``: path into a node output. Numeric segments
+  index into lists. Name segments applied to a list are projected over its
+  items, so ``{{outputs.mongodb-fetch-1.email}}`` renders the email of
+  every fetched document, comma separated.
+
+Placeholders that cannot be resolved are left in the output unchanged.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*([^{}]+?)\s*\}\}")
+OUTPUTS_PREFIX = "outputs."
+
+_MISSING = object()
+
+# (root key, remaining path) pairs tried in order until one resolves
+Candidates = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+def _split_candidates(expression: str) -> Candidates:
+    """All (key, path) splits of a dotted expression, longest key first"""
+    parts = expression.split(".")
+    return tuple(
+        (".".join(parts[:index]), tuple(parts[index:]))
+        for index in range(len(parts), 0, -1)
+    )
+
+
+class Placeholder:
+    """A compiled ``{{...}}`` reference"""
+
+    __slots__ = ("raw", "expression", "variable_candidates", "output_candidates")
+
+    def __init__(self, raw: str, expression: str):
+        self.raw = raw
+        self.expression = expression
+        self.output_candidates: Candidates = ()
+        self.variable_candidates: Candidates = _split_candidates(expression)
+
+        if expression.startswith(OUTPUTS_PREFIX) and len(expression) > len(OUTPUTS_PREFIX):
+            self.output_candidates = _split_candidates(expression[len(OUTPUTS_PREFIX):])
+            # A variable literally named "outputs.x" still takes precedence
+            self.variable_candidates = self.variable_candidates[:1]
+
+    @property
+    def output_ids(self) -> List[str]:
+        """Node IDs this placeholder may read"""
+        return [key for key, _ in self.output_candidates]
+
+    def resolve(self, variables: Dict[str, Any], outputs: Dict[str, Any]) -> Tuple[Any, bool]:
+        """
+        Resolve against a run context.
+
+        Returns:
+            (value, projected) or (_MISSING, False) if unresolved
+        """
+        # Exact variable name first (matches the original replacement order)
+        key, path = self.variable_candidates[0]
+        if not path and key in variables:
+            return variables[key], False
+
+        for key, path in self.output_candidates:
+            if key in outputs:
+                return _walk(outputs[key], path)
+
+        for key, path in self.variable_candidates[1:]:
+            if key in variables:
+                return _walk(variables[key], path)
+
+        return _MISSING, False
+
+
+def _walk(value: Any, path: Tuple[str, ...]) -> Tuple[Any, bool]:
+    """Follow a path of keys/indexes; name segments on lists project over items"""
+    projected = False
+    for segment in path:
+        if isinstance(value, dict):
+            value = value.get(segment, _MISSING)
+        elif isinstance(value, (list, tuple)):
+            if segment.lstrip("-").isdigit():
+                index = int(segment)
+                value = value[index] if -len(value) <= index < len(value) else _MISSING
+            else:
+                value = [
+                    item[segment] for item in value
+                    if isinstance(item, dict) and segment in item
+                ]
+                projected = True
+                if not value:
+                    value = _MISSING
+        elif not segment.startswith("_"):
+            value = getattr(value, segment, _MISSING)
+        else:
+            value = _MISSING
+
+        if value is _MISSING:
+            return _MISSING, False
+    return value, projected
+
+
+def _to_text(value: Any, projected: bool) -> str:
+    if projected:
+        return ", ".join(str(item) for item in value)
+    return str(value)
+
+
+class CompiledTemplate:
+    """A template parsed into literal strings and placeholders"""
+
+    __slots__ = ("source", "tokens", "is_static")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.tokens: List[Union[str, Placeholder]] = []
+
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            if match.start() > position:
+                self.tokens.append(source[position:match.start()])
+            self.tokens.append(Placeholder(match.group(0), match.group(1)))
+            position = match.end()
+        if position < len(source):
+            self.tokens.append(source[position:])
+
+        # True if the template contains no placeholders
+        self.is_static = not any(isinstance(token, Placeholder) for token in self.tokens)
+
+    @property
+    def placeholders(self) -> List[Placeholder]:
+        return [token for token in self.tokens if isinstance(token, Placeholder)]
+
+    def render(self, context: Dict[str, Any]) -> str:
+        """
+        Render against a run context.
+
+        Args:
+            context: Runtime context with "variables" and "outputs"
+
+        Returns:
+            Rendered string
+        """
+        if self.is_static:
+            return self.source
+
+        variables = context.get("variables") or {}
+        outputs = context.get("outputs") or {}
+
+        parts = []
+        for token in self.tokens:
+            if isinstance(token, str):
+                parts.append(token)
+                continue
+
+            value, projected = token.resolve(variables, outputs)
+            parts.append(token.raw if value is _MISSING else _to_text(value, projected))
+        return "".join(parts)
+
+
+@lru_cache(maxsize=4096)
+def compile_template(source: str) -> CompiledTemplate:
+    """Parse a template once; repeated renders reuse the cached token list"""
+    return CompiledTemplate(source)
+
+
+def render_template(template: Optional[str], context: Dict[str, Any]) -> str:
+    """
+    Render a template string.
+
+    Args:
+        template: Template with ``{{...}}`` placeholders
+        context: Runtime context with "variables" and "outputs"
+
+    Returns:
+        Rendered string ("" for an empty template)
+    """
+    if not template:
+        return ""
+    if "{{" not in template:
+        return template
+    return compile_template(template).render(context)
+
+
+def render_value(value: Any, context: Dict[str, Any]) -> Any:
+    """Recursively render every string inside dicts and lists"""
+    if isinstance(value, str):
+        return render_template(value, context) if value else value
+    if isinstance(value, dict):
+        return {key: render_value(item, context) for key, item in value.items()}
+    if isinstance(value, list):
+        return [render_value(item, context) for item in value]
+    return value
@@ -0,0 +1,473 @@
+"""
+Vectorized transformer engine for list/tabular node outputs.
+
+List-of-dict outputs (e.g. ``_fetch_from_mongodb`` results) are converted
+once into a columnar ``Frame`` of NumPy arrays. Operations then work on
+whole columns instead of looping over records in Python, and the result is
+converted back to records at the end.
+
+Operations (applied in order):
+
+    {"op": "select", "fields": ["name", "email"]}            # or "exclude": [...]
+    {"op": "rename", "mapping": {"name": "full_name"}}
+    {"op": "map", "fields": {"age_next": "age + 1", "label": "upper(plan)"}}
+    {"op": "filter", "condition": "age >= 18 and plan != 'free'"}
+    {"op": "group_by", "by": ["plan"], "aggregations": {
+        "users": "count",
+        "avg_age": {"field": "age", "func": "mean"}
+    }}
+    {"op": "aggregate", "aggregations": {"total": {"field": "amount", "func": "sum"}}}
+    {"op": "join", "with": "orders-1", "on": {"left": "_id", "right": "user_id"}, "how": "left"}
+    {"op": "sort", "by": ["plan", "age"], "descending": false}
+    {"op": "limit", "count": 100, "offset": 0}
+
+``map`` and ``filter`` use the safe expression engine; expressions it cannot
+evaluate column-wise fall back to per-row evaluation. Aggregation functions:
+count, sum, mean, min, max, first, last, list. Missing fields become None.
+"""
+from typing import Dict, Any, List, Optional, Callable, Tuple, Union
+
+import numpy as np
+
+from .expressions import compile_expression, to_column, _get, _is_none, _truth
+
+
+class TransformError(ValueError):
+    """Raised when a transform operation is invalid for its input"""
+    pass
+
+
+class Frame:
+    """Columnar table: column name -> NumPy array, all of equal length"""
+
+    def __init__(self, columns: Dict[str, np.ndarray], length: int):
+        self.columns = columns
+        self.length = length
+
+    @classmethod
+    def from_records(cls, records: List[Any]) -> "Frame":
+        """Build columns from a list of dicts (one pass per field)"""
+        if any(not isinstance(record, dict) for record in records):
+            raise TransformError("Transformer input must be a list of objects")
+
+        names = list(dict.fromkeys(key for record in records for key in record))
+        return cls(
+            {name: to_column([record.get(name) for record in records], promote=False) for name in names},
+            len(records)
+        )
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Convert back to a list of dicts with plain Python values"""
+        names = list(self.columns)
+        if not names:
+            return [{} for _ in range(self.length)]
+        values = [self.columns[name].tolist() for name in names]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+    def take(self, indices: np.ndarray) -> "Frame":
+        """Rows at ``indices`` (a -1 index yields a row of None)"""
+        missing = indices < 0
+        if not missing.any():
+            return Frame({name: column[indices] for name, column in self.columns.items()}, len(indices))
+
+        safe = np.where(missing, 0, indices)
+        columns = {}
+        for name, column in self.columns.items():
+            values = column[safe].astype(object) if len(column) else np.full(len(indices), None, dtype=object)
+            values[missing] = None
+            columns[name] = values
+        return Frame(columns, len(indices))
+
+    def column(self, name: str) -> np.ndarray:
+        if name in self.columns:
+            return self.columns[name]
+        return np.full(self.length, None, dtype=object)
+
+    def path_column(self, path: Tuple[str, ...], variables: Dict[str, Any]) -> np.ndarray:
+        """Column for an expression field path (falls back to a broadcast variable)"""
+        root, rest = path[0], path[1:]
+        if root == "item" and rest:
+            root, rest = rest[0], rest[1:]
+        elif root == "item":
+            raise TypeError("Whole-row values are not supported column-wise")
+
+        if root in self.columns:
+            column = self.columns[root]
+            if not rest:
+                # Mixed ints and floats are only promoted for evaluation
+                return to_column(column.tolist()) if column.dtype == object else column
+            values = column.tolist()
+        else:
+            values = [variables.get(root)] * self.length
+
+        for key in rest:
+            values = [_get(value, key) for value in values]
+        return to_column(values)
+
+
+# ==================== HELPERS ====================
+
+def _factorize(column: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode values as integer codes in order of first appearance.
+
+    Returns:
+        (codes per row, index of the first row of each code)
+    """
+    if column.dtype.kind in "iufbU" and len(column):
+        _, first, inverse = np.unique(column, return_index=True, return_inverse=True)
+        order = np.argsort(first, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        return rank[inverse.ravel()], first[order]
+
+    # Mixed / None-containing columns: hash-based encoding
+    mapping: Dict[Any, int] = {}
+    codes = np.empty(len(column), dtype=np.int64)
+    first = []
+    for index, value in enumerate(column.tolist()):
+        key = _hashable(value)
+        code = mapping.get(key)
+        if code is None:
+            code = mapping[key] = len(first)
+            first.append(index)
+        codes[index] = code
+    return codes, np.array(first, dtype=np.int64)
+
+
+def _hashable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(sorted((key, _hashable(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+def _group_codes(frame: Frame, by: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Combined group codes over several key columns"""
+    codes, first = _factorize(frame.column(by[0]))
+    for name in by[1:]:
+        more, more_first = _factorize(frame.column(name))
+        codes, first = _factorize(codes * len(more_first) + more)
+    return codes, first
+
+
+def _numeric(column: np.ndarray, field: str) -> np.ndarray:
+    """Float view of a column; None becomes NaN"""
+    kind = column.dtype.kind
+    if kind in "iub":
+        return column.astype(np.float64)
+    if kind == "f":
+        return column
+    try:
+        if kind == "O":
+            return np.array([np.nan if value is None else value for value in column], dtype=np.float64)
+        return column.astype(np.float64)
+    except (TypeError, ValueError):
+        raise TransformError(f"Field '{field}' is not numeric")
+
+
+def _nan_to_none(values: np.ndarray) -> np.ndarray:
+    """NaN -> None so results serialize cleanly"""
+    result = values.astype(object)
+    result[np.isnan(values)] = None
+    return result
+
+
+def _aggregate(frame: Frame, codes: np.ndarray, groups: int, spec: Union[str, Dict[str, Any]]) -> np.ndarray:
+    """Compute one aggregation per group"""
+    if isinstance(spec, str):
+        spec = {"func": spec}
+    func = spec.get("func", "count")
+    field = spec.get("field")
+
+    if func == "count":
+        if field is None:
+            return np.bincount(codes, minlength=groups)
+        present = ~_is_none(frame.column(field))
+        return np.bincount(codes[present], minlength=groups)
+
+    if field is None:
+        raise TransformError(f"Aggregation '{func}' requires a field")
+    column = frame.column(field)
+
+    if func == "first":
+        return column[np.unique(codes, return_index=True)[1]]
+    if func == "last":
+        return column[frame.length - 1 - np.unique(codes[::-1], return_index=True)[1]]
+
+    if func == "list":
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes, minlength=groups)
+        parts = np.split(column[order], np.cumsum(counts)[:-1])
+        result = np.empty(groups, dtype=object)
+        result[:] = [part.tolist() for part in parts]
+        return result
+
+    values = _numeric(column, field)
+    present = ~np.isnan(values)
+    valid_codes, valid_values = codes[present], values[present]
+    counts = np.bincount(valid_codes, minlength=groups)
+
+    integral = column.dtype.kind in "iu"
+
+    if func == "sum":
+        sums = np.bincount(valid_codes, weights=valid_values, minlength=groups)
+        return sums.astype(np.int64) if integral else sums
+    if func == "mean":
+        sums = np.bincount(valid_codes, weights=valid_values, minlength=groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return _nan_to_none(np.where(counts > 0, sums / np.maximum(counts, 1), np.nan))
+    if func in ("min", "max"):
+        fill = np.inf if func == "min" else -np.inf
+        result = np.full(groups, fill)
+        (np.minimum if func == "min" else np.maximum).at(result, valid_codes, valid_values)
+        result[counts == 0] = np.nan
+        if integral and (counts > 0).all():
+            return result.astype(np.int64)
+        return _nan_to_none(result)
+
+    raise TransformError(f"Unsupported aggregation function: {func}")
+
+
+def _sort_key(value: Any) -> Tuple[str, Any]:
+    """Numbers (bool, int, float) share one scale; other values group by type"""
+    if isinstance(value, (bool, int, float)):
+        return "", value
+    return str(type(value)), value
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _sort_rank(column: np.ndarray, descending: bool = False) -> np.ndarray:
+    """Integer ranks usable for stable ascending sorts (None/NaN last in either direction)"""
+    if column.dtype.kind in "iufbU":
+        ranks = np.unique(column, return_inverse=True)[1].ravel()
+        missing = np.isnan(column) if column.dtype.kind == "f" else np.zeros(len(column), dtype=bool)
+    else:
+        values = column.tolist()
+        missing = np.array([_is_missing(value) for value in values], dtype=bool)
+        present = sorted(
+            {_hashable(value) for value, absent in zip(values, missing) if not absent}, key=_sort_key
+        )
+        positions = {value: rank for rank, value in enumerate(present)}
+        ranks = np.array(
+            [0 if absent else positions[_hashable(value)] for value, absent in zip(values, missing)],
+            dtype=np.int64
+        )
+
+    if descending:
+        ranks = -ranks
+    # Outranks every present value whichever way they were flipped
+    return np.where(missing, len(column), ranks)
+
+
+# ==================== OPERATIONS ====================
+
+def _evaluate_row(expression, context: Dict[str, Any], row: Dict[str, Any]) -> Any:
+    try:
+        return expression.evaluate(context, row)
+    except (TypeError, ValueError, ArithmeticError):
+        return None
+
+
+def _select(frame: Frame, operation: Dict[str, Any], context: Dict[str, Any], resolve: Callable) -> Frame:
+    if "fields" in operation:
+        return Frame({name: frame.column(name) for name in operation["fields"]}, frame.length)
+    excluded = set(operation.get("exclude", []))
+    return Frame({name: column for name, column in frame.columns.items() if name not in excluded}, frame.length)
+
+
+def _rename(frame: Frame, operation: Dict[str, Any], context: Dict[str, Any], resolve: Callable) -> Frame:
+    mapping = operation.get("mapping", {})
+    return Frame({mapping.get(name, name): column for name, column in frame.columns.items()}, frame.length)
+
+
+def _map(frame: Frame, operation: Dict[str, Any], context: Dict[str, Any], resolve: Callable) -> Frame:
+    variables = context.get("variables") or {}
+    columns = dict(frame.columns)
+
+    # Fields are computed in order, so later fields can use earlier ones
+    for name, source in operation.get("fields", {}).items():
+        expression = compile_expression(source)
+        current = Frame(columns, frame.length)
+        result = expression.evaluate_columns(
+            lambda path: current.path_column(path, variables), frame.length, context
+        )
+        if result is None:
+            # Per-row fallback; rows the expression cannot evaluate get None
+            result = to_column(
+                [_evaluate_row(expression, context, row) for row in current.to_records()], promote=False
+            )
+        columns[name] = result
+    return Frame(columns, frame.length)
+
+
+def _filter(frame: Frame, operation: Dict[str, Any], context: Dict[str, Any], resolve: Callable) -> Frame:
+    expression = compile_expression(operation.get("condition", "true"))
+    variables = context.get("variables") or {}
+
+    result = expression.evaluate_columns(lambda path: frame.path_column(path, variables), frame.length, context)
+    if result is not None:
+        return frame.take(np.flatnonzero(_truth(result)))
+
+    kept = []
+    for index, row in enumerate(frame.to_records()):
+        try:
+            if expression.test(context, row):
+                kept.append(index)
+        except (TypeError, ValueError, ArithmeticError):
+            continue
+    return frame.take(np.array(kept, dtype=np.int64))
+
+
+def _group_by(frame: Frame, operation: Dict[str, Any], context: Dict[str, Any], resolve: Callable) -> Frame:
+    by = operation.get("by")
+    if isinstance(by, str):
+        by = [by]
+    if not by:
+        raise TransformError("group_by requires 'by'")
+
+    aggregations = operation.get("aggregations") or {"count": "count"}
+    if frame.length == 0:
+        return Frame({name: np.array([], dtype=object) for name in list(by) + list(aggregations)}, 0)
+
+    codes, first = _group_codes(frame, by)
+    groups = len(first)
+
+    columns = {name: frame.column(name)[first] for name in by}
+    for name, spec in aggregations.items():
+        columns[name] = _aggregate(frame, codes, groups, spec)
+    return Frame(columns, groups)
+
+
+def _aggregate_all(frame: Frame, operation: Dict[str, Any], context: Dict[str, Any], resolve: Callable) -> Frame:
+    aggregations = operation.get("aggregations") or {"count": "count"}
+    codes = np.zeros(frame.length, dtype=np.int64)
+    columns = {}
+    for name, spec in aggregations.items():
+        if frame.length == 0:
+            count_only = spec == "count" or (isinstance(spec, dict) and spec.get("func", "count") == "count")
+            columns[name] = np.array([0 if count_only else None], dtype=object)
+        else:
+            columns[name] = _aggregate(frame, codes, 1, spec)
+    return Frame(columns, 1)
+
+
+def _join(frame: Frame, operation: Dict[str, Any], context: Dict[str, Any], resolve: Callable) -> Frame:
+    other = resolve(operation.get("with"))
+    if not isinstance(other, list):
+        raise TransformError(f"Join source '{operation.get('with')}' is not a list")
+    right = Frame.from_records(other)
+
+    on = operation.get("on")
+    if isinstance(on, dict):
+        left_key, right_key = on.get("left"), on.get("right")
+    else:
+        left_key = right_key = on
+    if not left_key or not right_key:
+        raise TransformError("join requires 'on'")
+
+    how = operation.get("how", "inner")
+    if how not in ("inner", "left"):
+        raise TransformError(f"Unsupported join type: {how}")
+
+    # Encode both key columns in one code space, then match by sorted codes
+    keys = np.concatenate([frame.column(left_key).astype(object), right.column(right_key).astype(object)])
+    codes, _ = _factorize(to_column(keys.tolist()))
+    left_codes, right_codes = codes[:frame.length], codes[frame.length:]
+
+    order = np.argsort(right_codes, kind="stable")
+    sorted_codes = right_codes[order]
+    starts = np.searchsorted(sorted_codes, left_codes, side="left")
+    counts = np.searchsorted(sorted_codes, left_codes, side="right") - starts
+
+    if how == "left":
+        emitted = np.maximum(counts, 1)
+    else:
+        emitted = counts
+
+    left_index = np.repeat(np.arange(frame.length), emitted)
+    offsets = np.arange(emitted.sum()) - np.repeat(np.cumsum(emitted) - emitted, emitted)
+    right_position = np.repeat(starts, emitted) + offsets
+    matched = np.repeat(counts > 0, emitted)
+    right_index = np.full(len(left_index), -1, dtype=np.int64)
+    right_index[matched] = order[right_position[matched]]
+
+    left_rows = frame.take(left_index)
+    right_rows = right.take(right_index)
+
+    columns = dict(left_rows.columns)
+    for name, column in right_rows.columns.items():
+        if name == right_key and right_key == left_key:
+            continue
+        columns[f"{name}_right" if name in columns else name] = column
+    return Frame(columns, len(left_index))
+
+
+def _sort(frame: Frame, operation: Dict[str, Any], context: Dict[str, Any], resolve: Callable) -> Frame:
+    by = operation.get("by")
+    if isinstance(by, str):
+        by = [by]
+    if not by:
+        raise TransformError("sort requires 'by'")
+
+    descending = operation.get("descending", False)
+    # np.lexsort sorts by the last key first
+    ranks = [_sort_rank(frame.column(name), descending) for name in reversed(by)]
+    return frame.take(np.lexsort(ranks) if frame.length else np.array([], dtype=np.int64))
+
+
+def _limit(frame: Frame, operation: Dict[str, Any], context: Dict[str, Any], resolve: Callable) -> Frame:
+    offset = int(operation.get("offset", 0))
+    count = operation.get("count")
+    end = frame.length if count is None else offset + int(count)
+    return frame.take(np.arange(frame.length)[offset:end])
+
+
+OPERATIONS: Dict[str, Callable[..., Frame]] = {
+    "select": _select,
+    "rename": _rename,
+    "map": _map,
+    "filter": _filter,
+    "group_by": _group_by,
+    "aggregate": _aggregate_all,
+    "join": _join,
+    "sort": _sort,
+    "limit": _limit
+}
+
+
+def apply_transforms(
+    records: List[Any],
+    operations: List[Dict[str, Any]],
+    context: Dict[str, Any],
+    resolve: Optional[Callable[[str], Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run a pipeline of transform operations over list-of-dict records.
+
+    Args:
+        records: Input records
+        operations: Operations to apply in order
+        context: Runtime context with "variables" and "outputs"
+        resolve: Resolves the data source named by ``join``'s "with"
+
+    Returns:
+        Transformed records
+
+    Raises:
+        TransformError: If an operation is unknown or invalid for the data
+    """
+    resolve = resolve or (lambda source: (context.get("outputs") or {}).get(source))
+    frame = Frame.from_records(records)
+
+    for operation in operations:
+        handler = OPERATIONS.get(operation.get("op"))
+        if handler is None:
+            raise TransformError(f"Unsupported transform operation: {operation.get('op')}")
+        frame = handler(frame, operation, context, resolve)
+
+    return frame.to_records()
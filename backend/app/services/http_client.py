@@ -0,0 +1,186 @@
+"""
+Shared HTTP Client
+
+One pooled aiohttp session per process for outbound workflow HTTP calls
+(webhook nodes). Connections are kept alive and reused across requests and
+retries, DNS lookups are cached, and connections per host are capped so a
+large fan-out cannot open thousands of sockets against one endpoint.
+
+The session is created lazily on first use and closed in the app lifespan.
+"""
+from typing import Any, Dict, Optional
+import asyncio
+import time
+
+import aiohttp
+from loguru import logger
+
+from ..core.config import settings
+
+
+class HTTPClient:
+    """Process-wide pooled aiohttp session with connection metrics"""
+
+    def __init__(
+        self,
+        limit: int = settings.HTTP_POOL_LIMIT,
+        limit_per_host: int = settings.HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout: float = settings.HTTP_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl: int = settings.HTTP_DNS_CACHE_TTL
+    ):
+        """
+        Initialize HTTP client.
+
+        Args:
+            limit: Maximum open connections in total
+            limit_per_host: Maximum open connections per host
+            keepalive_timeout: Seconds an idle connection is kept for reuse
+            dns_cache_ttl: Seconds resolved addresses are cached
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Metrics
+        self._requests = 0
+        self._errors = 0
+        self._in_flight = 0
+        self._connections_created = 0
+        self._connections_reused = 0
+        self._dns_cache_hits = 0
+        self._dns_cache_misses = 0
+        self._total_time_ms = 0.0
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """Hooks counting new vs reused connections and DNS cache use"""
+        trace = aiohttp.TraceConfig()
+
+        async def on_connection_create_end(session, context, params):
+            self._connections_created += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self._connections_reused += 1
+
+        async def on_dns_cache_hit(session, context, params):
+            self._dns_cache_hits += 1
+
+        async def on_dns_cache_miss(session, context, params):
+            self._dns_cache_misses += 1
+
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                trace_configs=[self._trace_config()]
+            )
+            self._loop = loop
+            logger.info(
+                f"HTTP client pool created (limit: {self.limit}, per host: {self.limit_per_host})"
+            )
+        return self._session
+
+    async def request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+        """
+        Send a request over the shared pool and read the full response.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to ``aiohttp.ClientSession.request`` (headers,
+                params, json, data, auth, timeout, ...)
+
+        Returns:
+            Dictionary with status code, headers, text, JSON body (if any) and URL
+        """
+        session = self.get_session()
+        self._requests += 1
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            async with session.request(method=method, url=url, **kwargs) as response:
+                response_text = ""
+                response_json = None
+                try:
+                    response_text = await response.text()
+                    if response.content_type == "application/json":
+                        response_json = await response.json()
+                except Exception as e:
+                    logger.warning(f"Failed to parse response: {e}")
+
+                return {
+                    "status_code": response.status,
+                    "headers": dict(response.headers),
+                    "text": response_text,
+                    "json": response_json,
+                    "content_type": response.content_type,
+                    "size": len(response_text),
+                    "url": str(response.url)
+                }
+        except Exception:
+            self._errors += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._total_time_ms += (time.perf_counter() - started) * 1000
+
+    async def close(self):
+        """Close the shared session and its pooled connections"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+            logger.info("HTTP client pool closed")
+        self._session = None
+        self._loop = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics.
+
+        Returns:
+            Dictionary with request counts, connection reuse and pool usage
+        """
+        connector = self._session.connector if self._session and not self._session.closed else None
+        opened = self._connections_created + self._connections_reused
+        return {
+            "open": connector is not None,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "requests": self._requests,
+            "errors": self._errors,
+            "in_flight": self._in_flight,
+            "connections_created": self._connections_created,
+            "connections_reused": self._connections_reused,
+            "reuse_rate": self._connections_reused / opened if opened else 0.0,
+            "dns_cache_hits": self._dns_cache_hits,
+            "dns_cache_misses": self._dns_cache_misses,
+            "avg_request_ms": self._total_time_ms / self._requests if self._requests else 0.0,
+            "idle_connections": self._idle_connections(connector)
+        }
+
+    @staticmethod
+    def _idle_connections(connector: Optional[aiohttp.BaseConnector]) -> int:
+        """Keep-alive connections currently waiting in the pool"""
+        pooled = getattr(connector, "_conns", None) or {}
+        return sum(len(connections) for connections in pooled.values())
+
+
+# Global HTTP client instance
+http_client = HTTPClient()
@@ -8,6 +8,12 @@ from typing import Optional, Dict, Any, AsyncIterator
 import aiohttp
 from loguru import logger
 
+from ..resilience import (
+    HTTPStatusError,
+    call_with_retry,
+    classify_http_error,
+    retry_after_from_headers
+)
 from .base import (
     LLMProvider,
     LLMRequest,
@@ -196,54 +202,49 @@ class OpenRouterProvider(LLMProvider):
         payload = self._prepare_payload(request)
 
         start_time = time.time()
-        last_error = None
-
-        for attempt in range(self.max_retries):
-            try:
-                async with session.post(
-                    f"{self.BASE_URL}/chat/completions",
-                    headers=headers,
-                    json=payload
-                ) as response:
-                    latency_ms = (time.time() - start_time) * 1000
-
-                    if response.status == 200:
-                        data = await response.json()
-                        logger.info(
-                            f"OpenRouter API success: model={request.model_id}, "
-                            f"latency={latency_ms:.2f}ms, attempt={attempt + 1}"
-                        )
-                        return self._parse_response(data, request.model_id, latency_ms)
-                    else:
-                        error_text = await response.text()
-                        last_error = f"HTTP {response.status}: {error_text}"
-                        logger.warning(
-                            f"OpenRouter API error (attempt {attempt + 1}/{self.max_retries}): "
-                            f"{last_error}"
-                        )
-
-                        # Don't retry on client errors (4xx)
-                        if 400 <= response.status < 500:
-                            break
+        attempts = 0
 
-            except asyncio.TimeoutError:
-                last_error = "Request timeout"
-                logger.warning(
-                    f"OpenRouter API timeout (attempt {attempt + 1}/{self.max_retries})"
-                )
-            except Exception as e:
-                last_error = str(e)
-                logger.warning(
-                    f"OpenRouter API exception (attempt {attempt + 1}/{self.max_retries}): {e}"
-                )
+        async def attempt() -> LLMResponse:
+            nonlocal attempts
+            attempts += 1
+            async with session.post(
+                f"{self.BASE_URL}/chat/completions",
+                headers=headers,
+                json=payload
+            ) as response:
+                latency_ms = (time.time() - start_time) * 1000
 
-            # Exponential backoff
-            if attempt < self.max_retries - 1:
-                await asyncio.sleep(2 ** attempt)
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise HTTPStatusError(
+                        response.status,
+                        f"HTTP {response.status}: {error_text}",
+                        retry_after=retry_after_from_headers(response.headers)
+                    )
+
+                data = await response.json()
+                logger.info(
+                    f"OpenRouter API success: model={request.model_id}, "
+                    f"latency={latency_ms:.2f}ms, attempt={attempts}"
+                )
+                return self._parse_response(data, request.model_id, latency_ms)
 
-        error_msg = f"Failed to complete request after {self.max_retries} attempts: {last_error}"
-        logger.error(error_msg)
-        raise Exception(error_msg)
+        # Jittered retries behind a per-model circuit breaker; client errors
+        # (4xx) are not retried, 429 waits for the server's Retry-After
+        try:
+            response, _ = await call_with_retry(
+                attempt,
+                target=f"openrouter:{request.model_id}",
+                retries=max(0, self.max_retries - 1),
+                base_delay=1.0,
+                classify=classify_http_error
+            )
+            return response
+        except Exception as e:
+            last_error = "Request timeout" if isinstance(e, asyncio.TimeoutError) else str(e)
+            error_msg = f"Failed to complete request after {attempts} attempts: {last_error}"
+            logger.error(error_msg)
+            raise Exception(error_msg) from e
 
     async def stream_complete(self, request: LLMRequest) -> AsyncIterator[str]:
         """
@@ -0,0 +1,351 @@
+"""
+Resilience for Outbound Calls
+
+Shared retry and circuit-breaking for calls to downstream systems (webhook
+targets, SMTP servers, LLM providers):
+
+- CircuitBreaker: per target (e.g. "http:api.example.com"). After
+  ``failure_threshold`` consecutive failures the circuit opens and calls
+  fail immediately with CircuitOpenError instead of piling onto a dead
+  endpoint from every concurrent run. After ``recovery_timeout`` a single
+  trial call is let through (half-open); its outcome closes or re-opens it.
+- call_with_retry: retries transient failures with decorrelated-jitter
+  backoff, honours ``Retry-After`` from throttled responses and never
+  sleeps past the caller's deadline (see deadline_scope).
+
+Failures are classified per call site: transient (retry, counts against
+the breaker), throttled (retry after the server's delay, the target is
+alive) or permanent (no retry, the target is alive).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterator, Mapping, Optional, Tuple
+import asyncio
+import random
+import time
+
+from loguru import logger
+
+from ..core.config import settings
+
+
+class FailureKind(str, Enum):
+    """How a failed call should be treated"""
+    TRANSIENT = "transient"
+    THROTTLED = "throttled"
+    PERMANENT = "permanent"
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker state"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a target whose circuit is open"""
+
+    def __init__(self, target: str, retry_in: float):
+        self.target = target
+        self.retry_in = retry_in
+        super().__init__(f"Circuit open for {target}, retry in {retry_in:.1f}s")
+
+
+class HTTPStatusError(ValueError):
+    """Unexpected HTTP status, with the server's ``Retry-After`` (seconds) if any"""
+
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        self.status_code = status_code
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+# Monotonic time by which the current operation must finish
+_deadline: ContextVar[Optional[float]] = ContextVar("resilience_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Bound retries of everything called within to ``seconds`` from now"""
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline (None if unbounded)"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header (delay in seconds or an HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def retry_after_from_headers(headers: Mapping[str, str]) -> Optional[float]:
+    """``Retry-After`` of a response's headers (looked up case-insensitively)"""
+    for name, value in headers.items():
+        if name.lower() == "retry-after":
+            return retry_after_seconds(value)
+    return None
+
+
+def decorrelated_jitter(previous: float, base: float, cap: float) -> float:
+    """Next backoff delay: random between ``base`` and 3x the previous delay, capped"""
+    return min(cap, random.uniform(base, max(base, previous * 3)))
+
+
+def classify_http_error(error: BaseException) -> FailureKind:
+    """Failure kind of an HTTP call: 429 is throttled, other 4xx are permanent"""
+    if isinstance(error, HTTPStatusError):
+        if error.status_code == 429:
+            return FailureKind.THROTTLED
+        if error.status_code >= 500 or error.status_code == 408:
+            return FailureKind.TRANSIENT
+        return FailureKind.PERMANENT
+    return FailureKind.TRANSIENT
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one downstream target"""
+
+    def __init__(
+        self,
+        target: str,
+        failure_threshold: int = settings.CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout: float = settings.CIRCUIT_RECOVERY_TIMEOUT,
+        half_open_max_calls: int = 1
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            target: Downstream target this breaker protects
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds the circuit stays open before a trial call
+            half_open_max_calls: Concurrent trial calls while half-open
+        """
+        self.target = target
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._trials = 0
+
+        # Metrics
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.times_opened = 0
+        self.last_state_change: Optional[datetime] = None
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: CircuitState):
+        if state == self._state:
+            return
+        logger.info(f"Circuit {self.target}: {self._state.value} -> {state.value}")
+        self._state = state
+        self._trials = 0
+        self.last_state_change = datetime.utcnow()
+        if state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
+
+    def allow(self):
+        """
+        Admit a call to the target.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or its trial call is in flight)
+        """
+        state = self.state
+        if state == CircuitState.OPEN:
+            self.rejected += 1
+            raise CircuitOpenError(self.target, self.recovery_timeout - (time.monotonic() - self._opened_at))
+        if state == CircuitState.HALF_OPEN:
+            if self._trials >= self.half_open_max_calls:
+                self.rejected += 1
+                raise CircuitOpenError(self.target, 0.0)
+            self._trials += 1
+
+    def record_success(self):
+        """The target answered"""
+        self.successes += 1
+        self._consecutive_failures = 0
+        if self.state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.CLOSED)
+
+    def record_failure(self):
+        """The target failed (error, timeout or 5xx)"""
+        self.failures += 1
+        self._consecutive_failures += 1
+        state = self.state
+        if state == CircuitState.HALF_OPEN or (
+            state == CircuitState.CLOSED and self._consecutive_failures >= self.failure_threshold
+        ):
+            self._transition(CircuitState.OPEN)
+
+    def release(self):
+        """The call ended without telling whether the target is healthy (e.g. throttled)"""
+        if self._state == CircuitState.HALF_OPEN:
+            self._trials = max(0, self._trials - 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._consecutive_failures,
+            "successes": self.successes,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+            "last_state_change": self.last_state_change.isoformat() if self.last_state_change else None
+        }
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers by target, plus retry metrics"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+        # Metrics
+        self.retries = 0
+        self.deadline_exhausted = 0
+
+    def get(self, target: str) -> CircuitBreaker:
+        """Get the breaker of a target, creating it on first use"""
+        breaker = self._breakers.get(target)
+        if breaker is None:
+            breaker = self._breakers[target] = CircuitBreaker(target)
+        return breaker
+
+    def reset(self):
+        """Forget all breakers (closes every circuit) and metrics"""
+        self._breakers.clear()
+        self.retries = 0
+        self.deadline_exhausted = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get breaker states and retry statistics.
+
+        Returns:
+            Dictionary with retry counts and per-target breaker state
+        """
+        breakers = {target: breaker.get_stats() for target, breaker in self._breakers.items()}
+        return {
+            "retries": self.retries,
+            "deadline_exhausted": self.deadline_exhausted,
+            "open_circuits": sorted(t for t, stats in breakers.items() if stats["state"] != CircuitState.CLOSED.value),
+            "breakers": breakers
+        }
+
+
+# Global circuit breaker registry
+circuit_breakers = CircuitBreakerRegistry()
+
+
+async def call_with_retry(
+    operation: Callable[[], Awaitable[Any]],
+    target: str,
+    retries: int,
+    base_delay: float,
+    max_delay: float = settings.RETRY_MAX_DELAY,
+    classify: Callable[[BaseException], FailureKind] = lambda error: FailureKind.TRANSIENT,
+    deadline: Optional[float] = None
+) -> Tuple[Any, int]:
+    """
+    Call ``operation`` through the target's circuit breaker, retrying failures.
+
+    Args:
+        operation: Coroutine function performing one attempt
+        target: Circuit breaker target, e.g. "http:api.example.com"
+        retries: Retries after the first attempt
+        base_delay: Minimum backoff delay in seconds
+        max_delay: Maximum backoff delay (and longest ``Retry-After`` honoured)
+        classify: Failure kind of an error raised by ``operation``
+        deadline: Seconds from now to give up by (in addition to deadline_scope)
+
+    Returns:
+        Tuple of the operation result and the number of attempts made
+
+    Raises:
+        CircuitOpenError: If the target's circuit is open
+        Exception: The last error once retries, deadline or breaker run out
+    """
+    breaker = circuit_breakers.get(target)
+    with deadline_scope(deadline):
+        delay = base_delay
+        for attempt in range(1, retries + 2):
+            breaker.allow()
+            try:
+                result = await operation()
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as e:
+                kind = classify(e)
+                if kind == FailureKind.TRANSIENT:
+                    breaker.record_failure()
+                elif kind == FailureKind.PERMANENT:
+                    breaker.record_success()
+                else:
+                    breaker.release()
+
+                if kind == FailureKind.PERMANENT or attempt > retries:
+                    raise
+
+                retry_after = getattr(e, "retry_after", None)
+                if retry_after is not None:
+                    if retry_after > max_delay:
+                        logger.warning(f"{target}: not retrying, server asked to wait {retry_after:.0f}s")
+                        raise
+                    wait = retry_after
+                else:
+                    delay = decorrelated_jitter(delay, base_delay, max_delay)
+                    wait = delay
+
+                left = remaining_time()
+                if left is not None and wait >= left:
+                    circuit_breakers.deadline_exhausted += 1
+                    logger.warning(f"{target}: not retrying, {left:.1f}s left before deadline")
+                    raise
+
+                circuit_breakers.retries += 1
+                logger.warning(f"{target} attempt {attempt} failed: {e}. Retrying in {wait:.2f}s...")
+                await asyncio.sleep(wait)
+            else:
+                breaker.record_success()
+                return result, attempt
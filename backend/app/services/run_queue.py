@@ -0,0 +1,513 @@
+"""
+Durable Workflow Run Queue
+
+Queued runs are persisted in the ``workflow_runs`` collection with
+``status=queued`` and consumed by a bounded pool of executor workers. Workers
+claim runs atomically (highest priority first, then FIFO), so queued work
+survives restarts and bursty triggers cannot spawn unbounded executions.
+
+Runs parked by a delay node wait as ``status=waiting`` and are requeued
+by the timer service (see timer_service) when their wake-up time comes.
+
+On shutdown the queue stops accepting runs and lets in-flight ones finish
+within a grace period; runs still going after that are interrupted, which
+checkpoints them as resumable. On startup, interrupted runs and runs whose
+process stopped heartbeating are requeued and resume from their checkpoint.
+
+Backends:
+- local: the API process runs the worker pool itself
+- redis-stream: the API only publishes run IDs to a Redis Stream consumed by
+  standalone worker processes (``python -m app.worker``)
+"""
+from typing import Dict, Any, Optional, List
+from datetime import datetime, timedelta
+from collections import deque
+import asyncio
+import os
+
+from loguru import logger
+from pymongo import ReturnDocument
+
+from ..core.config import settings
+from ..core.database import get_database
+from ..models.workflow import Workflow, WorkflowRun, ExecutionStatus, RunEventKind
+from .workflow_executor import workflow_executor
+from .execution.persistence import RunStateWriter
+from .run_stream import RunStream
+
+
+class RunQueueBackend:
+    """Supported run queue backends"""
+    LOCAL = "local"
+    REDIS_STREAM = "redis-stream"
+
+
+class RunQueueFullError(Exception):
+    """Raised when the queue is at capacity and cannot accept new runs"""
+    pass
+
+
+class RunQueueClosedError(RunQueueFullError):
+    """Raised when the queue is shutting down and no longer accepts runs"""
+    pass
+
+
+class RunQueue:
+    """Mongo-backed run queue with a bounded worker pool"""
+
+    def __init__(
+        self,
+        worker_count: int = settings.RUN_QUEUE_WORKERS,
+        max_depth: int = settings.RUN_QUEUE_MAX_DEPTH,
+        poll_interval: float = settings.RUN_QUEUE_POLL_INTERVAL,
+        backend: str = settings.RUN_QUEUE_BACKEND,
+        drain_timeout: float = settings.RUN_QUEUE_DRAIN_TIMEOUT,
+        heartbeat_interval: float = settings.RUN_HEARTBEAT_INTERVAL,
+        stale_after: float = settings.RUN_STALE_AFTER
+    ):
+        """
+        Initialize run queue.
+
+        Args:
+            worker_count: Number of runs executed concurrently by this process
+            max_depth: Maximum number of queued runs (0 disables the limit)
+            poll_interval: Seconds to wait between polls when the queue is empty
+            backend: "local" (in-process worker pool) or "redis-stream"
+            drain_timeout: Seconds in-flight runs may finish on shutdown
+            heartbeat_interval: Seconds between liveness updates of running runs
+            stale_after: Seconds without heartbeat after which a running run is recovered
+        """
+        self.worker_count = max(1, worker_count)
+        self.max_depth = max_depth
+        self.poll_interval = poll_interval
+        self.backend = backend
+        self.drain_timeout = drain_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.node_id = f"{os.getenv('HOSTNAME', 'local')}-{os.getpid()}"
+        self.stream: Optional[RunStream] = None
+
+        self._workers: List[asyncio.Task] = []
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._running = False
+        self._accepting = True
+
+        # Metrics
+        self._busy_workers = 0
+        self._processed = 0
+        self._failed = 0
+        self._interrupted = 0
+        self._recovered = 0
+        self._wait_times_ms: deque = deque(maxlen=1000)
+
+    def _collection(self, db):
+        return db[WorkflowRun.Settings.name]
+
+    def _stale_running(self) -> Dict[str, Any]:
+        """
+        Query for RUNNING runs whose executing process looks dead.
+
+        A run is alive as of its last heartbeat, else its claim (workers die
+        between claiming and starting a run too), else its start (runs
+        executed inline by API requests are never claimed).
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_after)
+        return {
+            "status": ExecutionStatus.RUNNING.value,
+            "$or": [
+                {"heartbeat_at": {"$lt": cutoff}},
+                {"heartbeat_at": None, "claimed_at": {"$lt": cutoff}},
+                {"heartbeat_at": None, "claimed_at": None, "start_time": {"$lt": cutoff}}
+            ]
+        }
+
+    async def depth(self) -> int:
+        """Number of runs currently waiting in the queue"""
+        db = await get_database()
+        return await self._collection(db).count_documents(
+            {"status": ExecutionStatus.QUEUED.value}
+        )
+
+    async def enqueue(self, run: WorkflowRun, priority: int = 0) -> WorkflowRun:
+        """
+        Persist a run as queued and wake up an idle worker.
+
+        Args:
+            run: Run record to queue (inserted if not yet persisted)
+            priority: Higher priorities are claimed first
+
+        Returns:
+            The queued run
+
+        Raises:
+            RunQueueClosedError: If the queue is shutting down
+            RunQueueFullError: If the queue is at ``max_depth``
+        """
+        if not self._accepting:
+            raise RunQueueClosedError("Run queue is shutting down, retry later")
+
+        if self.max_depth and await self.depth() >= self.max_depth:
+            raise RunQueueFullError(
+                f"Run queue is full ({self.max_depth} runs waiting), retry later"
+            )
+
+        run.status = ExecutionStatus.QUEUED
+        run.priority = priority
+        run.queued_at = datetime.utcnow()
+        run.claimed_at = None
+        run.worker_id = None
+        run.interrupted_at = None
+
+        if run.id is None:
+            await run.insert()
+        else:
+            await run.save()
+
+        if self.stream:
+            await self.stream.publish(run.execution_id, priority)
+
+        logger.info(f"Queued workflow run {run.execution_id} (priority: {priority})")
+        self._wakeup.set()
+        return run
+
+    async def claim(self, worker_id: str) -> Optional[WorkflowRun]:
+        """
+        Atomically claim the next queued run.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+
+        Returns:
+            The claimed run, or None if the queue is empty
+        """
+        return await self._claim_matching({"status": ExecutionStatus.QUEUED.value}, worker_id)
+
+    async def claim_run(self, execution_id: str, worker_id: str, reclaim: bool = False) -> Optional[WorkflowRun]:
+        """
+        Atomically claim a specific run.
+
+        Args:
+            execution_id: Execution ID of the run to claim
+            worker_id: Identifier of the claiming worker
+            reclaim: Also take over a run left RUNNING by a crashed worker
+                (only once it stopped heartbeating, so a run that is still
+                executing is never started twice)
+
+        Returns:
+            The claimed run, or None if it is not claimable
+        """
+        claimable: Dict[str, Any] = {"status": ExecutionStatus.QUEUED.value}
+        if reclaim:
+            claimable = {"$or": [claimable, self._stale_running()]}
+        return await self._claim_matching({"execution_id": execution_id, **claimable}, worker_id)
+
+    async def is_running(self, execution_id: str) -> bool:
+        """Whether a run is currently marked RUNNING"""
+        db = await get_database()
+        count = await self._collection(db).count_documents(
+            {"execution_id": execution_id, "status": ExecutionStatus.RUNNING.value},
+            limit=1
+        )
+        return count > 0
+
+    async def _claim_matching(self, query: Dict[str, Any], worker_id: str) -> Optional[WorkflowRun]:
+        """Move the first run matching ``query`` to RUNNING for ``worker_id``"""
+        db = await get_database()
+        now = datetime.utcnow()
+        document = await self._collection(db).find_one_and_update(
+            query,
+            {
+                "$set": {
+                    "status": ExecutionStatus.RUNNING.value,
+                    "claimed_at": now,
+                    "worker_id": worker_id
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("priority", -1), ("queued_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+        if not document:
+            return None
+
+        queued_at = document.get("queued_at")
+        if queued_at:
+            self._wait_times_ms.append((now - queued_at).total_seconds() * 1000)
+
+        return await WorkflowRun.get(document["_id"])
+
+    async def process(self, run: WorkflowRun):
+        """Execute a claimed run"""
+        workflow = await Workflow.get(run.workflow_id)
+        if not workflow:
+            logger.error(f"Workflow {run.workflow_id} for run {run.execution_id} no longer exists")
+            # Recorded like executor failures: an error event and the terminal status
+            run.status = ExecutionStatus.ERROR
+            run.end_time = datetime.utcnow()
+            writer = RunStateWriter(run)
+            await writer.load_sequence()
+            writer.append_event(RunEventKind.ERROR, "workflow", {"error": "Workflow not found"})
+            writer.set("status", run.status.value)
+            writer.set("end_time", run.end_time)
+            await writer.close()
+            self._failed += 1
+            return
+
+        try:
+            await workflow_executor.execute(workflow, run)
+            self._processed += 1
+        except asyncio.CancelledError:
+            # Checkpointed as resumable by the executor; requeued on next startup
+            self._interrupted += 1
+            raise
+        except Exception as e:
+            # Failure details are recorded on the run by the executor
+            self._failed += 1
+            logger.error(f"Queued run {run.execution_id} failed: {e}")
+
+    async def _worker(self, worker_id: str):
+        """Worker loop: claim runs and execute them until stopped"""
+        logger.info(f"Run queue worker {worker_id} started")
+
+        while self._running:
+            # Clear before claiming so an enqueue racing with an empty claim is not missed
+            self._wakeup.clear()
+            try:
+                run = await self.claim(worker_id)
+            except Exception as e:
+                logger.error(f"Run queue worker {worker_id} failed to claim a run: {e}")
+                run = None
+
+            if not run:
+                # Sleep until new work is enqueued locally or the poll interval elapses
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._busy_workers += 1
+            try:
+                await self.process(run)
+            finally:
+                self._busy_workers -= 1
+
+        logger.info(f"Run queue worker {worker_id} stopped")
+
+    async def recover(self, stream: Optional[RunStream] = None) -> List[str]:
+        """
+        Requeue runs left behind by a shutdown or crash.
+
+        Recovers runs interrupted on shutdown and runs still marked RUNNING
+        whose process stopped heartbeating. Each run is moved back to QUEUED
+        atomically, so several processes starting at once never recover the
+        same run twice; executing it again resumes from its checkpoint.
+
+        Args:
+            stream: Run stream to publish recovered runs to (defaults to the queue's own)
+
+        Returns:
+            Execution IDs of the recovered runs
+        """
+        db = await get_database()
+        stream = stream or self.stream
+        query = {
+            "$or": [
+                {"status": ExecutionStatus.PAUSED.value, "interrupted_at": {"$ne": None}},
+                self._stale_running()
+            ]
+        }
+
+        recovered = []
+        while True:
+            document = await self._collection(db).find_one_and_update(
+                query,
+                {
+                    "$set": {
+                        "status": ExecutionStatus.QUEUED.value,
+                        "queued_at": datetime.utcnow(),
+                        "claimed_at": None,
+                        "worker_id": None,
+                        "interrupted_at": None
+                    },
+                    "$inc": {"resume_count": 1}
+                },
+                return_document=ReturnDocument.AFTER
+            )
+            if not document:
+                break
+
+            recovered.append(document["execution_id"])
+            if stream:
+                await stream.publish(document["execution_id"], document.get("priority", 0))
+
+        if recovered:
+            self._recovered += len(recovered)
+            logger.info(f"Recovered {len(recovered)} interrupted runs: {recovered}")
+            self._wakeup.set()
+        return recovered
+
+    async def wake(self, execution_id: str, stream: Optional[RunStream] = None) -> bool:
+        """
+        Requeue a run parked by a delay node once its wake-up time has come.
+
+        Args:
+            execution_id: Execution ID of the waiting run
+            stream: Run stream to publish the run to (defaults to the queue's own)
+
+        Returns:
+            True if the run was requeued, False if it was no longer waiting
+        """
+        db = await get_database()
+        stream = stream or self.stream
+        document = await self._collection(db).find_one_and_update(
+            {"execution_id": execution_id, "status": ExecutionStatus.WAITING.value},
+            {
+                "$set": {
+                    "status": ExecutionStatus.QUEUED.value,
+                    "queued_at": datetime.utcnow(),
+                    "claimed_at": None,
+                    "worker_id": None,
+                    "wake_at": None
+                }
+            },
+            return_document=ReturnDocument.AFTER
+        )
+        if not document:
+            return False
+
+        if stream:
+            await stream.publish(execution_id, document.get("priority", 0))
+        self._wakeup.set()
+        return True
+
+    async def heartbeat(self):
+        """Mark the runs executing in this process as alive"""
+        execution_ids = list(workflow_executor.active_contexts)
+        if not execution_ids:
+            return
+
+        db = await get_database()
+        await self._collection(db).update_many(
+            {"execution_id": {"$in": execution_ids}, "status": ExecutionStatus.RUNNING.value},
+            {"$set": {"heartbeat_at": datetime.utcnow()}}
+        )
+
+    async def _heartbeat_loop(self):
+        """Keep running runs from looking abandoned to recovering processes"""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.heartbeat()
+            except Exception as e:
+                logger.warning(f"Run heartbeat failed: {e}")
+
+    async def start(self):
+        """Start the worker pool (local) or connect the run stream (redis-stream)"""
+        if self._running:
+            return
+
+        self._running = True
+        self._accepting = True
+
+        # Runs executed inline by API requests heartbeat too, whatever the backend
+        self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+
+        if self.backend == RunQueueBackend.REDIS_STREAM:
+            self.stream = RunStream(
+                redis_url=settings.redis_connection_url,
+                stream_key=settings.RUN_STREAM_KEY,
+                group=settings.RUN_STREAM_GROUP
+            )
+            await self.stream.connect()
+            logger.info("Run queue publishing to Redis Stream; runs execute in worker processes")
+            return
+
+        self._workers = [
+            asyncio.create_task(self._worker(f"{self.node_id}-{index}"))
+            for index in range(self.worker_count)
+        ]
+        logger.info(f"Run queue started with {self.worker_count} workers")
+
+    async def stop(self):
+        """
+        Drain and stop the worker pool.
+
+        New runs are rejected immediately. Workers finish their current run
+        within ``drain_timeout``; runs still executing after that are
+        cancelled, which checkpoints them as resumable for ``recover``.
+        """
+        if not self._running:
+            return
+
+        self._running = False
+        self._accepting = False
+        self._wakeup.set()
+
+        if self._workers:
+            if self._busy_workers:
+                logger.info(f"Draining {self._busy_workers} in-flight runs (up to {self.drain_timeout}s)")
+            _, pending = await asyncio.wait(self._workers, timeout=self.drain_timeout)
+            if pending:
+                logger.warning(f"Interrupting {len(pending)} runs still in flight after the drain timeout")
+            for worker in pending:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+
+        if self._heartbeat:
+            self._heartbeat.cancel()
+            await asyncio.gather(self._heartbeat, return_exceptions=True)
+            self._heartbeat = None
+
+        if self.stream:
+            await self.stream.disconnect()
+            self.stream = None
+
+        logger.info("Run queue stopped")
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue statistics.
+
+        Returns:
+            Dictionary with queue depth, worker utilisation and wait times
+        """
+        wait_times = sorted(self._wait_times_ms)
+        wait_stats = {"samples": len(wait_times)}
+        if wait_times:
+            wait_stats.update({
+                "avg": sum(wait_times) / len(wait_times),
+                "p50": wait_times[len(wait_times) // 2],
+                "p95": wait_times[min(len(wait_times) - 1, int(len(wait_times) * 0.95))],
+                "max": wait_times[-1]
+            })
+
+        try:
+            depth = await self.depth()
+        except Exception as e:
+            logger.error(f"Failed to get run queue depth: {e}")
+            depth = None
+
+        stats = {
+            "backend": self.backend,
+            "running": self._running,
+            "depth": depth,
+            "max_depth": self.max_depth,
+            "workers": self.worker_count,
+            "busy_workers": self._busy_workers,
+            "processed": self._processed,
+            "failed": self._failed,
+            "interrupted": self._interrupted,
+            "recovered": self._recovered,
+            "accepting": self._accepting,
+            "wait_time_ms": wait_stats
+        }
+        if self.stream:
+            stats["stream"] = await self.stream.get_stats()
+        return stats
+
+
+# Global run queue instance
+run_queue = RunQueue()
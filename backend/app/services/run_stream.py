@@ -0,0 +1,171 @@
+"""
+Redis Streams transport for distributed workflow run execution.
+
+The API publishes queued run IDs to a stream; standalone worker processes
+(``python -m app.worker``) consume them through a consumer group. Entries are
+acknowledged only after the run finishes, so entries left pending by a
+crashed worker are claimed again by a live one.
+"""
+from typing import Dict, Any, List, Optional, Tuple
+
+from loguru import logger
+import redis.asyncio as redis
+from redis.exceptions import ResponseError
+
+
+class RunStream:
+    """Redis Stream + consumer group carrying workflow run IDs"""
+
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        stream_key: str = "workflow:runs",
+        group: str = "workflow-workers",
+        max_length: int = 100000
+    ):
+        """
+        Initialize run stream.
+
+        Args:
+            redis_url: Redis connection URL
+            stream_key: Stream holding run entries
+            group: Consumer group shared by all workers
+            max_length: Approximate cap on retained stream entries
+        """
+        self.redis_url = redis_url
+        self.stream_key = stream_key
+        self.group = group
+        self.max_length = max_length
+        self.client: Optional[redis.Redis] = None
+
+    async def connect(self):
+        """Connect to Redis and make sure the consumer group exists"""
+        try:
+            self.client = await redis.from_url(self.redis_url, decode_responses=True)
+            await self.client.ping()
+
+            try:
+                await self.client.xgroup_create(self.stream_key, self.group, id="0", mkstream=True)
+                logger.info(f"Created consumer group {self.group} on {self.stream_key}")
+            except ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+            logger.info(f"Connected to run stream {self.stream_key} at {self.redis_url}")
+        except Exception as e:
+            logger.error(f"Failed to connect to run stream: {e}")
+            raise
+
+    async def disconnect(self):
+        """Close Redis connection"""
+        if self.client:
+            await self.client.close()
+            self.client = None
+            logger.info("Disconnected from run stream")
+
+    async def publish(self, execution_id: str, priority: int = 0) -> str:
+        """
+        Publish a queued run.
+
+        Args:
+            execution_id: Execution ID of the queued run
+            priority: Run priority (informational; streams are FIFO)
+
+        Returns:
+            Stream entry ID
+        """
+        return await self.client.xadd(
+            self.stream_key,
+            {"execution_id": execution_id, "priority": str(priority)},
+            maxlen=self.max_length,
+            approximate=True
+        )
+
+    async def read(self, consumer: str, count: int, block_ms: int) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        Read new entries for a consumer.
+
+        Args:
+            consumer: Consumer (worker) name
+            count: Maximum number of entries to read
+            block_ms: Milliseconds to block waiting for entries
+
+        Returns:
+            List of (entry_id, fields)
+        """
+        response = await self.client.xreadgroup(
+            self.group,
+            consumer,
+            {self.stream_key: ">"},
+            count=count,
+            block=block_ms
+        )
+        entries = []
+        for _, stream_entries in response or []:
+            entries.extend(stream_entries)
+        return entries
+
+    async def claim_stale(self, consumer: str, min_idle_ms: int, count: int) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        Claim entries left pending by consumers that stopped heartbeating.
+
+        Args:
+            consumer: Consumer (worker) taking over the entries
+            min_idle_ms: Minimum idle time before an entry is considered abandoned
+            count: Maximum number of entries to claim
+
+        Returns:
+            List of (entry_id, fields)
+        """
+        response = await self.client.xautoclaim(
+            self.stream_key,
+            self.group,
+            consumer,
+            min_idle_time=min_idle_ms,
+            start_id="0-0",
+            count=count
+        )
+        # Response: [next_start_id, entries, (deleted_ids on Redis 7+)]
+        entries = response[1] if len(response) > 1 else []
+        return [(entry_id, fields) for entry_id, fields in entries if fields]
+
+    async def heartbeat(self, consumer: str, entry_ids: List[str]):
+        """Reset the idle time of entries still being processed"""
+        if entry_ids:
+            await self.client.xclaim(
+                self.stream_key,
+                self.group,
+                consumer,
+                min_idle_time=0,
+                message_ids=entry_ids,
+                justid=True
+            )
+
+    async def ack(self, entry_id: str):
+        """Acknowledge and remove a processed entry"""
+        await self.client.xack(self.stream_key, self.group, entry_id)
+        await self.client.xdel(self.stream_key, entry_id)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """
+        Get stream statistics.
+
+        Returns:
+            Dictionary with stream length, pending entries and consumers
+        """
+        if not self.client:
+            return {"connected": False}
+
+        try:
+            groups = await self.client.xinfo_groups(self.stream_key)
+            group_info = next((g for g in groups if g.get("name") == self.group), {})
+            return {
+                "connected": True,
+                "length": await self.client.xlen(self.stream_key),
+                "pending": group_info.get("pending", 0),
+                "consumers": group_info.get("consumers", 0),
+                "lag": group_info.get("lag")
+            }
+        except Exception as e:
+            logger.error(f"Failed to get run stream stats: {e}")
+            return {"connected": False, "error": str(e)}
@@ -0,0 +1,292 @@
+"""
+Pooled SMTP Client
+
+Reuses connected, authenticated SMTP sessions across messages instead of
+opening, authenticating and closing a connection per email (and per retry).
+Sessions are pooled per server config (host, port, user, TLS mode), at most
+``size`` open per server. Idle sessions are closed after ``idle_timeout``
+and a session is recycled after ``max_messages`` so long-lived connections
+don't hit server-side per-connection limits.
+
+DomainThrottle spaces out bulk sends per recipient domain so a large
+mail-merge doesn't trip the receiving providers' rate limits.
+"""
+from collections import deque
+from dataclasses import dataclass, field
+from email.message import Message
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import asyncio
+import ssl
+import time
+
+import aiosmtplib
+from loguru import logger
+
+from ..core.config import settings
+from .resilience import FailureKind
+
+ServerKey = Tuple[str, int, Optional[str], bool, bool]
+
+# Errors after which the server has reset the envelope and the session is still usable
+_RECOVERABLE_ERRORS = (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused)
+
+
+@dataclass
+class _Session:
+    """One connected, authenticated SMTP session"""
+    smtp: aiosmtplib.SMTP
+    messages: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class _ServerPool:
+    """Idle sessions and open-session limit for one SMTP server"""
+
+    def __init__(self, size: int):
+        self.slots = asyncio.Semaphore(size)
+        self.idle: Deque[_Session] = deque()
+        self.open = 0
+
+
+def classify_smtp_error(error: BaseException) -> FailureKind:
+    """Failure kind of an SMTP send: 5xx replies and refused recipients are permanent"""
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return FailureKind.PERMANENT
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        if error.code >= 500:
+            return FailureKind.PERMANENT
+        if error.code != 421:
+            # 45x: mailbox busy, greylisting, rate limited; the server is up
+            return FailureKind.THROTTLED
+    return FailureKind.TRANSIENT
+
+
+def server_key(smtp_config: Dict[str, Any]) -> ServerKey:
+    """Pool key of an SMTP config: sessions are only shared for the same server and account"""
+    return (
+        smtp_config["hostname"],
+        int(smtp_config["port"]),
+        smtp_config.get("username"),
+        bool(smtp_config.get("use_tls")),
+        bool(smtp_config.get("use_ssl"))
+    )
+
+
+class SMTPPool:
+    """Process-wide pool of authenticated SMTP sessions keyed by server config"""
+
+    def __init__(
+        self,
+        size: int = settings.SMTP_POOL_SIZE,
+        idle_timeout: float = settings.SMTP_POOL_IDLE_TIMEOUT,
+        max_messages: int = settings.SMTP_POOL_MAX_MESSAGES,
+        timeout: float = settings.SMTP_TIMEOUT
+    ):
+        """
+        Initialize SMTP pool.
+
+        Args:
+            size: Maximum open sessions per server
+            idle_timeout: Seconds an idle session is kept for reuse
+            max_messages: Messages sent over one session before it is recycled (0 = unlimited)
+            timeout: Seconds to wait on SMTP commands
+        """
+        self.size = max(1, size)
+        self.idle_timeout = idle_timeout
+        self.max_messages = max_messages
+        self.timeout = timeout
+
+        self._pools: Dict[ServerKey, _ServerPool] = {}
+        self._passwords: Dict[ServerKey, Optional[str]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Metrics
+        self._messages_sent = 0
+        self._errors = 0
+        self._sessions_created = 0
+        self._sessions_reused = 0
+        self._reconnects = 0
+
+    def _pool_for(self, smtp_config: Dict[str, Any]) -> _ServerPool:
+        """Pool of the configured server (and account)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Sessions are bound to the loop that opened them
+            self._pools = {}
+            self._loop = loop
+
+        key = server_key(smtp_config)
+        if self._passwords.get(key, smtp_config.get("password")) != smtp_config.get("password"):
+            # Credentials changed: sessions authenticated with the old ones must go
+            stale = self._pools.pop(key, None)
+            if stale:
+                for session in stale.idle:
+                    session.smtp.close()
+        self._passwords[key] = smtp_config.get("password")
+
+        if key not in self._pools:
+            self._pools[key] = _ServerPool(self.size)
+        return self._pools[key]
+
+    async def _connect(self, pool: _ServerPool, smtp_config: Dict[str, Any]) -> _Session:
+        """Open and authenticate a new session of a server pool"""
+        use_ssl = bool(smtp_config.get("use_ssl"))
+        use_tls = bool(smtp_config.get("use_tls"))
+        smtp = aiosmtplib.SMTP(
+            hostname=smtp_config["hostname"],
+            port=int(smtp_config["port"]),
+            use_tls=use_ssl,
+            start_tls=use_tls and not use_ssl,
+            tls_context=ssl.create_default_context() if use_ssl or use_tls else None,
+            timeout=self.timeout
+        )
+        await smtp.connect()
+        if smtp_config.get("username") and smtp_config.get("password"):
+            await smtp.login(smtp_config["username"], smtp_config["password"])
+
+        pool.open += 1
+        self._sessions_created += 1
+        return _Session(smtp=smtp)
+
+    async def _checkout(self, pool: _ServerPool) -> Optional[_Session]:
+        """Most recently used idle session that is still alive"""
+        while pool.idle:
+            session = pool.idle.pop()
+            if session.smtp.is_connected and time.monotonic() - session.last_used < self.idle_timeout:
+                self._sessions_reused += 1
+                return session
+            await self._discard(pool, session)
+        return None
+
+    async def _discard(self, pool: _ServerPool, session: _Session):
+        """Close a session and free its place in the pool"""
+        pool.open -= 1
+        try:
+            if session.smtp.is_connected:
+                await session.smtp.quit()
+        except Exception:
+            session.smtp.close()
+
+    def _release(self, pool: _ServerPool, session: _Session) -> bool:
+        """Return a session to the pool; False if it has to be recycled instead"""
+        if not session.smtp.is_connected:
+            return False
+        if self.max_messages and session.messages >= self.max_messages:
+            return False
+        session.last_used = time.monotonic()
+        pool.idle.append(session)
+        return True
+
+    async def send(
+        self,
+        message: Message,
+        smtp_config: Dict[str, Any],
+        recipients: Optional[List[str]] = None
+    ):
+        """
+        Send a message over a pooled session of the configured server.
+
+        A pooled session the server has silently dropped is replaced once
+        by a fresh one; other errors are raised to the caller.
+
+        Args:
+            message: Email message
+            smtp_config: Server config (hostname, port, username, password, use_tls, use_ssl)
+            recipients: Envelope recipients (defaults to the message headers)
+        """
+        pool = self._pool_for(smtp_config)
+        async with pool.slots:
+            try:
+                session = await self._checkout(pool) or await self._connect(pool, smtp_config)
+                try:
+                    await self._send_on(pool, session, message, recipients)
+                except aiosmtplib.SMTPServerDisconnected:
+                    if session.messages == 0:
+                        raise
+                    # The server dropped the idle session: retry once on a fresh one
+                    self._reconnects += 1
+                    session = await self._connect(pool, smtp_config)
+                    await self._send_on(pool, session, message, recipients)
+            except Exception:
+                self._errors += 1
+                raise
+
+    async def _send_on(
+        self,
+        pool: _ServerPool,
+        session: _Session,
+        message: Message,
+        recipients: Optional[List[str]]
+    ):
+        """Send over one session, then return it to the pool or close it"""
+        try:
+            await session.smtp.send_message(message, recipients=recipients)
+        except Exception as e:
+            if not (isinstance(e, _RECOVERABLE_ERRORS) and self._release(pool, session)):
+                await self._discard(pool, session)
+            raise
+
+        session.messages += 1
+        self._messages_sent += 1
+        if not self._release(pool, session):
+            await self._discard(pool, session)
+
+    async def close(self):
+        """Close every pooled session"""
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            while pool.idle:
+                await self._discard(pool, pool.idle.pop())
+        if pools:
+            logger.info("SMTP pool closed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get SMTP pool statistics.
+
+        Returns:
+            Dictionary with message counts, session reuse and per-server usage
+        """
+        checkouts = self._sessions_created + self._sessions_reused
+        return {
+            "size": self.size,
+            "messages_sent": self._messages_sent,
+            "errors": self._errors,
+            "sessions_created": self._sessions_created,
+            "sessions_reused": self._sessions_reused,
+            "reconnects": self._reconnects,
+            "reuse_rate": self._sessions_reused / checkouts if checkouts else 0.0,
+            "servers": {
+                f"{key[2] or ''}@{key[0]}:{key[1]}": {"open": pool.open, "idle": len(pool.idle)}
+                for key, pool in self._pools.items()
+            }
+        }
+
+
+class DomainThrottle:
+    """Spaces out sends to the same recipient domain"""
+
+    def __init__(self, rate: float):
+        """
+        Initialize throttle.
+
+        Args:
+            rate: Messages per second per domain (0 = unthrottled)
+        """
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next: Dict[str, float] = {}
+
+    async def wait(self, recipient: str):
+        """Wait for the next send slot of the recipient's domain"""
+        if not self.interval:
+            return
+        domain = recipient.rsplit("@", 1)[-1].strip().lower()
+        now = time.monotonic()
+        slot = max(now, self._next.get(domain, now))
+        self._next[domain] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+# Global SMTP pool instance
+smtp_pool = SMTPPool()
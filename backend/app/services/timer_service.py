@@ -0,0 +1,245 @@
+"""
+Durable Timer Service
+
+Runs parked by a delay node are stored with ``status=waiting`` and their
+``wake_at`` time, holding no coroutine, context or outputs in memory while
+they wait. The timer service keeps an index of wake-up times and requeues
+each run once it is due; the resumed run restores its completed nodes from
+the checkpoint and continues after the delay.
+
+Index backends:
+- redis: a sorted set (score = wake-up timestamp) shared by every process;
+  a due run is claimed by whoever removes it from the set first
+- local: an in-process heap, rebuilt from the waiting runs on startup
+
+The run records are the source of truth; the index is only rebuilt from
+them (``load``), so no timer is lost across restarts.
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+import asyncio
+import heapq
+import time
+
+from loguru import logger
+import redis.asyncio as redis
+
+from ..core.config import settings
+from ..core.database import get_database
+from ..models.workflow import WorkflowRun, ExecutionStatus
+
+
+def _timestamp(wake_at: datetime) -> float:
+    """Epoch seconds of a UTC datetime (naive datetimes are UTC, as stored by Mongo)"""
+    if wake_at.tzinfo is None:
+        return (wake_at - datetime(1970, 1, 1)).total_seconds()
+    return wake_at.timestamp()
+
+
+class TimerService:
+    """Wake-up index of parked workflow runs"""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        key: str = settings.RUN_TIMER_KEY,
+        poll_interval: float = settings.RUN_TIMER_POLL_INTERVAL,
+        batch_size: int = 500
+    ):
+        """
+        Initialize timer service.
+
+        Args:
+            redis_url: Redis connection URL (None keeps the index in process)
+            key: Sorted set holding the wake-up times
+            poll_interval: Seconds between checks for due runs
+            batch_size: Maximum runs woken per check
+        """
+        self.redis_url = redis_url
+        self.key = key
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.client = None
+
+        self._heap: List[Tuple[float, str]] = []
+        self._scheduled: Dict[str, float] = {}
+        self._wake: Optional[Callable[[str], Awaitable[bool]]] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self._parked = 0
+        self._woken = 0
+        self._wake_failures = 0
+        self._lateness_ms: List[float] = []
+
+    @property
+    def backend(self) -> str:
+        return "redis" if self.client else "local"
+
+    async def connect(self):
+        """Connect to the shared Redis index, or fall back to the local heap"""
+        if not self.redis_url or self.client:
+            return
+        try:
+            self.client = await redis.from_url(self.redis_url, decode_responses=True)
+            await self.client.ping()
+            logger.info(f"Timer service using Redis sorted set {self.key}")
+        except Exception as e:
+            logger.warning(f"Timer service falling back to a local index: {e}")
+            self.client = None
+
+    async def schedule(self, execution_id: str, wake_at: datetime):
+        """Index a parked run to be woken at ``wake_at`` (UTC)"""
+        await self._index(execution_id, _timestamp(wake_at))
+        self._parked += 1
+
+    async def _index(self, execution_id: str, timestamp: float):
+        if self.client:
+            await self.client.zadd(self.key, {execution_id: timestamp})
+        else:
+            self._scheduled[execution_id] = timestamp
+            heapq.heappush(self._heap, (timestamp, execution_id))
+
+    async def cancel(self, execution_id: str):
+        """Drop a run's wake-up (e.g. the run was cancelled while waiting)"""
+        if self.client:
+            await self.client.zrem(self.key, execution_id)
+        else:
+            # Stale heap entries are skipped when popped
+            self._scheduled.pop(execution_id, None)
+
+    async def due(self, now: Optional[float] = None) -> List[str]:
+        """Remove and return the runs due by ``now``"""
+        now = time.time() if now is None else now
+        due: List[str] = []
+
+        if self.client:
+            candidates = await self.client.zrangebyscore(
+                self.key, "-inf", now, start=0, num=self.batch_size, withscores=True
+            )
+            for execution_id, timestamp in candidates:
+                # Only the process that removes an entry wakes the run
+                if await self.client.zrem(self.key, execution_id):
+                    due.append(execution_id)
+                    self._record_lateness(now, timestamp)
+            return due
+
+        while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+            timestamp, execution_id = heapq.heappop(self._heap)
+            if self._scheduled.get(execution_id) != timestamp:
+                continue
+            del self._scheduled[execution_id]
+            due.append(execution_id)
+            self._record_lateness(now, timestamp)
+        return due
+
+    def _record_lateness(self, now: float, timestamp: float):
+        self._lateness_ms.append((now - timestamp) * 1000)
+        if len(self._lateness_ms) > 1000:
+            del self._lateness_ms[:-1000]
+
+    async def load(self) -> int:
+        """Rebuild the index from the waiting runs; returns the number indexed"""
+        db = await get_database()
+        cursor = db[WorkflowRun.Settings.name].find(
+            {"status": ExecutionStatus.WAITING.value, "wake_at": {"$ne": None}},
+            {"execution_id": 1, "wake_at": 1}
+        )
+        count = 0
+        async for document in cursor:
+            await self._index(document["execution_id"], _timestamp(document["wake_at"]))
+            count += 1
+
+        if count:
+            logger.info(f"Timer service indexed {count} waiting runs")
+        return count
+
+    async def tick(self) -> List[str]:
+        """Wake every due run; returns the execution IDs woken"""
+        woken = []
+        for execution_id in await self.due():
+            try:
+                if await self._wake(execution_id):
+                    woken.append(execution_id)
+            except Exception as e:
+                # Keep the timer; the wake is retried on a later tick
+                self._wake_failures += 1
+                logger.error(f"Failed to wake run {execution_id}: {e}")
+                await self._index(execution_id, time.time() + self.poll_interval)
+
+        if woken:
+            self._woken += len(woken)
+            logger.info(f"Timer service woke {len(woken)} runs")
+        return woken
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.error(f"Timer service tick failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def start(self, wake: Callable[[str], Awaitable[bool]]):
+        """
+        Start waking due runs.
+
+        Args:
+            wake: Requeues a waiting run; returns False if it was no longer waiting
+        """
+        if self._task:
+            return
+        self._wake = wake
+        await self.connect()
+        await self.load()
+        self._task = asyncio.create_task(self._loop())
+        logger.info(f"Timer service started ({self.backend} index)")
+
+    async def stop(self):
+        """Stop waking runs and disconnect (timers stay persisted)"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.client:
+            await self.client.close()
+            self.client = None
+        logger.info("Timer service stopped")
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """
+        Get timer statistics.
+
+        Returns:
+            Dictionary with pending timers, parked/woken counts and wake-up lateness
+        """
+        if self.client:
+            try:
+                pending = await self.client.zcard(self.key)
+            except Exception as e:
+                logger.error(f"Failed to count timers: {e}")
+                pending = None
+        else:
+            pending = len(self._scheduled)
+
+        lateness = sorted(self._lateness_ms)
+        return {
+            "backend": self.backend,
+            "running": self._task is not None,
+            "pending": pending,
+            "parked": self._parked,
+            "woken": self._woken,
+            "wake_failures": self._wake_failures,
+            "lateness_ms": {
+                "samples": len(lateness),
+                "p50": lateness[len(lateness) // 2] if lateness else None,
+                "max": lateness[-1] if lateness else None
+            }
+        }
+
+
+# Global timer service instance; shares its index through Redis when runs
+# are executed by worker processes
+timer_service = TimerService(
+    redis_url=settings.redis_connection_url if settings.RUN_QUEUE_BACKEND == "redis-stream" else None
+)
@@ -9,30 +9,53 @@ and managing execution state. It integrates with:
 - Inter-node communication system (Simple & Redis Pub/Sub modes)
 """
 from typing import Dict, Any, List, Optional, Callable
-from datetime import datetime
+from datetime import datetime, timedelta
 from loguru import logger
 import asyncio
+import time
 import uuid
 import json
 import os
 from enum import Enum
-import ssl
-import aiosmtplib
-import aiohttp
-from email.mime.text import MIMEText as MimeText
-from email.mime.multipart import MIMEMultipart as MimeMultipart
-from email.mime.base import MIMEBase as MimeBase
-from email import encoders
+from urllib.parse import urlsplit
 
 from ..models.workflow import (
     Workflow,
     WorkflowRun,
     ExecutionStatus,
+    RunEventKind,
     Node
 )
+from ..core.config import settings
 from .ai_service_manager import ai_service_manager
+from .timer_service import timer_service
+from .resilience import (
+    HTTPStatusError,
+    call_with_retry,
+    classify_http_error,
+    deadline_scope,
+    retry_after_from_headers
+)
 from .llm.base import LLMRequest, LLMMessage
 from .agents.aap import AgentMessage, MessageType, MessagePriority
+from .execution.scheduler import DAGScheduler
+from .execution.persistence import RunStateWriter
+from .execution.templates import render_template, render_value
+from .execution.expressions import compile_expression
+from .execution.transformer import apply_transforms
+from .execution.fanout import MAP_NODE_TYPE
+from .execution.memo import NodeMemoizer, StreamedInputError, node_inputs
+from .execution.incremental import config_hash
+from .execution.streams import RecordStream, iter_items
+from .execution.registry import node_registry
+from .execution.plan import plan_cache
+from .execution.liveness import OutputLiveness
+from .execution.context import (
+    ExecutionContext,
+    get_current_context,
+    set_current_context,
+    reset_current_context
+)
 
 
 class WorkflowExecutionError(Exception):
@@ -51,22 +74,29 @@ class WorkflowExecutor:
     Executes workflows by processing nodes in topological order.
 
     Features:
-    - Sequential and parallel node execution
+    - Dependency-aware parallel node execution (bounded per run)
     - Error handling and rollback
     - Real-time state updates
     - Redis-cached LLM calls
     - Inter-node communication (ask_node, broadcast, shared context)
+
+    Per-run state lives in an ExecutionContext bound to the run's tasks, so
+    a single executor can drive many runs concurrently.
     """
 
     def __init__(self):
         self.max_retries = 3
         self.node_timeout = 300  # 5 minutes per node
+        self.max_parallel_nodes = settings.WORKFLOW_MAX_PARALLEL_NODES
 
-        # Node communication state (Simple mode)
-        self.shared_context: Dict[str, Any] = {}
-        self.node_registry: Dict[str, Node] = {}
-        self.current_run: Optional[WorkflowRun] = None
-        self.execution_context: Optional[Dict[str, Any]] = None
+        # Runs currently executing in this process (execution_id -> context)
+        self.active_contexts: Dict[str, ExecutionContext] = {}
+
+        # Cross-run reuse of results of deterministic nodes (opt-in per node type)
+        self.memoizer = NodeMemoizer(
+            ttls=settings.NODE_MEMO_TTLS,
+            cache_provider=lambda: ai_service_manager.redis_cache if settings.CACHE_ENABLED else None
+        )
 
         # Redis Pub/Sub communication state
         self.message_bus = None
@@ -74,6 +104,37 @@ class WorkflowExecutor:
         self.active_agents: Dict[str, str] = {}  # execution_id -> {node_id -> agent_id}
         self.pending_responses: Dict[str, asyncio.Future] = {}  # message_id -> Future
 
+    # ==================== PER-RUN STATE ====================
+
+    @property
+    def current_context(self) -> Optional[ExecutionContext]:
+        """Execution context of the run owning the current task"""
+        return get_current_context()
+
+    @property
+    def shared_context(self) -> Dict[str, Any]:
+        """Shared context of the current run"""
+        context = self.current_context
+        return context.shared if context else {}
+
+    @property
+    def node_registry(self) -> Dict[str, Node]:
+        """Nodes of the workflow being executed by the current run"""
+        context = self.current_context
+        return context.node_registry if context else {}
+
+    @property
+    def current_run(self) -> Optional[WorkflowRun]:
+        """Run record of the current run"""
+        context = self.current_context
+        return context.run if context else None
+
+    @property
+    def execution_context(self) -> Optional[Dict[str, Any]]:
+        """Runtime context (variables, outputs, shared) of the current run"""
+        context = self.current_context
+        return context.runtime if context else None
+
     async def execute(self, workflow: Workflow, run: WorkflowRun) -> WorkflowRun:
         """
         Execute a complete workflow.
@@ -85,35 +146,18 @@ class WorkflowExecutor:
         Returns:
             Updated WorkflowRun with execution results
         """
+        run_context: Optional[ExecutionContext] = None
+        context_token = None
+
         try:
             logger.info(f"Starting workflow execution: {workflow.name} (ID: {workflow.id})")
 
-            # Update status to running
-            run.status = ExecutionStatus.RUNNING
-            run.start_time = datetime.utcnow()
-            await run.save()
-
-            # Build node execution order
-            execution_order = self._build_execution_order(workflow.nodes, workflow.edges)
-            logger.info(f"Execution order: {[node.id for node in execution_order]}")
-
             # Determine communication mode from workflow metadata
             comm_mode = CommunicationMode(
-                workflow.metadata.get("communication_mode", "simple")
-                if hasattr(workflow, 'metadata') and workflow.metadata
-                else "simple"
+                self._get_workflow_option(workflow, "communication_mode", "simple")
             )
             logger.info(f"Using communication mode: {comm_mode}")
 
-            # Initialize communication system
-            self.shared_context = {}
-            self.node_registry = {node.id: node for node in workflow.nodes}
-            self.current_run = run
-
-            # Initialize communication log
-            if run.communication_log is None:
-                run.communication_log = []
-
             # Initialize message bus and orchestrator for PUBSUB mode
             if comm_mode == CommunicationMode.PUBSUB:
                 try:
@@ -135,16 +179,43 @@ class WorkflowExecutor:
                     logger.warning(f"Failed to initialize Pub/Sub mode, falling back to simple: {e}")
                     comm_mode = CommunicationMode.SIMPLE
 
-            # Initialize runtime context
-            context = {
-                "workflow_id": str(workflow.id),
-                "execution_id": run.execution_id,
-                "variables": run.variables.copy(),
-                "outputs": {},  # Store node outputs for downstream nodes
-                "shared": self.shared_context,  # Shared context for inter-node communication
-                "communication_mode": comm_mode
-            }
-            self.execution_context = context
+            # Dependency structure, map bodies and streaming are compiled once
+            # per workflow version (validating the graph) and cached
+            plan = plan_cache.get(workflow)
+
+            # Initialize isolated per-run context and bind it to this task
+            run_context = ExecutionContext(
+                workflow,
+                run,
+                comm_mode,
+                writer=RunStateWriter(
+                    run,
+                    flush_interval=settings.RUN_STATE_FLUSH_INTERVAL,
+                    max_pending=settings.RUN_STATE_MAX_PENDING
+                ),
+                plan=plan
+            )
+            if settings.RELEASE_NODE_OUTPUTS:
+                run_context.liveness = OutputLiveness.from_plan(plan)
+            context_token = set_current_context(run_context)
+            self.active_contexts[run.execution_id] = run_context
+            context = run_context.runtime
+            writer = run_context.writer
+
+            # Update status to running (written immediately so pollers see it)
+            run.status = ExecutionStatus.RUNNING
+            run.start_time = datetime.utcnow()
+            writer.set("status", run.status.value)
+            writer.set("start_time", run.start_time)
+            await writer.load_sequence()
+            await writer.flush()
+
+            # Map bodies are scheduled by their map node, once per item
+            scheduler = plan.scheduler
+            run_context.checkpoint = self._load_checkpoint(run, plan.level_nodes, plan.level_edges)
+            if run_context.checkpoint:
+                logger.info(f"Resuming from checkpoint: {sorted(run_context.checkpoint)} already completed")
+            logger.info(f"Execution order: {[node.id for node in scheduler.order]}")
 
             # Register nodes as agents for PUBSUB mode
             if comm_mode == CommunicationMode.PUBSUB:
@@ -153,47 +224,28 @@ class WorkflowExecutor:
                     if node.type == "ai-processor" and node.config.get("can_communicate"):
                         await self._register_node_agent(node, run.execution_id)
 
-            # Execute nodes in order
-            for node in execution_order:
-                try:
-                    logger.info(f"Executing node: {node.id} (type: {node.type})")
-
-                    # Add log entry
-                    await self._add_log(run, node.id, f"Starting execution of {node.type} node")
-
-                    # Execute node with timeout
-                    result = await asyncio.wait_for(
-                        self._execute_node(node, context, run),
-                        timeout=self.node_timeout
-                    )
-
-                    # Store result
-                    run.node_states[node.id] = result
-                    context["outputs"][node.id] = result.get("output")
-
-                    await self._add_log(
-                        run,
-                        node.id,
-                        f"Completed successfully. Cached: {result.get('cached', False)}"
-                    )
-                    await run.save()
-
-                except asyncio.TimeoutError:
-                    error_msg = f"Node {node.id} execution timeout after {self.node_timeout}s"
-                    logger.error(error_msg)
-                    await self._add_error(run, node.id, error_msg)
-                    raise WorkflowExecutionError(error_msg)
+            # Execute nodes as soon as their dependencies complete; untaken branches are pruned
+            skipped = await scheduler.run(
+                lambda node: self._run_scheduled_node(node, context, run),
+                on_skip=lambda node: self._record_skipped_node(node, run),
+                max_concurrency=self._get_workflow_option(
+                    workflow, "max_parallel_nodes", self.max_parallel_nodes
+                )
+            )
+            if skipped:
+                logger.info(f"Skipped {len(skipped)} unreachable nodes: {skipped}")
 
-                except Exception as e:
-                    error_msg = f"Node {node.id} execution failed: {str(e)}"
-                    logger.error(error_msg)
-                    await self._add_error(run, node.id, error_msg)
-                    raise WorkflowExecutionError(error_msg)
+            # A long delay parked the run: release it until the timer wakes it
+            if run_context.wake_at:
+                await self._park_run(run, run_context)
+                return run
 
-            # Mark as successful
+            # Mark as successful; terminal status is always flushed
             run.status = ExecutionStatus.SUCCESS
             run.end_time = datetime.utcnow()
-            await run.save()
+            writer.set("status", run.status.value)
+            writer.set("end_time", run.end_time)
+            await writer.close()
 
             # Cleanup: Unregister agents if using PUBSUB mode
             if context.get("communication_mode") == CommunicationMode.PUBSUB:
@@ -202,65 +254,240 @@ class WorkflowExecutor:
             logger.info(f"Workflow execution completed successfully: {run.execution_id}")
             return run
 
+        except asyncio.CancelledError:
+            # Interrupted (e.g. shutdown): keep the checkpoint and leave the run resumable
+            logger.warning(f"Workflow execution interrupted: {run.execution_id}")
+            run.status = ExecutionStatus.PAUSED
+            run.interrupted_at = datetime.utcnow()
+            try:
+                if run_context:
+                    run_context.writer.set("status", run.status.value)
+                    run_context.writer.set("interrupted_at", run.interrupted_at)
+                    await run_context.writer.close()
+                else:
+                    await run.save()
+            except Exception as persist_error:
+                logger.error(f"Failed to checkpoint interrupted run {run.execution_id}: {persist_error}")
+
+            if run_context and run_context.communication_mode == CommunicationMode.PUBSUB:
+                await self._cleanup_agents(run.execution_id)
+
+            raise
+
         except Exception as e:
             logger.error(f"Workflow execution failed: {str(e)}")
             run.status = ExecutionStatus.ERROR
             run.end_time = datetime.utcnow()
             await self._add_error(run, "workflow", f"Workflow execution failed: {str(e)}")
-            await run.save()
+            if run_context:
+                run_context.writer.set("status", run.status.value)
+                run_context.writer.set("end_time", run.end_time)
+                try:
+                    await run_context.writer.close()
+                except Exception as persist_error:
+                    logger.error(f"Failed to persist failure of run {run.execution_id}: {persist_error}")
+            else:
+                await run.save()
 
             # Cleanup agents on failure too
-            if self.execution_context and self.execution_context.get("communication_mode") == CommunicationMode.PUBSUB:
+            if run_context and run_context.communication_mode == CommunicationMode.PUBSUB:
                 await self._cleanup_agents(run.execution_id)
 
             raise
 
-    def _build_execution_order(self, nodes: List[Node], edges: List) -> List[Node]:
+        finally:
+            if run_context:
+                # Release streams a failed or pruned consumer left unread
+                for stream in run_context.streams:
+                    await stream.aclose()
+                self.active_contexts.pop(run.execution_id, None)
+            if context_token is not None:
+                reset_current_context(context_token)
+
+    async def _run_scheduled_node(self, node: Node, context: Dict[str, Any], run: WorkflowRun):
+        """Execute a single scheduled node and record its result"""
+        restored = await self._restore_checkpoint(node, context, run)
+        if restored is not None:
+            self._release_outputs(node.id, run)
+            return restored
+
+        try:
+            logger.info(f"Executing node: {node.id} (type: {node.type})")
+
+            # Add log entry
+            await self._add_log(run, node.id, f"Starting execution of {node.type} node")
+
+            # Execute node with timeout (map nodes are bounded per item instead);
+            # ``timeout`` is a node's own setting, e.g. a webhook's request timeout
+            timeout = node.config.get(
+                "node_timeout",
+                None if node.type == MAP_NODE_TYPE else self.node_timeout
+            )
+            # (retries inside the node give up rather than outlive it)
+            started = time.monotonic()
+            with deadline_scope(timeout):
+                result = await asyncio.wait_for(
+                    self._execute_node(node, context, run),
+                    timeout=timeout
+                )
+
+            # Store result (persisted by the run's write-behind writer); the
+            # config hash lets incremental runs tell whether it is reusable,
+            # the duration feeds latency estimates (see execution.analysis)
+            result["config_hash"] = config_hash(node)
+            result["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+            context["outputs"][node.id] = result.get("output")
+            if result.get("streamed"):
+                # The records went to the consumer; only the summary is kept
+                result = {**result, "output": None}
+            run.node_states[node.id] = result
+            self._run_writer(run).set_node_state(node.id, result)
+
+            if result.get("park"):
+                await self._add_log(run, node.id, f"Waiting until {result.get('wake_at')}")
+                return result
+
+            await self._add_log(
+                run,
+                node.id,
+                f"Completed successfully. Cached: {result.get('cached', False)}"
+            )
+            self._release_outputs(node.id, run)
+            return result
+
+        except asyncio.TimeoutError:
+            error_msg = f"Node {node.id} execution timeout after {timeout}s"
+            logger.error(error_msg)
+            await self._add_error(run, node.id, error_msg)
+            raise WorkflowExecutionError(error_msg)
+
+        except Exception as e:
+            error_msg = f"Node {node.id} execution failed: {str(e)}"
+            logger.error(error_msg)
+            await self._add_error(run, node.id, error_msg)
+            raise WorkflowExecutionError(error_msg)
+
+    async def _park_run(self, run: WorkflowRun, run_context: ExecutionContext):
         """
-        Build execution order using topological sort.
+        Persist a run parked by delay nodes as waiting and index its wake-up.
 
-        For now, uses simple sequential order based on node position.
-        TODO: Implement proper topological sort for complex workflows
+        Nothing of the run stays in memory: when the timer service requeues
+        it, it resumes from its checkpoint like any interrupted run.
         """
-        # Find start node
-        start_nodes = [n for n in nodes if n.type == "start"]
-        if not start_nodes:
-            # If no start node, use first node
-            return nodes
-
-        # Simple approach: execute in order of connections
-        # In production, implement proper topological sort
-        visited = set()
-        order = []
-
-        def visit(node_id: str):
-            if node_id in visited:
-                return
-            visited.add(node_id)
+        run.status = ExecutionStatus.WAITING
+        run.wake_at = run_context.wake_at
+        run_context.writer.set("status", run.status.value)
+        run_context.writer.set("wake_at", run.wake_at)
+        await run_context.writer.close()
+
+        try:
+            await timer_service.schedule(run.execution_id, run.wake_at)
+        except Exception as e:
+            # The run record is the source of truth; it is re-indexed on startup
+            logger.error(f"Failed to index wake-up of run {run.execution_id}: {e}")
+
+        if run_context.communication_mode == CommunicationMode.PUBSUB:
+            await self._cleanup_agents(run.execution_id)
+
+        logger.info(f"Workflow execution parked until {run.wake_at.isoformat()}: {run.execution_id}")
+
+    def _load_checkpoint(self, run: WorkflowRun, nodes: List[Node], edges: List) -> Dict[str, Dict[str, Any]]:
+        """
+        Collect the node results a resumed run can reuse.
+
+        Every completed node's result (including its output) is persisted in
+        ``run.node_states`` as soon as the node finishes, so a run that failed
+        or was interrupted restarts from its first incomplete nodes. Streamed
+        outputs are not persisted, so a streaming node is only restored when
+        its consumer is too.
+        """
+        node_states = run.node_states or {}
+        checkpoint = {
+            node.id: node_states[node.id]
+            for node in nodes
+            if isinstance(node_states.get(node.id), dict)
+            and node_states[node.id].get("status") == "completed"
+            and not node_states[node.id].get("output_released")
+        }
+
+        for edge in edges:
+            state = checkpoint.get(edge.from_)
+            if state and state.get("streamed") and edge.to not in checkpoint:
+                del checkpoint[edge.from_]
+        return checkpoint
 
-            # Find the node
-            node = next((n for n in nodes if n.id == node_id), None)
-            if node:
-                order.append(node)
+    async def _restore_checkpoint(
+        self,
+        node: Node,
+        context: Dict[str, Any],
+        run: WorkflowRun
+    ) -> Optional[Dict[str, Any]]:
+        """Reuse a node's checkpointed result instead of executing it again"""
+        run_context = self.active_contexts.get(run.execution_id)
+        if not run_context or node.id not in run_context.checkpoint:
+            return None
+
+        result = run_context.checkpoint.pop(node.id)
+        context["outputs"][node.id] = result.get("output")
+        await self._add_log(run, node.id, "Restored from checkpoint")
+        return result
 
-                # Find outgoing edges
-                for edge in edges:
-                    if edge.from_ == node_id:
-                        visit(edge.to)
+    def _release_outputs(self, node_id: str, run: WorkflowRun):
+        """
+        Drop the in-memory outputs no unfinished node reads anymore.
 
-        # Start from start node
-        visit(start_nodes[0].id)
+        The persisted node states keep them; runs that are never persisted
+        keep them in ``run.node_states`` too, as it is their only copy.
+        """
+        run_context = self.active_contexts.get(run.execution_id)
+        if run_context is None or run_context.liveness is None:
+            return
 
-        # Add any remaining nodes
-        for node in nodes:
-            if node not in order:
-                order.append(node)
+        for producer in run_context.liveness.finished(node_id):
+            run_context.outputs.pop(producer, None)
+            state = run.node_states.get(producer)
+            if run.id is not None and isinstance(state, dict) and state.get("output") is not None:
+                # Replaced, not mutated: the writer may still hold the state to persist
+                run.node_states[producer] = {**state, "output": None, "output_released": True}
+
+    def _record_skipped_node(self, node: Node, run: WorkflowRun):
+        """Record a node pruned because none of its incoming branches was taken"""
+        state = {
+            "status": "skipped",
+            "reason": "Not reachable from the branches taken",
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        run.node_states[node.id] = state
+
+        writer = self._run_writer(run)
+        if writer:
+            writer.set_node_state(node.id, state)
+            writer.append_event(RunEventKind.LOG, node.id, {"message": "Skipped: branch not taken"})
+        logger.info(f"Skipping node {node.id}: branch not taken")
+        self._release_outputs(node.id, run)
+
+    def _get_workflow_option(self, workflow: Workflow, key: str, default: Any = None) -> Any:
+        """Read an execution option from workflow metadata (model or dict)"""
+        metadata = getattr(workflow, "metadata", None)
+        if not metadata:
+            return default
+        if isinstance(metadata, dict):
+            value = metadata.get(key)
+        else:
+            value = getattr(metadata, key, None)
+        return default if value is None else value
 
-        return order
+    def _build_execution_order(self, nodes: List[Node], edges: List) -> List[Node]:
+        """
+        Build execution order using topological sort.
+
+        Nodes that do not depend on each other keep their original relative order.
+        """
+        return DAGScheduler(nodes, edges).order
 
     async def _execute_node(self, node: Node, context: Dict[str, Any], run: WorkflowRun) -> Dict[str, Any]:
         """
-        Execute a single node based on its type.
+        Execute a single node, reusing a memoized result when one exists.
 
         Args:
             node: The node to execute
@@ -270,32 +497,37 @@ class WorkflowExecutor:
         Returns:
             Dictionary with execution result
         """
-        node_type = node.type.lower()
-
-        # Route to appropriate handler
-        if node_type == "start":
-            return await self._execute_start_node(node, context)
-        elif node_type == "ai-processor":
-            return await self._execute_ai_node(node, context)
-        elif node_type == "email":
-            return await self._execute_email_node(node, context)
-        elif node_type == "data-source":
-            return await self._execute_data_source_node(node, context)
-        elif node_type == "webhook":
-            return await self._execute_webhook_node(node, context)
-        elif node_type == "filter":
-            return await self._execute_filter_node(node, context)
-        elif node_type == "transformer":
-            return await self._execute_transformer_node(node, context)
-        elif node_type == "condition":
-            return await self._execute_condition_node(node, context)
-        elif node_type == "delay":
-            return await self._execute_delay_node(node, context)
-        elif node_type == "end":
-            return await self._execute_end_node(node, context)
-        else:
-            logger.warning(f"Unknown node type: {node_type}, skipping")
-            return {"status": "skipped", "reason": f"Unknown node type: {node_type}"}
+        ttl = self.memoizer.ttl_for(node)
+        if not ttl:
+            return await self._dispatch_node(node, context, run)
+
+        try:
+            key = self.memoizer.key(node, node_inputs(node, context, self._resolve_source))
+        except StreamedInputError:
+            # Streamed records have no stable identity to key on
+            return await self._dispatch_node(node, context, run)
+        except Exception as e:
+            logger.warning(f"Node {node.id} inputs could not be resolved for memoization: {e}")
+            return await self._dispatch_node(node, context, run)
+
+        memoized = await self.memoizer.get(key)
+        if memoized is not None:
+            logger.info(f"Node {node.id}: reusing memoized result")
+            return {**memoized, "cached": True, "memoized": True}
+
+        result = await self._dispatch_node(node, context, run)
+        if result.get("status") == "completed" and not result.get("streamed"):
+            await self.memoizer.set(key, result, ttl)
+        return result
+
+    async def _dispatch_node(self, node: Node, context: Dict[str, Any], run: WorkflowRun) -> Dict[str, Any]:
+        """Route a node to the handler registered for its type (see execution.registry)"""
+        spec = node_registry.get(node.type)
+        if spec is None:
+            logger.warning(f"Unknown node type: {node.type.lower()}, skipping")
+            return {"status": "skipped", "reason": f"Unknown node type: {node.type.lower()}"}
+
+        return await node_registry.call(spec, self, node, context, run)
 
     async def _execute_start_node(self, node: Node, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute start node - initializes workflow execution"""
@@ -476,96 +708,34 @@ Use these functions when you need to coordinate with other nodes in the workflow
         return communications
 
     async def _execute_email_node(self, node: Node, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute email node - sends email via SMTP"""
+        """
+        Execute email node - sends email via SMTP.
+
+        Messages go over pooled SMTP sessions (see services.smtp_pool). With
+        ``bulk`` set the node is a mail merge: one personalized message per
+        record of ``source``, see _execute_bulk_email_node.
+        """
         try:
-            # Extract and interpolate email configuration
-            to_email = self._interpolate_variables(node.config.get("to", ""), context)
-            subject = self._interpolate_variables(node.config.get("subject", ""), context)
-            body = self._interpolate_variables(node.config.get("body", ""), context)
-            
-            # Optional email fields
-            from_email = self._interpolate_variables(
-                node.config.get("from", os.getenv("SMTP_FROM_EMAIL", "noreply@chasmx.ai")), 
-                context
-            )
-            cc = self._interpolate_variables(node.config.get("cc", ""), context)
-            bcc = self._interpolate_variables(node.config.get("bcc", ""), context)
-            
-            # Email format (html or text)
-            email_format = node.config.get("format", "text")  # 'html' or 'text'
-            
-            # Retry configuration
-            max_retries = node.config.get("retries", 3)
-            retry_delay = node.config.get("retry_delay", 1)  # seconds
+            if node.config.get("bulk"):
+                return await self._execute_bulk_email_node(node, context)
 
-            logger.info(f"Email Node: Sending to {to_email}")
+            email = self._render_email(node, context)
+            smtp_config = self._smtp_config(node)
 
-            # Validate required fields
-            if not to_email:
-                raise ValueError("Recipient email address is required")
-            if not subject:
-                raise ValueError("Email subject is required")
-            if not body:
-                raise ValueError("Email body is required")
-
-            # SMTP configuration from environment variables
-            smtp_config = {
-                "hostname": os.getenv("SMTP_HOST", "localhost"),
-                "port": int(os.getenv("SMTP_PORT", 587)),
-                "username": os.getenv("SMTP_USERNAME"),
-                "password": os.getenv("SMTP_PASSWORD"),
-                "use_tls": os.getenv("SMTP_USE_TLS", "true").lower() == "true",
-                "use_ssl": os.getenv("SMTP_USE_SSL", "false").lower() == "true",
-            }
+            logger.info(f"Email Node: Sending to {email['to_email']}")
 
-            # Allow node-specific SMTP override
-            if "smtp" in node.config:
-                smtp_override = node.config["smtp"]
-                smtp_config.update({
-                    "hostname": smtp_override.get("host", smtp_config["hostname"]),
-                    "port": smtp_override.get("port", smtp_config["port"]),
-                    "username": smtp_override.get("username", smtp_config["username"]),
-                    "password": smtp_override.get("password", smtp_config["password"]),
-                    "use_tls": smtp_override.get("use_tls", smtp_config["use_tls"]),
-                    "use_ssl": smtp_override.get("use_ssl", smtp_config["use_ssl"]),
-                })
-
-            # Send email with retry logic
-            last_error = None
-            for attempt in range(max_retries + 1):
-                try:
-                    await self._send_email(
-                        smtp_config=smtp_config,
-                        from_email=from_email,
-                        to_email=to_email,
-                        cc=cc,
-                        bcc=bcc,
-                        subject=subject,
-                        body=body,
-                        email_format=email_format
-                    )
-                    
-                    logger.info(f"Email sent successfully to {to_email} on attempt {attempt + 1}")
-                    
-                    return {
-                        "status": "completed",
-                        "output": f"Email sent to {to_email}",
-                        "to": to_email,
-                        "subject": subject,
-                        "attempts": attempt + 1,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                    
-                except Exception as e:
-                    last_error = e
-                    if attempt < max_retries:
-                        logger.warning(f"Email send attempt {attempt + 1} failed: {str(e)}. Retrying in {retry_delay}s...")
-                        await asyncio.sleep(retry_delay)
-                    else:
-                        logger.error(f"Email send failed after {max_retries + 1} attempts: {str(e)}")
+            attempts = await self._send_email_with_retries(node, smtp_config, email)
 
-            # If we get here, all retries failed
-            raise last_error or Exception("Email send failed")
+            logger.info(f"Email sent successfully to {email['to_email']} on attempt {attempts}")
+
+            return {
+                "status": "completed",
+                "output": f"Email sent to {email['to_email']}",
+                "to": email["to_email"],
+                "subject": email["subject"],
+                "attempts": attempts,
+                "timestamp": datetime.utcnow().isoformat()
+            }
 
         except Exception as e:
             logger.error(f"Email node execution failed: {str(e)}")
@@ -575,6 +745,166 @@ Use these functions when you need to coordinate with other nodes in the workflow
                 "timestamp": datetime.utcnow().isoformat()
             }
 
+    async def _execute_bulk_email_node(self, node: Node, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send one personalized email per record of ``source`` (mail merge).
+
+        Each record is bound to ``item_variable`` (default "item") while the
+        email fields are rendered, e.g. to "{{item.email}}" and subject
+        "Welcome, {{item.name}}". Up to ``concurrency`` messages are in
+        flight over the pooled SMTP sessions, and sends to the same
+        recipient domain are spaced to ``per_domain_rate`` messages per
+        second. A failed message (after its retries) is listed in
+        ``errors``; the node only fails if nothing could be sent. A streamed
+        source is consumed as records arrive.
+        """
+        from .smtp_pool import DomainThrottle
+
+        source = node.config.get("source")
+        if source is None:
+            raise ValueError("Bulk email node requires a 'source'")
+        records = self._resolve_source(source, context)
+        if not isinstance(records, (list, RecordStream)):
+            raise ValueError(f"Bulk email source '{source}' is not a list")
+
+        smtp_config = self._smtp_config(node)
+        item_variable = node.config.get("item_variable", "item")
+        concurrency = max(1, int(node.config.get("concurrency", settings.SMTP_POOL_SIZE)))
+        throttle = DomainThrottle(float(node.config.get("per_domain_rate", settings.SMTP_BULK_PER_DOMAIN_RATE)))
+
+        logger.info(
+            f"Email Node: Bulk send of {'streamed' if isinstance(records, RecordStream) else len(records)} "
+            f"messages (concurrency: {concurrency})"
+        )
+
+        sent = 0
+        errors: List[Dict[str, Any]] = []
+        source_records = iter_items(records)
+        source_lock = asyncio.Lock()
+        count = 0
+
+        async def next_record():
+            nonlocal count
+            async with source_lock:
+                try:
+                    record = await source_records.__anext__()
+                except StopAsyncIteration:
+                    return None
+                count += 1
+                return count - 1, record
+
+        async def worker():
+            nonlocal sent
+            while True:
+                entry = await next_record()
+                if entry is None:
+                    return
+                index, record = entry
+                to_email = None
+                try:
+                    item_context = {
+                        **context,
+                        "variables": {**context.get("variables", {}), item_variable: record}
+                    }
+                    email = self._render_email(node, item_context)
+                    to_email = email["to_email"]
+                    await throttle.wait(to_email)
+                    await self._send_email_with_retries(node, smtp_config, email)
+                    sent += 1
+                except Exception as e:
+                    errors.append({"index": index, "to": to_email, "error": str(e)})
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+        total = sent + len(errors)
+        logger.info(f"Email Node: Bulk send finished, {sent}/{total} sent")
+
+        result = {
+            "status": "completed",
+            "output": f"Sent {sent} of {total} emails",
+            "sent": sent,
+            "failed": len(errors),
+            "total": total,
+            "errors": sorted(errors, key=lambda error: error["index"])[:100],
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        if total and not sent:
+            result["status"] = "error"
+            result["error"] = f"All {total} emails failed: {errors[0]['error']}"
+        return result
+
+    def _render_email(self, node: Node, context: Dict[str, Any]) -> Dict[str, str]:
+        """Render and validate the email fields of a node"""
+        email = {
+            "to_email": self._interpolate_variables(node.config.get("to", ""), context),
+            "subject": self._interpolate_variables(node.config.get("subject", ""), context),
+            "body": self._interpolate_variables(node.config.get("body", ""), context),
+            "from_email": self._interpolate_variables(
+                node.config.get("from", os.getenv("SMTP_FROM_EMAIL", "noreply@chasmx.ai")),
+                context
+            ),
+            "cc": self._interpolate_variables(node.config.get("cc", ""), context),
+            "bcc": self._interpolate_variables(node.config.get("bcc", ""), context),
+            # Email format (html or text)
+            "email_format": node.config.get("format", "text")
+        }
+
+        # Validate required fields
+        if not email["to_email"]:
+            raise ValueError("Recipient email address is required")
+        if not email["subject"]:
+            raise ValueError("Email subject is required")
+        if not email["body"]:
+            raise ValueError("Email body is required")
+
+        return email
+
+    def _smtp_config(self, node: Node) -> Dict[str, Any]:
+        """SMTP configuration from environment variables, with node-specific override"""
+        smtp_config = {
+            "hostname": os.getenv("SMTP_HOST", "localhost"),
+            "port": int(os.getenv("SMTP_PORT", 587)),
+            "username": os.getenv("SMTP_USERNAME"),
+            "password": os.getenv("SMTP_PASSWORD"),
+            "use_tls": os.getenv("SMTP_USE_TLS", "true").lower() == "true",
+            "use_ssl": os.getenv("SMTP_USE_SSL", "false").lower() == "true",
+        }
+
+        if "smtp" in node.config:
+            smtp_override = node.config["smtp"]
+            smtp_config.update({
+                "hostname": smtp_override.get("host", smtp_config["hostname"]),
+                "port": smtp_override.get("port", smtp_config["port"]),
+                "username": smtp_override.get("username", smtp_config["username"]),
+                "password": smtp_override.get("password", smtp_config["password"]),
+                "use_tls": smtp_override.get("use_tls", smtp_config["use_tls"]),
+                "use_ssl": smtp_override.get("use_ssl", smtp_config["use_ssl"]),
+            })
+
+        return smtp_config
+
+    async def _send_email_with_retries(self, node: Node, smtp_config: Dict[str, Any], email: Dict[str, str]) -> int:
+        """
+        Send a rendered email with jittered retries behind the SMTP server's
+        circuit breaker; returns the number of attempts.
+        """
+        from .smtp_pool import classify_smtp_error
+
+        try:
+            _, attempts = await call_with_retry(
+                lambda: self._send_email(smtp_config=smtp_config, **email),
+                target=f"smtp:{smtp_config['hostname']}:{smtp_config['port']}",
+                retries=node.config.get("retries", 3),
+                base_delay=node.config.get("retry_delay", 1),  # seconds, minimum backoff
+                max_delay=node.config.get("max_retry_delay", settings.RETRY_MAX_DELAY),
+                classify=classify_smtp_error,
+                deadline=node.config.get("deadline")
+            )
+        except Exception as e:
+            logger.error(f"Email send to {email['to_email']} failed: {str(e)}")
+            raise
+        return attempts
+
     async def _send_email(
         self,
         smtp_config: Dict[str, Any],
@@ -586,7 +916,12 @@ Use these functions when you need to coordinate with other nodes in the workflow
         body: str,
         email_format: str = "text"
     ):
-        """Send email using aiosmtplib"""
+        """Send email over a pooled SMTP session"""
+        # Mail dependencies load with the first email, not with the executor
+        from email.mime.text import MIMEText as MimeText
+        from email.mime.multipart import MIMEMultipart as MimeMultipart
+        from .smtp_pool import smtp_pool
+
         # Create message
         if email_format.lower() == "html":
             msg = MimeMultipart("alternative")
@@ -600,46 +935,15 @@ Use these functions when you need to coordinate with other nodes in the workflow
         
         if cc:
             msg["Cc"] = cc
-        if bcc:
-            msg["Bcc"] = bcc
 
-        # Prepare recipient list
+        # Prepare recipient list (Bcc stays off the headers)
         recipients = [to_email]
         if cc:
             recipients.extend([email.strip() for email in cc.split(",")])
         if bcc:
             recipients.extend([email.strip() for email in bcc.split(",")])
 
-        # Configure SSL context
-        if smtp_config["use_ssl"] or smtp_config["use_tls"]:
-            ssl_context = ssl.create_default_context()
-        else:
-            ssl_context = None
-
-        # Send email
-        if smtp_config["use_ssl"]:
-            # Use SSL from the start
-            async with aiosmtplib.SMTP(
-                hostname=smtp_config["hostname"],
-                port=smtp_config["port"],
-                use_tls=False,
-                tls_context=ssl_context
-            ) as smtp:
-                await smtp.connect()
-                if smtp_config["username"] and smtp_config["password"]:
-                    await smtp.login(smtp_config["username"], smtp_config["password"])
-                await smtp.send_message(msg, recipients=recipients)
-        else:
-            # Use STARTTLS or no encryption
-            async with aiosmtplib.SMTP(
-                hostname=smtp_config["hostname"],
-                port=smtp_config["port"],
-                use_tls=smtp_config["use_tls"],
-                tls_context=ssl_context if smtp_config["use_tls"] else None
-            ) as smtp:
-                if smtp_config["username"] and smtp_config["password"]:
-                    await smtp.login(smtp_config["username"], smtp_config["password"])
-                await smtp.send_message(msg, recipients=recipients)
+        await smtp_pool.send(msg, smtp_config, recipients=recipients)
 
     async def _execute_data_source_node(self, node: Node, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute data source node - fetches data from databases/APIs"""
@@ -708,6 +1012,24 @@ Use these functions when you need to coordinate with other nodes in the workflow
             # Apply limit
             cursor = cursor.limit(limit)
 
+            # Stream batches to the consumer instead of materializing them
+            if self._streams_output(node):
+                batch_size = node.config.get("batch_size", settings.STREAM_BATCH_SIZE)
+                stream = self._open_stream(RecordStream(
+                    self._mongodb_batches(cursor.batch_size(batch_size), batch_size),
+                    max_buffered_batches=settings.STREAM_MAX_BUFFERED_BATCHES
+                ))
+                logger.info(f"Streaming from MongoDB in batches of {batch_size}")
+                return {
+                    "status": "completed",
+                    "output": stream,
+                    "streamed": True,
+                    "batch_size": batch_size,
+                    "collection": collection_name,
+                    "source_type": "mongodb",
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+
             # Fetch results
             results = []
             async for doc in cursor:
@@ -731,6 +1053,32 @@ Use these functions when you need to coordinate with other nodes in the workflow
             logger.error(f"MongoDB fetch failed: {str(e)}")
             raise
 
+    async def _mongodb_batches(self, cursor, batch_size: int):
+        """Yield documents of a Motor cursor in lists of ``batch_size``"""
+        batch = []
+        async for doc in cursor:
+            if "_id" in doc:
+                doc["_id"] = str(doc["_id"])
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _streams_output(self, node: Node) -> bool:
+        """Whether a node should stream its output to its consumer"""
+        run_context = get_current_context()
+        return bool(run_context and node.id in run_context.streaming)
+
+    def _open_stream(self, stream: RecordStream) -> RecordStream:
+        """Start a record stream owned by the current run"""
+        stream.start()
+        run_context = get_current_context()
+        if run_context:
+            run_context.streams.append(stream)
+        return stream
+
     async def _execute_webhook_node(self, node: Node, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute webhook node - makes HTTP request"""
         try:
@@ -762,7 +1110,7 @@ Use these functions when you need to coordinate with other nodes in the workflow
             # Timeout and retry configuration
             timeout = node.config.get("timeout", 30)  # seconds
             max_retries = node.config.get("retries", 3)
-            retry_delay = node.config.get("retry_delay", 1)  # seconds
+            retry_delay = node.config.get("retry_delay", 1)  # seconds, minimum backoff
             
             # Response validation
             expected_status = node.config.get("expected_status", [200, 201, 202, 204])
@@ -775,48 +1123,52 @@ Use these functions when you need to coordinate with other nodes in the workflow
             if not url:
                 raise ValueError("Webhook URL is required")
 
-            # Execute webhook with retry logic
-            last_error = None
-            for attempt in range(max_retries + 1):
-                try:
-                    response_data = await self._execute_http_request(
-                        url=url,
-                        method=method,
-                        headers=headers,
-                        body_data=body_data,
-                        params=params,
-                        auth_config=auth_config,
-                        timeout=timeout
+            async def attempt():
+                response_data = await self._execute_http_request(
+                    url=url,
+                    method=method,
+                    headers=headers,
+                    body_data=body_data,
+                    params=params,
+                    auth_config=auth_config,
+                    timeout=timeout
+                )
+
+                # Check if status code is expected
+                if response_data["status_code"] not in expected_status:
+                    raise HTTPStatusError(
+                        response_data["status_code"],
+                        f"Unexpected status code {response_data['status_code']}. "
+                        f"Expected one of: {expected_status}",
+                        retry_after=retry_after_from_headers(response_data.get("headers") or {})
                     )
-                    
-                    # Check if status code is expected
-                    if response_data["status_code"] not in expected_status:
-                        raise ValueError(
-                            f"Unexpected status code {response_data['status_code']}. "
-                            f"Expected one of: {expected_status}"
-                        )
-                    
-                    logger.info(f"Webhook request successful on attempt {attempt + 1}")
-                    
-                    return {
-                        "status": "completed",
-                        "output": response_data,
-                        "url": url,
-                        "method": method,
-                        "attempts": attempt + 1,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                    
-                except Exception as e:
-                    last_error = e
-                    if attempt < max_retries:
-                        logger.warning(f"Webhook attempt {attempt + 1} failed: {str(e)}. Retrying in {retry_delay}s...")
-                        await asyncio.sleep(retry_delay)
-                    else:
-                        logger.error(f"Webhook failed after {max_retries + 1} attempts: {str(e)}")
+                return response_data
+
+            # Execute webhook with jittered retries behind the host's circuit breaker
+            try:
+                response_data, attempts = await call_with_retry(
+                    attempt,
+                    target=f"http:{urlsplit(url).netloc}",
+                    retries=max_retries,
+                    base_delay=retry_delay,
+                    max_delay=node.config.get("max_retry_delay", settings.RETRY_MAX_DELAY),
+                    classify=classify_http_error,
+                    deadline=node.config.get("deadline")
+                )
+            except Exception as e:
+                logger.error(f"Webhook failed: {str(e)}")
+                raise
+
+            logger.info(f"Webhook request successful on attempt {attempts}")
 
-            # If we get here, all retries failed
-            raise last_error or Exception("Webhook request failed")
+            return {
+                "status": "completed",
+                "output": response_data,
+                "url": url,
+                "method": method,
+                "attempts": attempts,
+                "timestamp": datetime.utcnow().isoformat()
+            }
 
         except Exception as e:
             logger.error(f"Webhook node execution failed: {str(e)}")
@@ -836,7 +1188,9 @@ Use these functions when you need to coordinate with other nodes in the workflow
         auth_config: Dict[str, Any],
         timeout: int
     ) -> Dict[str, Any]:
-        """Execute HTTP request using aiohttp"""
+        """Execute HTTP request using the shared aiohttp session"""
+        import aiohttp
+        from .http_client import http_client
         
         # Prepare request headers
         request_headers = {"User-Agent": "ChasmX-Workflow-Engine/1.0"}
@@ -874,70 +1228,69 @@ Use these functions when you need to coordinate with other nodes in the workflow
             else:
                 data = body_data if isinstance(body_data, (str, bytes)) else str(body_data)
 
-        # Configure timeout
-        timeout_config = aiohttp.ClientTimeout(total=timeout)
-
-        # Execute request
-        async with aiohttp.ClientSession(timeout=timeout_config) as session:
-            async with session.request(
-                method=method,
-                url=url,
-                headers=request_headers,
-                params=params,
-                json=json_data,
-                data=data,
-                auth=auth
-            ) as response:
-                # Read response
-                response_text = ""
-                response_json = None
-                try:
-                    response_text = await response.text()
-                    if response.content_type == "application/json":
-                        response_json = await response.json()
-                except Exception as e:
-                    logger.warning(f"Failed to parse response: {e}")
-
-                return {
-                    "status_code": response.status,
-                    "headers": dict(response.headers),
-                    "text": response_text,
-                    "json": response_json,
-                    "content_type": response.content_type,
-                    "size": len(response_text),
-                    "url": str(response.url)
-                }
+        # Execute request over the shared connection pool (keep-alive across calls and retries)
+        return await http_client.request(
+            method,
+            url,
+            headers=request_headers,
+            params=params,
+            json=json_data,
+            data=data,
+            auth=auth,
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        )
 
     def _interpolate_dict_values(self, data: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """Recursively interpolate dictionary values"""
-        result = {}
-        for key, value in data.items():
-            if isinstance(value, str):
-                result[key] = self._interpolate_variables(value, context)
-            elif isinstance(value, dict):
-                result[key] = self._interpolate_dict_values(value, context)
-            elif isinstance(value, list):
-                result[key] = [
-                    self._interpolate_variables(item, context) if isinstance(item, str) else item
-                    for item in value
-                ]
-            else:
-                result[key] = value
-        return result
+        return render_value(data, context)
 
     async def _execute_filter_node(self, node: Node, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute filter node - filters data based on conditions"""
+        """
+        Execute filter node - filters data based on conditions.
+
+        With a ``source`` (node ID, variable name or expression yielding a
+        list) the condition is applied to every item and the matching items
+        are output. Without one, the condition is evaluated once against the
+        run context and the output is whether it passed. When nothing passes,
+        downstream nodes are halted (skipped) unless reached another way.
+        A streamed source is filtered batch by batch, and streamed on when
+        the filter itself streams.
+        """
         try:
             condition = node.config.get("condition", "true")
+            expression = compile_expression(condition)
 
             logger.info(f"Filter Node: Evaluating condition")
 
-            # TODO: Implement safe condition evaluation
-            # For now, pass through
+            source = node.config.get("source")
+            if source is None:
+                passed = expression.test(context)
+                return {
+                    "status": "completed",
+                    "output": passed,
+                    "passed": passed,
+                    "halt": not passed,
+                    "condition": condition,
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+
+            items = self._resolve_source(source, context)
+            if isinstance(items, RecordStream):
+                return await self._filter_stream(node, expression, items, context)
+            if not isinstance(items, list):
+                raise ValueError(f"Filter source '{source}' is not a list")
+
+            kept, vectorized = expression.filter(items, context)
+            logger.info(f"Filter Node: kept {len(kept)}/{len(items)} items (vectorized: {vectorized})")
 
             return {
                 "status": "completed",
-                "output": "Filter passed",
+                "output": kept,
+                "passed": bool(kept),
+                "halt": not kept,
+                "input_count": len(items),
+                "output_count": len(kept),
+                "vectorized": vectorized,
                 "condition": condition,
                 "timestamp": datetime.utcnow().isoformat()
             }
@@ -950,19 +1303,85 @@ Use these functions when you need to coordinate with other nodes in the workflow
                 "timestamp": datetime.utcnow().isoformat()
             }
 
+    async def _filter_stream(
+        self,
+        node: Node,
+        expression,
+        stream: RecordStream,
+        context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Filter a streamed source batch by batch"""
+        condition = node.config.get("condition", "true")
+
+        if self._streams_output(node):
+            filtered = self._open_stream(stream.pipe(lambda batch: expression.filter(batch, context)[0]))
+            return {
+                "status": "completed",
+                "output": filtered,
+                "streamed": True,
+                "condition": condition,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+
+        kept: List[Any] = []
+        input_count = 0
+        vectorized = False
+        async for batch in stream.iter_batches():
+            batch_kept, batch_vectorized = expression.filter(batch, context)
+            kept.extend(batch_kept)
+            input_count += len(batch)
+            vectorized = vectorized or batch_vectorized
+
+        logger.info(f"Filter Node: kept {len(kept)}/{input_count} streamed items (vectorized: {vectorized})")
+        return {
+            "status": "completed",
+            "output": kept,
+            "passed": bool(kept),
+            "halt": not kept,
+            "input_count": input_count,
+            "output_count": len(kept),
+            "vectorized": vectorized,
+            "condition": condition,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
     async def _execute_transformer_node(self, node: Node, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute transformer node - transforms data structure"""
+        """
+        Execute transformer node - transforms data structure.
+
+        Applies ``operations`` (or a single ``transform_type`` operation whose
+        parameters live in the node config) to the list output named by
+        ``source``. See execution.transformer for the supported operations.
+        """
         try:
             transform_type = node.config.get("transform_type", "map")
+            operations = node.config.get("operations") or [{**node.config, "op": transform_type}]
 
-            logger.info(f"Transformer Node: Applying {transform_type} transformation")
+            logger.info(f"Transformer Node: Applying {[op.get('op') for op in operations]} transformation")
 
-            # TODO: Implement data transformation logic
+            source = node.config.get("source")
+            if source is None:
+                raise ValueError("Transformer node requires a 'source'")
+
+            records = self._resolve_source(source, context)
+            if not isinstance(records, list):
+                raise ValueError(f"Transformer source '{source}' is not a list")
+
+            # Columnar work is CPU-bound; keep it off the event loop
+            output = await asyncio.to_thread(
+                apply_transforms,
+                records,
+                operations,
+                context,
+                lambda name: self._resolve_source(name, context)
+            )
 
             return {
                 "status": "completed",
-                "output": "Data transformed",
-                "transform_type": transform_type,
+                "output": output,
+                "transform_type": transform_type if not node.config.get("operations") else "pipeline",
+                "input_count": len(records),
+                "output_count": len(output),
                 "timestamp": datetime.utcnow().isoformat()
             }
 
@@ -981,12 +1400,15 @@ Use these functions when you need to coordinate with other nodes in the workflow
 
             logger.info(f"Condition Node: Evaluating branching logic")
 
-            # TODO: Implement condition evaluation and branching
+            result = compile_expression(condition).test(context)
 
+            # Outgoing edges labelled with the chosen branch are followed, the others pruned
             return {
                 "status": "completed",
-                "output": "Condition evaluated",
-                "result": True,
+                "output": result,
+                "result": result,
+                "branch": "true" if result else "false",
+                "condition": condition,
                 "timestamp": datetime.utcnow().isoformat()
             }
 
@@ -999,13 +1421,43 @@ Use these functions when you need to coordinate with other nodes in the workflow
             }
 
     async def _execute_delay_node(self, node: Node, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute delay node - waits for specified duration"""
+        """
+        Execute delay node - waits for specified duration.
+
+        Delays up to DELAY_INLINE_MAX seconds sleep in process. Longer ones
+        park the run instead of pinning it in memory: the node records its
+        wake-up time and returns with ``park`` set, which holds back its
+        downstream nodes, and the run is persisted as waiting once nothing
+        else can progress. When the timer service requeues the run, the node
+        finds its recorded wake-up time and completes. Delays inside map
+        bodies always sleep in process.
+        """
         try:
             delay_seconds = node.config.get("delay_seconds", 1)
 
-            logger.info(f"Delay Node: Waiting {delay_seconds}s")
+            run_context = get_current_context()
+            state = (run_context.run.node_states or {}).get(node.id) if run_context else None
+            if isinstance(state, dict) and state.get("status") == "waiting" and state.get("wake_at"):
+                wake_at = datetime.fromisoformat(state["wake_at"])
+            else:
+                wake_at = datetime.utcnow() + timedelta(seconds=float(delay_seconds))
+            remaining = (wake_at - datetime.utcnow()).total_seconds()
+
+            if remaining > settings.DELAY_INLINE_MAX and self._can_park(node):
+                logger.info(f"Delay Node: Parking run until {wake_at.isoformat()}")
+                run_context.wake_at = min(run_context.wake_at or wake_at, wake_at)
+                return {
+                    "status": "waiting",
+                    "output": None,
+                    "park": True,
+                    "wake_at": wake_at.isoformat(),
+                    "delay_seconds": delay_seconds,
+                    "timestamp": datetime.utcnow().isoformat()
+                }
 
-            await asyncio.sleep(delay_seconds)
+            if remaining > 0:
+                logger.info(f"Delay Node: Waiting {remaining:.1f}s")
+                await asyncio.sleep(remaining)
 
             return {
                 "status": "completed",
@@ -1022,6 +1474,13 @@ Use these functions when you need to coordinate with other nodes in the workflow
                 "timestamp": datetime.utcnow().isoformat()
             }
 
+    def _can_park(self, node: Node) -> bool:
+        """Whether a delay node may park its run (top-level nodes of a run only)"""
+        run_context = get_current_context()
+        if run_context is None:
+            return False
+        return not any(node.id in body for body in run_context.map_bodies.values())
+
     async def _execute_end_node(self, node: Node, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute end node - marks workflow completion"""
         return {
@@ -1030,34 +1489,216 @@ Use these functions when you need to coordinate with other nodes in the workflow
             "timestamp": datetime.utcnow().isoformat()
         }
 
-    def _interpolate_variables(self, template: str, context: Dict[str, Any]) -> str:
+    async def _execute_map_node(self, node: Node, context: Dict[str, Any], run: WorkflowRun) -> Dict[str, Any]:
         """
-        Replace variable placeholders in template with actual values.
-
-        Supports: {{variable_name}} and {{outputs.node_id}}
+        Execute map node - runs its body sub-graph once per item of a list.
+
+        The body is every node reachable through the map node's ``each``
+        edges (see execution.fanout). Each item runs in its own child context
+        where the item and its position are bound to the ``item_variable``
+        and ``index_variable`` variables, so body templates can reference
+        e.g. {{item.email}}. Items run concurrently, bounded by
+        ``concurrency``. The output is the list of per-item results: the
+        output of the body's last node (or of the ``collect`` node IDs),
+        in input order unless ``ordered`` is false. A failed item is listed
+        in ``errors`` (and is None in ordered output) unless ``fail_fast``
+        is set, in which case the remaining items are cancelled. A streamed
+        source is consumed as items arrive, only as fast as workers free up.
+        Body nodes are bounded per item by their ``node_timeout``; the map
+        node as a whole only if it sets one.
         """
-        if not template:
-            return ""
+        try:
+            run_context = get_current_context() or self.active_contexts.get(run.execution_id)
+            if run_context is None:
+                raise ValueError("Map node requires an active workflow run")
+
+            source = node.config.get("source")
+            if source is None:
+                raise ValueError("Map node requires a 'source'")
+            items = self._resolve_source(source, context)
+            if not isinstance(items, (list, RecordStream)):
+                raise ValueError(f"Map source '{source}' is not a list")
+
+            body_ids = run_context.map_bodies.get(node.id, set())
+            if not body_ids:
+                raise ValueError(f"Map node {node.id} has no 'each' edges")
+
+            scheduler = run_context.plan.body_schedulers[node.id]
+            body_nodes = scheduler.order
+
+            collect = node.config.get("collect")
+            if collect is None:
+                collect = [body_node.id for body_node in scheduler.order if not scheduler.successors[body_node.id]]
+            elif isinstance(collect, str):
+                collect = [collect]
+
+            concurrency = max(1, int(node.config.get("concurrency", 5)))
+            ordered = node.config.get("ordered", True)
+            fail_fast = node.config.get("fail_fast", False)
+            item_variable = node.config.get("item_variable", "item")
+            index_variable = node.config.get("index_variable", "index")
+
+            logger.info(
+                f"Map Node: {'streamed' if isinstance(items, RecordStream) else len(items)} items "
+                f"over {len(body_nodes)} body nodes (concurrency: {concurrency})"
+            )
+
+            indexed: Dict[int, Any] = {}
+            completion_order: List[Any] = []
+            errors: List[Dict[str, Any]] = []
+            iterations = {body_node.id: 0 for body_node in body_nodes}
+
+            # Workers pull the next item only when free (backpressure on streams)
+            source_items = iter_items(items)
+            source_lock = asyncio.Lock()
+            count = 0
+
+            async def next_item():
+                nonlocal count
+                async with source_lock:
+                    try:
+                        item = await source_items.__anext__()
+                    except StopAsyncIteration:
+                        return None
+                    count += 1
+                    return count - 1, item
+
+            async def run_item(index: int, item: Any):
+                child = {
+                    **context,
+                    "variables": {**context.get("variables", {}), item_variable: item, index_variable: index},
+                    "outputs": dict(context.get("outputs", {}))
+                }
+                await scheduler.run(
+                    lambda body_node: self._run_map_item_node(body_node, child, run, index, iterations)
+                )
+                if len(collect) == 1:
+                    return child["outputs"].get(collect[0])
+                return {node_id: child["outputs"].get(node_id) for node_id in collect}
+
+            async def worker():
+                while True:
+                    entry = await next_item()
+                    if entry is None:
+                        return
+                    index, item = entry
+                    try:
+                        value = await run_item(index, item)
+                    except Exception as e:
+                        if fail_fast:
+                            raise
+                        errors.append({"index": index, "error": str(e)})
+                        continue
+                    indexed[index] = value
+                    completion_order.append(value)
+
+            workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                for task in workers:
+                    task.cancel()
+
+            results = [indexed.get(index) for index in range(count)] if ordered else completion_order
+
+            # One summary state per body node; per-item states would overwrite each other
+            writer = self._run_writer(run)
+            failed_indexes = {error["index"] for error in errors}
+            for body_id, body_count in iterations.items():
+                state = {
+                    "status": "completed",
+                    "map_node": node.id,
+                    "iterations": body_count,
+                    "failed": len(failed_indexes),
+                    "config_hash": config_hash(run_context.node_registry[body_id]),
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+                run.node_states[body_id] = state
+                if writer:
+                    writer.set_node_state(body_id, state)
+
+            errors.sort(key=lambda error: error["index"])
+
+            return {
+                "status": "completed",
+                "output": results,
+                "items": count,
+                "succeeded": count - len(errors),
+                "failed": len(errors),
+                "errors": errors,
+                "ordered": ordered,
+                "timestamp": datetime.utcnow().isoformat()
+            }
 
-        result = template
+        except Exception as e:
+            logger.error(f"Map node execution failed: {str(e)}")
+            return {
+                "status": "error",
+                "error": str(e),
+                "timestamp": datetime.utcnow().isoformat()
+            }
 
-        # Replace workflow variables
-        for key, value in context.get("variables", {}).items():
-            placeholder = f"{{{{{key}}}}}"
-            result = result.replace(placeholder, str(value))
+    async def _run_map_item_node(
+        self,
+        node: Node,
+        context: Dict[str, Any],
+        run: WorkflowRun,
+        index: int,
+        iterations: Dict[str, int]
+    ) -> Dict[str, Any]:
+        """Execute one body node for one map item; an error result fails the item"""
+        try:
+            result = await asyncio.wait_for(
+                self._execute_node(node, context, run),
+                timeout=node.config.get("node_timeout", self.node_timeout)
+            )
+        except asyncio.TimeoutError:
+            raise WorkflowExecutionError(f"Node {node.id} timed out for item {index}")
 
-        # Replace node outputs
-        for node_id, output in context.get("outputs", {}).items():
-            placeholder = f"{{{{outputs.{node_id}}}}}"
-            result = result.replace(placeholder, str(output))
+        iterations[node.id] += 1
+        if result.get("status") == "error":
+            error_msg = f"Node {node.id} failed for item {index}: {result.get('error')}"
+            await self._add_error(run, node.id, error_msg)
+            raise WorkflowExecutionError(error_msg)
 
+        context["outputs"][node.id] = result.get("output")
         return result
 
+    def _resolve_source(self, source: str, context: Dict[str, Any]) -> Any:
+        """Resolve a data source reference: node ID, variable name or expression"""
+        outputs = context.get("outputs", {})
+        if source in outputs:
+            return outputs[source]
+
+        variables = context.get("variables", {})
+        if source in variables:
+            return variables[source]
+
+        return compile_expression(source).evaluate(context)
+
+    def _interpolate_variables(self, template: str, context: Dict[str, Any]) -> str:
+        """
+        Replace variable placeholders in template with actual values.
+
+        Supports: {{variable_name}}, {{outputs.node_id}} and dotted paths
+        such as {{outputs.node_id.field}} (see execution.templates)
+        """
+        return render_template(template, context)
+
+    def _run_writer(self, run: WorkflowRun) -> Optional[RunStateWriter]:
+        """Get the write-behind writer of an active run"""
+        run_context = self.active_contexts.get(run.execution_id)
+        return run_context.writer if run_context else None
+
     async def _add_log(self, run: WorkflowRun, node_id: str, message: str):
-        """Add log entry to workflow run"""
+        """Append a log event to the workflow run"""
+        writer = self._run_writer(run)
+        if writer:
+            writer.append_event(RunEventKind.LOG, node_id, {"message": message})
+            return
+
         if run.logs is None:
             run.logs = []
-
         run.logs.append({
             "timestamp": datetime.utcnow().isoformat(),
             "node_id": node_id,
@@ -1065,10 +1706,15 @@ Use these functions when you need to coordinate with other nodes in the workflow
         })
 
     async def _add_error(self, run: WorkflowRun, node_id: str, error: str):
-        """Add error entry to workflow run"""
+        """Append an error event to the workflow run"""
+        writer = self._run_writer(run)
+        if writer:
+            writer.append_event(RunEventKind.ERROR, node_id, {"error": error})
+            return
+
+        # Run failed before its context existed; keep the error on the document
         if run.errors is None:
             run.errors = []
-
         run.errors.append({
             "timestamp": datetime.utcnow().isoformat(),
             "node_id": node_id,
@@ -1095,16 +1741,19 @@ Use these functions when you need to coordinate with other nodes in the workflow
             content: Message content
             metadata: Optional metadata about the communication
         """
-        if self.current_run and self.current_run.communication_log is not None:
-            log_entry = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "from_node": from_node,
-                "to_node": to_node,
-                "type": message_type,
-                "content": content,
-                "metadata": metadata or {}
-            }
-            self.current_run.communication_log.append(log_entry)
+        run_context = self.current_context
+        if run_context:
+            run_context.writer.append_event(
+                RunEventKind.COMMUNICATION,
+                from_node,
+                {
+                    "from_node": from_node,
+                    "to_node": to_node,
+                    "type": message_type,
+                    "content": content,
+                    "metadata": metadata or {}
+                }
+            )
             logger.info(f"Communication logged: {from_node} -> {to_node} ({message_type})")
 
     async def ask_node(
@@ -1502,20 +2151,24 @@ Use these functions when you need to coordinate with other nodes in the workflow
             target_agent_id = message.to_agent
             target_node_id = None
 
-            # Find node ID from agent ID
-            execution_id = self.execution_context.get("execution_id") if self.execution_context else None
-            if execution_id and execution_id in self.active_agents:
-                for node_id, agent_id in self.active_agents[execution_id].items():
+            # Find node ID from agent ID. Handlers run on the message bus
+            # listener, so locate the owning run instead of using the current one.
+            run_context = None
+            for execution_id, agents in self.active_agents.items():
+                for node_id, agent_id in agents.items():
                     if agent_id == target_agent_id:
                         target_node_id = node_id
+                        run_context = self.active_contexts.get(execution_id)
                         break
+                if target_node_id:
+                    break
 
-            if not target_node_id:
+            if not target_node_id or not run_context:
                 logger.warning(f"Could not find node for agent {target_agent_id}")
                 return
 
             # Get the target node
-            target_node = self.node_registry.get(target_node_id)
+            target_node = run_context.node_registry.get(target_node_id)
             if not target_node:
                 logger.error(f"Target node {target_node_id} not found")
                 return
@@ -1,11 +1,11 @@
 """Email sending utilities."""
 
-import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from loguru import logger
 
 from app.core.config import settings
+from app.services.smtp_pool import smtp_pool
 
 async def send_otp_email(to_email: str, otp_code: str) -> bool:
     """Send OTP code via email.
@@ -37,27 +37,18 @@ async def send_otp_email(to_email: str, otp_code: str) -> bool:
     
     message.attach(MIMEText(body, "plain"))
     
+    # SSL (port 465) or STARTTLS (port 587), over a pooled session
+    smtp_config = {
+        "hostname": settings.SMTP_HOST,
+        "port": settings.SMTP_PORT,
+        "username": settings.SMTP_USER,
+        "password": settings.SMTP_PASSWORD,
+        "use_ssl": settings.SMTP_SSL,
+        "use_tls": not settings.SMTP_SSL
+    }
+
     try:
-        if settings.SMTP_SSL:
-            # Use SSL (port 465)
-            await aiosmtplib.send(
-                message,
-                hostname=settings.SMTP_HOST,
-                port=settings.SMTP_PORT,
-                username=settings.SMTP_USER,
-                password=settings.SMTP_PASSWORD,
-                use_tls=True
-            )
-        else:
-            # Use STARTTLS (port 587)
-            await aiosmtplib.send(
-                message,
-                hostname=settings.SMTP_HOST,
-                port=settings.SMTP_PORT,
-                username=settings.SMTP_USER,
-                password=settings.SMTP_PASSWORD,
-                start_tls=True
-            )
+        await smtp_pool.send(message, smtp_config)
         logger.info(f"OTP email sent to {to_email}")
         return True
         
@@ -0,0 +1,199 @@
+"""Standalone workflow execution worker.
+
+Consumes queued WorkflowRun jobs from the Redis Stream consumer group and
+executes them with WorkflowExecutor, independently of the API process. Run
+as many workers as needed across cores and hosts; entries left unacknowledged
+by a crashed worker are claimed again by the remaining ones.
+
+Usage:
+    RUN_QUEUE_BACKEND=redis-stream python -m app.worker
+"""
+
+import asyncio
+import signal
+import time
+from typing import Dict
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import connect_to_mongo, close_mongo_connection
+from app.services.ai_service_manager import ai_service_manager
+from app.services.run_queue import run_queue
+from app.services.http_client import http_client
+from app.services.smtp_pool import smtp_pool
+from app.services.run_stream import RunStream
+from app.services.timer_service import timer_service
+
+
+class StreamWorker:
+    """Executes runs read from the run stream with bounded concurrency"""
+
+    def __init__(
+        self,
+        stream: RunStream,
+        concurrency: int = settings.RUN_QUEUE_WORKERS,
+        claim_idle_ms: int = settings.RUN_STREAM_CLAIM_IDLE_MS,
+        block_ms: int = 2000,
+        drain_timeout: float = settings.RUN_QUEUE_DRAIN_TIMEOUT
+    ):
+        """
+        Initialize stream worker.
+
+        Args:
+            stream: Connected run stream
+            concurrency: Maximum number of runs executed at once
+            claim_idle_ms: Idle time after which another worker's entries are reclaimed
+            block_ms: Milliseconds to block waiting for new entries
+            drain_timeout: Seconds in-flight runs may finish after stop()
+        """
+        self.stream = stream
+        self.concurrency = max(1, concurrency)
+        self.claim_idle_ms = claim_idle_ms
+        self.block_ms = block_ms
+        self.drain_timeout = drain_timeout
+        self.consumer = run_queue.node_id
+        self._in_flight: Dict[str, asyncio.Task] = {}  # entry_id -> task
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """Stop reading new entries; in-flight runs may finish within the drain timeout"""
+        logger.info(f"Worker {self.consumer} stopping")
+        self._stopping.set()
+
+    async def _handle(self, entry_id: str, fields: Dict[str, str], reclaimed: bool):
+        """Claim and execute the run referenced by a stream entry"""
+        execution_id = fields.get("execution_id")
+        try:
+            run = await run_queue.claim_run(execution_id, self.consumer, reclaim=reclaimed)
+            if run:
+                logger.info(f"Worker {self.consumer} executing run {execution_id} (reclaimed: {reclaimed})")
+                await run_queue.process(run)
+            elif reclaimed and await run_queue.is_running(execution_id):
+                # Still heartbeating (a slow worker, or a requeued copy running
+                # elsewhere); keep the entry pending and look again later
+                logger.info(f"Run {execution_id} is still running elsewhere, leaving entry pending")
+                return
+            else:
+                logger.info(f"Run {execution_id} already claimed or finished, skipping")
+
+            await self.stream.ack(entry_id)
+
+        except Exception as e:
+            # Leave the entry pending so it is reclaimed later
+            logger.error(f"Worker {self.consumer} failed to process run {execution_id}: {e}")
+
+        finally:
+            self._in_flight.pop(entry_id, None)
+
+    def _spawn(self, entries, reclaimed: bool):
+        for entry_id, fields in entries:
+            if entry_id not in self._in_flight:
+                self._in_flight[entry_id] = asyncio.create_task(
+                    self._handle(entry_id, fields, reclaimed)
+                )
+
+    async def _heartbeat_loop(self):
+        """Keep in-flight entries from looking abandoned to other workers"""
+        interval = max(1.0, self.claim_idle_ms / 3000)
+        while not self._stopping.is_set():
+            await asyncio.sleep(interval)
+            try:
+                await self.stream.heartbeat(self.consumer, list(self._in_flight))
+                await run_queue.heartbeat()
+            except Exception as e:
+                logger.warning(f"Worker {self.consumer} heartbeat failed: {e}")
+
+    async def run(self):
+        """Main loop: reclaim abandoned entries, read new ones, execute them"""
+        logger.info(f"Worker {self.consumer} started (concurrency: {self.concurrency})")
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        claim_interval = self.claim_idle_ms / 1000
+        last_claim = 0.0
+
+        try:
+            while not self._stopping.is_set():
+                free = self.concurrency - len(self._in_flight)
+                if free <= 0:
+                    await asyncio.wait(
+                        list(self._in_flight.values()),
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                    continue
+
+                try:
+                    # Take over entries from workers that stopped heartbeating
+                    if time.monotonic() - last_claim >= claim_interval:
+                        last_claim = time.monotonic()
+                        stale = await self.stream.claim_stale(self.consumer, self.claim_idle_ms, free)
+                        self._spawn(stale, reclaimed=True)
+                        free -= len(stale)
+
+                    if free > 0:
+                        entries = await self.stream.read(self.consumer, free, self.block_ms)
+                        self._spawn(entries, reclaimed=False)
+
+                except Exception as e:
+                    logger.error(f"Worker {self.consumer} failed to read run stream: {e}")
+                    await asyncio.sleep(1)
+
+            # Let in-flight runs finish before exiting; interrupted runs are
+            # checkpointed as resumable and their entries stay pending
+            if self._in_flight:
+                logger.info(f"Worker {self.consumer} draining {len(self._in_flight)} in-flight runs")
+                _, pending = await asyncio.wait(list(self._in_flight.values()), timeout=self.drain_timeout)
+                if pending:
+                    logger.warning(f"Worker {self.consumer} interrupting {len(pending)} runs after the drain timeout")
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+            logger.info(f"Worker {self.consumer} stopped")
+
+
+async def main():
+    """Connect services and run the worker until SIGINT/SIGTERM"""
+    await connect_to_mongo()
+    logger.info("Worker: MongoDB connected")
+
+    await ai_service_manager.initialize()
+    logger.info("Worker: AI services initialized")
+
+    stream = RunStream(
+        redis_url=settings.redis_connection_url,
+        stream_key=settings.RUN_STREAM_KEY,
+        group=settings.RUN_STREAM_GROUP
+    )
+    await stream.connect()
+
+    # Requeue runs interrupted or abandoned by previous worker processes
+    await run_queue.recover(stream)
+
+    # Index runs parked here and wake due ones (shared sorted set, claimed once)
+    await timer_service.start(wake=lambda execution_id: run_queue.wake(execution_id, stream))
+
+    worker = StreamWorker(stream)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await timer_service.stop()
+        await stream.disconnect()
+        await http_client.close()
+        await smtp_pool.close()
+
+        await ai_service_manager.shutdown()
+        logger.info("Worker: AI services closed")
+
+        await close_mongo_connection()
+        logger.info("Worker: MongoDB connection closed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""
+Test cases for data dependencies inferred from template and expression references.
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from datetime import datetime
+
+from app.models.workflow import Node, Edge, ExecutionStatus
+from app.services.execution.plan import compile_plan
+from app.services.workflow_executor import WorkflowExecutor
+
+
+def make_node(node_id, node_type="transformer", **config):
+    return Node(id=node_id, type=node_type, position={"x": 0, "y": 0}, config=config)
+
+
+def make_workflow(nodes, edges, **metadata):
+    return SimpleNamespace(
+        id="wf-deps",
+        name="Dependencies",
+        metadata=metadata or None,
+        nodes=nodes,
+        edges=[Edge(**{"from": source, "to": target, "branch": branch}) for source, target, branch in edges]
+    )
+
+
+class TestDependencyInference:
+    """Reads without an edge are ordered; unsatisfiable reads are reported"""
+
+    def test_missing_edges_are_inferred(self):
+        workflow = make_workflow(
+            [
+                make_node("notify", "end", message="{{outputs.score.total}}"),
+                make_node("check", "condition", condition='outputs["score"] > 3'),
+                make_node("score", "transformer"),
+                make_node("start", "start"),
+            ],
+            [("start", "score", None), ("start", "notify", None)]
+        )
+
+        plan = compile_plan(workflow)
+
+        assert {(edge.from_, edge.to) for edge in plan.inferred_edges} == {("score", "notify"), ("score", "check")}
+        order = [node.id for node in plan.order]
+        assert order.index("score") < order.index("notify")
+        assert plan.readers["score"] == {"notify", "check"}
+
+        disabled = compile_plan(make_workflow(workflow.nodes, [("start", "score", None)], infer_dependencies=False))
+        assert disabled.inferred_edges == []
+
+    def test_conflicts_are_warned(self):
+        workflow = make_workflow(
+            [
+                make_node("fetch", "data-source"),
+                make_node("loop", "map", source="fetch"),
+                make_node("enrich", "transformer"),
+                make_node("report", "end", body="{{outputs.enrich}} {{outputs.later}} {{outputs.ghost.x}}"),
+                make_node("later", "end"),
+            ],
+            [
+                ("fetch", "loop", None), ("loop", "enrich", "each"),
+                ("loop", "report", None), ("report", "later", None),
+            ]
+        )
+
+        plan = compile_plan(workflow)
+
+        assert plan.inferred_edges == []
+        assert any("only exists inside map loop" in warning for warning in plan.warnings)
+        assert any("reads later, which only runs after it" in warning for warning in plan.warnings)
+        assert any("outputs.ghost.x" in warning for warning in plan.warnings)
+
+    def test_second_reader_disables_streaming(self):
+        nodes = [
+            make_node("fetch", "data-source", stream=True),
+            make_node("sink", "filter", source="fetch", condition="true"),
+        ]
+        edges = [("fetch", "sink", None)]
+        assert compile_plan(make_workflow(nodes, edges)).streaming == {"fetch"}
+
+        nodes.append(make_node("count", "end", message="{{outputs.fetch}}"))
+        assert compile_plan(make_workflow(nodes, edges)).streaming == set()
+
+    @pytest.mark.asyncio
+    async def test_consumer_listed_first_sees_producer_output(self):
+        executor = WorkflowExecutor()
+        workflow = make_workflow(
+            [
+                make_node("adults", "filter", source="people", condition="age >= 18"),
+                make_node("people", "transformer", source="users", operations=[{"op": "select", "fields": ["age"]}]),
+            ],
+            []
+        )
+        run = SimpleNamespace(
+            id=None, execution_id="run-deps", status=ExecutionStatus.QUEUED,
+            start_time=datetime.utcnow(), end_time=None, variables={"users": [{"name": "ada", "age": 36}, {"name": "bo", "age": 9}]}, node_states={},
+            logs=[], errors=[], communication_log=[], save=AsyncMock()
+        )
+
+        await executor.execute(workflow, run)
+
+        assert run.status == ExecutionStatus.SUCCESS
+        assert run.node_states["adults"]["output"] == [{"age": 36}]
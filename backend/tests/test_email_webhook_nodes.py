@@ -166,6 +166,39 @@ class TestEmailNode:
             result = await workflow_executor._execute_email_node(node, context)
             assert result["status"] == "error"
 
+    @pytest.mark.asyncio
+    async def test_bulk_email_mail_merge(self):
+        """Test bulk mode sends one personalized email per record"""
+        users = [{"name": f"User {i}", "email": f"user{i}@example.com"} for i in range(10)]
+        users[3]["email"] = ""  # Invalid record
+        node = Node(
+            id="test_bulk",
+            type="email",
+            position={"x": 0, "y": 0},
+            config={
+                "bulk": True,
+                "source": "fetch_users",
+                "item_variable": "user",
+                "to": "{{user.email}}",
+                "subject": "Welcome, {{user.name}}",
+                "body": "Hi {{user.name}}",
+                "per_domain_rate": 0,
+                "retries": 0
+            }
+        )
+        context = {"variables": {}, "outputs": {"fetch_users": users}}
+
+        with patch.object(workflow_executor, '_send_email', new_callable=AsyncMock) as mock_send:
+            result = await workflow_executor._execute_email_node(node, context)
+
+            assert mock_send.call_count == 9
+            subjects = {call.kwargs["to_email"]: call.kwargs["subject"] for call in mock_send.call_args_list}
+            assert subjects["user7@example.com"] == "Welcome, User 7"
+
+        assert result["status"] == "completed"
+        assert (result["sent"], result["failed"], result["total"]) == (9, 1, 10)
+        assert result["errors"][0]["index"] == 3
+
 
 class TestWebhookNode:
     """Test cases for webhook node functionality"""
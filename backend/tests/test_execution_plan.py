@@ -0,0 +1,114 @@
+"""
+Test cases for compiled execution plans and the plan cache.
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from datetime import datetime, timedelta
+
+from app.models.workflow import Node, Edge, ExecutionStatus
+from app.services.execution.plan import (
+    PlanCache,
+    PlanValidationError,
+    compile_plan,
+    plan_cache,
+    validate_workflow
+)
+from app.services.workflow_executor import WorkflowExecutor
+
+
+def make_node(node_id, node_type="start", **config):
+    return Node(id=node_id, type=node_type, position={"x": 0, "y": 0}, config=config)
+
+
+def make_workflow(nodes, edges, workflow_id="wf-plan", updated_at=None):
+    return SimpleNamespace(
+        id=workflow_id,
+        name="Plan",
+        metadata=None,
+        updated_at=updated_at or datetime(2026, 1, 1, 12, 0, 0, 123456),
+        nodes=nodes,
+        edges=[Edge(**{"from": source, "to": target}) for source, target in edges]
+    )
+
+
+def make_run(execution_id):
+    return SimpleNamespace(
+        id=None, execution_id=execution_id, status=ExecutionStatus.QUEUED,
+        start_time=datetime.utcnow(), end_time=None, variables={"name": "ada"}, node_states={},
+        logs=[], errors=[], communication_log=[], save=AsyncMock()
+    )
+
+
+class TestCompilePlan:
+    """Graph validation and precomputed structure"""
+
+    def test_plan_structure(self):
+        workflow = make_workflow(
+            [
+                make_node("start"),
+                make_node("shape", "transformer", template="Hi {{name}} {{outputs.start}}"),
+                make_node("done", "end"),
+                make_node("orphan", "end"),
+            ],
+            [("start", "shape"), ("shape", "done")]
+        )
+
+        plan = compile_plan(workflow)
+
+        assert [node.id for node in plan.order] == ["start", "orphan", "shape", "done"]
+        assert plan.readers["start"] == {"shape"}
+        assert plan.unreachable == ["orphan"]
+        assert plan.errors == [] and plan.warnings
+
+    def test_invalid_graphs_are_rejected(self):
+        cyclic = make_workflow([make_node("a"), make_node("b", "end")], [("a", "b"), ("b", "a")])
+        with pytest.raises(PlanValidationError):
+            compile_plan(cyclic)
+
+        dangling = make_workflow([make_node("a")], [("a", "ghost")])
+        assert compile_plan(dangling).dangling == [("a", "ghost")]
+        with pytest.raises(PlanValidationError) as error:
+            validate_workflow(dangling)
+        assert "ghost" in error.value.errors[0]
+
+
+class TestPlanCache:
+    """Plans are reused per workflow version"""
+
+    def test_keyed_by_version(self):
+        cache = PlanCache(max_size=2)
+        saved = make_workflow([make_node("a")], [])
+        # The copy loaded from MongoDB has its timestamp truncated to milliseconds
+        loaded = make_workflow([make_node("a")], [], updated_at=saved.updated_at.replace(microsecond=123000))
+
+        cache.put(validate_workflow(saved), saved)
+        plan = cache.get(loaded)
+        assert cache.get_stats()["hits"] == 1
+
+        edited = make_workflow([make_node("a")], [], updated_at=saved.updated_at + timedelta(seconds=5))
+        assert cache.get(edited) is not plan
+        assert cache.get_stats()["size"] == 1  # The old version was replaced
+
+        cache.get(make_workflow([make_node("a")], [], workflow_id="wf-2"))
+        cache.get(make_workflow([make_node("a")], [], workflow_id="wf-3"))
+        assert cache.get_stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_repeated_runs_skip_compilation(self):
+        plan_cache.clear()
+        workflow = make_workflow(
+            [make_node("start"), make_node("done", "end")],
+            [("start", "done")],
+            workflow_id="wf-hot"
+        )
+        executor = WorkflowExecutor()
+        hits = plan_cache.get_stats()["hits"]
+
+        for index in range(3):
+            run = make_run(f"run-hot-{index}")
+            await executor.execute(workflow, run)
+            assert run.status == ExecutionStatus.SUCCESS
+
+        assert plan_cache.get_stats()["hits"] - hits == 2
@@ -0,0 +1,142 @@
+"""
+Test cases for the safe expression engine used by filter and condition nodes.
+"""
+
+import pytest
+
+from app.models.workflow import Node
+from app.services.execution.expressions import (
+    ExpressionError,
+    VECTORIZE_MIN_ITEMS,
+    compile_expression
+)
+from app.services.workflow_executor import workflow_executor
+
+
+CONTEXT = {
+    "variables": {"min_age": 18, "dry_run": False, "plans": ["pro", "team"]},
+    "outputs": {"http-1": {"status_code": 200, "json": {"ok": True}}}
+}
+
+
+def make_users(count):
+    return [
+        {"name": f"user{i}", "age": i % 40, "plan": ["free", "pro", "team"][i % 3], "email": f"U{i}@Example.com"}
+        for i in range(count)
+    ]
+
+
+class TestEvaluation:
+    """Scalar evaluation against the run context"""
+
+    def test_conditions(self):
+        assert compile_expression('outputs["http-1"].status_code == 200 and not dry_run').test(CONTEXT)
+        assert compile_expression("variables.min_age > 10 and true").test(CONTEXT)
+        assert not compile_expression("outputs['missing'].status_code == 200").test(CONTEXT)
+        assert compile_expression("len(plans) == 2 and 'pro' in plans").test(CONTEXT)
+
+    def test_expressions_are_cached(self):
+        assert compile_expression("min_age > 1") is compile_expression("min_age > 1")
+
+    @pytest.mark.parametrize("source", [
+        "__import__('os')",
+        "outputs.__class__",
+        "open('/etc/passwd')",
+        "[x for x in plans]",
+        "lambda: 1",
+        "2 ** 1000000",
+        "min_age if",
+    ])
+    def test_unsafe_or_invalid_expressions_are_rejected(self, source):
+        with pytest.raises(ExpressionError):
+            compile_expression(source)
+
+    def test_sequence_repetition_is_bounded(self):
+        with pytest.raises(ExpressionError):
+            compile_expression("'x' * 1000000000").evaluate(CONTEXT)
+        # Each repetition alone is within the limit, the result is not
+        with pytest.raises(ExpressionError):
+            compile_expression("'x' * 100000 * 100000").evaluate(CONTEXT)
+        with pytest.raises(ExpressionError):
+            compile_expression("['x'] * 1000 * 1000").evaluate(CONTEXT)
+        assert compile_expression("'ab' * 3").evaluate(CONTEXT) == "ababab"
+
+
+class TestFilter:
+    """List filters, vectorized and per item"""
+
+    @pytest.mark.parametrize("source", [
+        "age >= min_age and plan in ['pro', 'team']",
+        "item.age < 5 or endswith(lower(email), '1@example.com')",
+        "lower(email) == 'u7@example.com'",
+        "not (age % 2 == 0)",
+    ])
+    def test_vectorized_matches_per_item(self, source):
+        users = make_users(VECTORIZE_MIN_ITEMS * 2)
+        expression = compile_expression(source)
+
+        kept, _ = expression.filter(users, CONTEXT)
+        expected = [user for user in users if expression.test(CONTEXT, user)]
+        assert kept == expected
+
+    def test_vectorized_path_is_used(self):
+        users = make_users(VECTORIZE_MIN_ITEMS)
+        kept, vectorized = compile_expression("age >= min_age").filter(users, CONTEXT)
+        assert vectorized
+        assert all(user["age"] >= 18 for user in kept)
+
+    def test_missing_fields_fall_back_and_are_dropped(self):
+        users = make_users(VECTORIZE_MIN_ITEMS)
+        users[3] = {"name": "no-age"}
+        kept, vectorized = compile_expression("age >= 0").filter(users, CONTEXT)
+        assert not vectorized
+        assert len(kept) == len(users) - 1
+
+    @pytest.mark.parametrize("source", [
+        "item.x * 4 > 0",
+        "x + x > 0",
+        "-y > 0",
+        "x * 2 // 3 > 0",
+    ])
+    def test_integer_overflow_matches_per_item(self, source):
+        items = [{"x": 2 ** 62 + index, "y": -2 ** 63} for index in range(VECTORIZE_MIN_ITEMS * 2)]
+        expression = compile_expression(source)
+
+        kept, vectorized = expression.filter(items, CONTEXT)
+        assert kept == [item for item in items if expression.test(CONTEXT, item)]
+        assert kept == items
+        assert not vectorized
+
+
+class TestFilterAndConditionNodes:
+    """Executor handlers evaluate configured expressions"""
+
+    @pytest.mark.asyncio
+    async def test_filter_node_filters_source_output(self):
+        context = {"variables": {}, "outputs": {"fetch-1": make_users(10)}}
+        node = Node(id="f1", type="filter", position={"x": 0, "y": 0},
+                    config={"source": "fetch-1", "condition": "plan == 'pro'"})
+
+        result = await workflow_executor._execute_filter_node(node, context)
+
+        assert result["status"] == "completed"
+        assert [user["plan"] for user in result["output"]] == ["pro"] * 3
+        assert result["input_count"] == 10
+
+    @pytest.mark.asyncio
+    async def test_condition_node_evaluates_condition(self):
+        node = Node(id="c1", type="condition", position={"x": 0, "y": 0},
+                    config={"condition": "outputs['http-1'].json.ok"})
+
+        result = await workflow_executor._execute_condition_node(node, CONTEXT)
+
+        assert result["result"] is True
+
+    @pytest.mark.asyncio
+    async def test_invalid_condition_reports_error(self):
+        node = Node(id="c2", type="condition", position={"x": 0, "y": 0},
+                    config={"condition": "__import__('os')"})
+
+        result = await workflow_executor._execute_condition_node(node, CONTEXT)
+
+        assert result["status"] == "error"
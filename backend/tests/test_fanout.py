@@ -0,0 +1,162 @@
+"""
+Test cases for map (fan-out) nodes.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from datetime import datetime
+
+from app.models.workflow import Node, Edge, ExecutionStatus
+from app.services.execution.fanout import find_map_bodies, plan_level
+from app.services.workflow_executor import WorkflowExecutor
+
+
+def make_node(node_id, node_type, **config):
+    return Node(id=node_id, type=node_type, position={"x": 0, "y": 0}, config=config)
+
+
+def make_edge(source, target, branch=None):
+    return Edge(**{"from": source, "to": target, "branch": branch})
+
+
+def make_workflow(nodes, edges):
+    return SimpleNamespace(id="wf-map", name="Map workflow", nodes=nodes, edges=edges, metadata=None)
+
+
+def make_run(variables):
+    return SimpleNamespace(
+        id=None,
+        execution_id="run-map",
+        status=ExecutionStatus.QUEUED,
+        start_time=datetime.utcnow(),
+        end_time=None,
+        variables=variables,
+        node_states={},
+        logs=[],
+        errors=[],
+        communication_log=[],
+        save=AsyncMock()
+    )
+
+
+def map_workflow(condition, **map_config):
+    return make_workflow(
+        [
+            make_node("start", "start"),
+            make_node("each-number", "map", source="numbers", **map_config),
+            make_node("check", "condition", condition=condition),
+            make_node("end", "end")
+        ],
+        [
+            make_edge("start", "each-number"),
+            make_edge("each-number", "check", "each"),
+            make_edge("each-number", "end")
+        ]
+    )
+
+
+class TestPlanning:
+    """Map bodies are scheduled by their map node, not the enclosing level"""
+
+    def test_body_is_hidden_and_dependencies_are_hoisted(self):
+        nodes = [make_node(node_id, "end") for node_id in ("fetch", "config", "a", "b", "done")]
+        nodes.insert(1, make_node("map", "map"))
+        edges = [
+            make_edge("fetch", "map"),
+            make_edge("map", "a", "each"),
+            make_edge("a", "b"),
+            make_edge("config", "b"),
+            make_edge("map", "done")
+        ]
+
+        bodies = find_map_bodies(nodes, edges)
+        assert bodies == {"map": {"a", "b"}}
+
+        top_nodes, top_edges = plan_level(nodes, edges, bodies)
+        assert [node.id for node in top_nodes] == ["fetch", "map", "config", "done"]
+        assert {(edge.from_, edge.to) for edge in top_edges} == {
+            ("fetch", "map"), ("map", "done"), ("config", "map")
+        }
+
+        body_nodes, body_edges = plan_level(nodes, edges, bodies, level=bodies["map"])
+        assert [node.id for node in body_nodes] == ["a", "b"]
+        assert [(edge.from_, edge.to) for edge in body_edges] == [("a", "b")]
+
+    def test_overlapping_sibling_bodies_are_rejected(self):
+        nodes = [make_node("m1", "map"), make_node("m2", "map"), make_node("shared", "end")]
+        edges = [make_edge("m1", "shared", "each"), make_edge("m2", "shared", "each")]
+
+        with pytest.raises(ValueError):
+            find_map_bodies(nodes, edges)
+
+
+class TestMapNode:
+    """Executor runs the body once per item"""
+
+    @pytest.mark.asyncio
+    async def test_results_follow_input_order(self):
+        executor = WorkflowExecutor()
+        run = make_run({"numbers": [1, 5, 2, 7]})
+
+        await executor.execute(map_workflow("item > 3 and index > 0"), run)
+
+        state = run.node_states["each-number"]
+        assert state["output"] == [False, True, False, True]
+        assert state["succeeded"] == 4
+        assert run.node_states["check"]["iterations"] == 4
+        assert run.node_states["end"]["status"] == "completed"
+        assert run.status == ExecutionStatus.SUCCESS
+
+    @pytest.mark.asyncio
+    async def test_failed_items_are_reported(self):
+        executor = WorkflowExecutor()
+        run = make_run({"numbers": [1, 0, 8]})
+
+        await executor.execute(map_workflow("10 / item > 2", ordered=False), run)
+
+        state = run.node_states["each-number"]
+        assert sorted(state["output"]) == [False, True]
+        assert state["failed"] == 1
+        assert state["errors"][0]["index"] == 1
+
+    @pytest.mark.asyncio
+    async def test_totals_count_every_item_on_partial_failure(self):
+        executor = WorkflowExecutor()
+        workflow = map_workflow("10 / item > 2")
+        workflow.nodes.append(make_node("record", "end"))
+        workflow.edges.append(make_edge("check", "record"))
+        run = make_run({"numbers": [1, 0, 0, 0]})
+
+        await executor.execute(workflow, run)
+
+        state = run.node_states["each-number"]
+        assert (state["items"], state["succeeded"], state["failed"]) == (4, 1, 3)
+        assert run.node_states["record"]["iterations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        executor = WorkflowExecutor()
+        running = 0
+        peak = 0
+
+        async def slow_node(node, context):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"status": "completed", "output": context["variables"]["item"] * 2}
+
+        executor._execute_delay_node = slow_node
+        workflow = make_workflow(
+            [make_node("map", "map", source="numbers", concurrency=3), make_node("double", "delay")],
+            [make_edge("map", "double", "each")]
+        )
+        run = make_run({"numbers": list(range(10))})
+
+        await executor.execute(workflow, run)
+
+        assert run.node_states["map"]["output"] == [n * 2 for n in range(10)]
+        assert peak == 3
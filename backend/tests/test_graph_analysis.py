@@ -0,0 +1,67 @@
+"""
+Test cases for static workflow graph analysis.
+"""
+
+from types import SimpleNamespace
+
+from app.models.workflow import Node, Edge
+from app.services.execution.plan import compile_plan
+from app.services.execution.analysis import analyze_plan, estimate_durations
+
+
+def make_node(node_id, node_type="transformer", **config):
+    return Node(id=node_id, type=node_type, position={"x": 0, "y": 0}, config=config)
+
+
+def make_plan(nodes, edges):
+    return compile_plan(SimpleNamespace(
+        nodes=nodes,
+        edges=[Edge(**{"from": source, "to": target}) for source, target in edges]
+    ))
+
+
+class TestGraphAnalysis:
+    """Widths, critical path and latency estimates"""
+
+    PLAN = make_plan(
+        [
+            make_node("start", "start"),
+            make_node("summarize", "ai-processor"),
+            make_node("translate", "ai-processor"),
+            make_node("lookup", "webhook"),
+            make_node("wait", "delay", delay_seconds=2),
+            make_node("done", "end"),
+            make_node("stray", "end"),
+        ],
+        [
+            ("start", "summarize"), ("start", "translate"), ("start", "lookup"),
+            ("summarize", "done"), ("translate", "done"), ("lookup", "wait"), ("wait", "done"),
+        ]
+    )
+
+    def test_durations_fall_back_from_node_to_type_to_default(self):
+        history = [
+            {"summarize": {"duration_ms": 900}, "lookup": {"duration_ms": 50}, "gone": {"duration_ms": 1}},
+            {"summarize": {"duration_ms": 1100}, "lookup": {"status": "skipped"}},
+        ]
+
+        durations = estimate_durations(self.PLAN, history, default_ms=10)
+
+        assert durations["summarize"] == (1000, "node")
+        assert durations["translate"] == (1000, "type")
+        assert durations["lookup"] == (50, "node")
+        assert durations["wait"] == (2000, "config")
+        assert durations["done"] == (10, "default")
+
+    def test_critical_path_and_widths(self):
+        durations = estimate_durations(self.PLAN, [{"summarize": {"duration_ms": 1500}}], default_ms=10)
+
+        analysis = analyze_plan(self.PLAN, durations, max_concurrency=2)
+
+        assert analysis["width_per_level"] == [2, 3, 1, 1]
+        assert analysis["max_width"] == 3
+        assert [step["node_id"] for step in analysis["critical_path"]] == ["start", "lookup", "wait", "done"]
+        assert analysis["bottleneck"]["node_id"] == "wait"
+        assert analysis["critical_path_ms"] == 2030
+        assert analysis["unreachable"] == ["stray"]
+        assert analysis["estimated_latency_ms"] == max(2030, analysis["total_work_ms"] / 2)
@@ -0,0 +1,60 @@
+"""
+Test cases for the shared, pooled HTTP client used by webhook nodes.
+"""
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.services.http_client import HTTPClient
+
+
+async def start_server():
+    async def echo(request):
+        return web.json_response({"method": request.method, "query": dict(request.query)})
+
+    app = web.Application()
+    app.router.add_route("*", "/echo", echo)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+class TestHTTPClient:
+    """Connections are pooled and reused across requests"""
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self):
+        server = await start_server()
+        client = HTTPClient(limit=10, limit_per_host=2)
+        try:
+            url = str(server.make_url("/echo"))
+            first = await client.request("GET", url, params={"n": "1"})
+            second = await client.request("POST", url, json={"n": 2})
+
+            assert first["status_code"] == 200
+            assert first["json"] == {"method": "GET", "query": {"n": "1"}}
+            assert second["json"]["method"] == "POST"
+            assert client.get_session() is client.get_session()
+
+            stats = client.get_stats()
+            assert stats["requests"] == 2
+            assert stats["connections_created"] == 1
+            assert stats["connections_reused"] == 1
+            assert stats["idle_connections"] == 1
+        finally:
+            await client.close()
+            await server.close()
+
+        assert client.get_stats()["open"] is False
+
+    @pytest.mark.asyncio
+    async def test_failed_requests_are_counted(self):
+        client = HTTPClient()
+        try:
+            with pytest.raises(Exception):
+                await client.request("GET", "http://127.0.0.1:9/unreachable")
+        finally:
+            await client.close()
+
+        assert client.get_stats()["errors"] == 1
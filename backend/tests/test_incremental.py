@@ -0,0 +1,120 @@
+"""
+Test cases for incremental re-execution against a baseline run.
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from datetime import datetime
+
+from app.models.workflow import Node, Edge, ExecutionStatus
+from app.services.execution.incremental import config_hash, plan_incremental
+from app.services.execution.plan import compile_plan
+from app.services.workflow_executor import WorkflowExecutor
+
+
+def make_node(node_id, node_type="ai-processor", **config):
+    return Node(id=node_id, type=node_type, position={"x": 0, "y": 0}, config=config)
+
+
+def completed(node, output=None):
+    return {"status": "completed", "output": output or f"{node.id}-out", "config_hash": config_hash(node)}
+
+
+NODES = [
+    make_node("fetch", "data-source", collection="users"),
+    make_node("summarize", prompt="Summarize for {{audience}}: {{outputs.fetch}}"),
+    make_node("translate", prompt="Translate to {{language}}: {{outputs.summarize}}"),
+    make_node("notify", "webhook", url="https://example.com/hook", body="{{outputs.translate}}"),
+]
+EDGES = [
+    Edge(**{"from": "fetch", "to": "summarize"}),
+    Edge(**{"from": "summarize", "to": "translate"}),
+    Edge(**{"from": "translate", "to": "notify"}),
+]
+VARIABLES = {"audience": "engineers", "language": "fr"}
+BASELINE = {node.id: completed(node) for node in NODES}
+
+
+class TestPlanIncremental:
+    """Dirty nodes and their downstream closure are re-executed"""
+
+    def test_unchanged_workflow_reuses_everything(self):
+        reused, dirty = plan_incremental(NODES, EDGES, BASELINE, VARIABLES, dict(VARIABLES))
+        assert dirty == set()
+        assert set(reused) == {"fetch", "summarize", "translate", "notify"}
+
+    def test_config_change_dirties_downstream(self):
+        edited = list(NODES)
+        edited[1] = make_node("summarize", prompt="Briefly summarize for {{audience}}: {{outputs.fetch}}")
+
+        reused, dirty = plan_incremental(edited, EDGES, BASELINE, VARIABLES, VARIABLES)
+
+        assert dirty == {"summarize", "translate", "notify"}
+        assert set(reused) == {"fetch"}
+
+    def test_changed_variable_dirties_its_readers(self):
+        reused, dirty = plan_incremental(NODES, EDGES, BASELINE, VARIABLES, {**VARIABLES, "language": "de"})
+        assert dirty == {"translate", "notify"}
+
+    def test_failed_or_missing_baseline_nodes_are_dirty(self):
+        baseline = {
+            **BASELINE,
+            "fetch": {"status": "completed", "output": "written before config hashes"},
+            "translate": {"status": "error", "error": "rate limited"}
+        }
+
+        reused, dirty = plan_incremental(NODES, EDGES, baseline, VARIABLES, VARIABLES)
+
+        assert dirty == {"fetch", "summarize", "translate", "notify"}
+        assert reused == {}
+
+    def test_inferred_dependencies_propagate_dirtiness(self):
+        # "report" is only linked to "summarize" by its template
+        nodes = NODES[:2] + [make_node("report", prompt="Report on {{outputs.summarize}}")]
+        baseline = {node.id: completed(node) for node in nodes}
+
+        edited = list(nodes)
+        edited[1] = make_node("summarize", prompt="Briefly summarize for {{audience}}: {{outputs.fetch}}")
+        plan = compile_plan(SimpleNamespace(id=None, metadata=None, nodes=edited, edges=EDGES[:1]))
+
+        reused, dirty = plan_incremental(edited, plan.edges, baseline, VARIABLES, VARIABLES)
+
+        assert dirty == {"summarize", "report"}
+        assert set(reused) == {"fetch"}
+
+
+class TestIncrementalExecution:
+    """Reused baseline results are restored instead of executed"""
+
+    @pytest.mark.asyncio
+    async def test_only_dirty_nodes_execute(self):
+        executor = WorkflowExecutor()
+        executed = []
+
+        async def fake_execute_node(node, context, run):
+            executed.append(node.id)
+            return {"status": "completed", "output": f"{node.id}({context['outputs'].get('summarize')})"}
+
+        reused, _ = plan_incremental(NODES, EDGES, BASELINE, VARIABLES, {**VARIABLES, "language": "de"})
+        workflow = SimpleNamespace(id="wf-incremental", name="Incremental", nodes=NODES, edges=EDGES, metadata=None)
+        run = SimpleNamespace(
+            id=None,
+            execution_id="run-incremental",
+            status=ExecutionStatus.QUEUED,
+            start_time=datetime.utcnow(),
+            end_time=None,
+            variables={**VARIABLES, "language": "de"},
+            node_states=dict(reused),
+            logs=[],
+            errors=[],
+            communication_log=[],
+            save=AsyncMock()
+        )
+
+        with patch.object(executor, "_execute_node", side_effect=fake_execute_node):
+            await executor.execute(workflow, run)
+
+        assert executed == ["translate", "notify"]
+        assert run.node_states["translate"]["output"] == "translate(summarize-out)"
+        assert run.node_states["translate"]["config_hash"] == config_hash(NODES[2])
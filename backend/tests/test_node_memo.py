@@ -0,0 +1,108 @@
+"""
+Test cases for cross-run memoization of node results.
+"""
+
+import json
+import pytest
+from unittest.mock import patch
+
+from app.models.workflow import Node
+from app.services.execution.memo import NodeMemoizer, node_inputs
+from app.services.execution.streams import RecordStream
+from app.services.workflow_executor import WorkflowExecutor
+
+
+class FakeCache:
+    """In-memory stand-in with the RedisCache get/set interface"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        value = self.data.get(key)
+        return json.loads(value) if value else None
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+        return True
+
+
+def make_node(node_id, node_type, **config):
+    return Node(id=node_id, type=node_type, position={"x": 0, "y": 0}, config=config)
+
+
+def resolve(source, context):
+    return context["outputs"].get(source, context["variables"].get(source))
+
+
+class TestMemoPolicy:
+    """Memoization is opt-in per node type and overridable per node"""
+
+    def test_ttl_policy(self):
+        memoizer = NodeMemoizer(ttls={"transformer": 600})
+
+        assert memoizer.ttl_for(make_node("t", "transformer")) == 600
+        assert memoizer.ttl_for(make_node("t", "transformer", memoize=False)) is None
+        assert memoizer.ttl_for(make_node("d", "data-source")) is None
+        assert memoizer.ttl_for(make_node("d", "data-source", memoize=120)) == 120
+        assert memoizer.ttl_for(make_node("w", "webhook", method="GET", memoize=True)) == 3600
+        assert memoizer.ttl_for(make_node("w", "webhook", method="POST", memoize=True)) is None
+        assert memoizer.ttl_for(make_node("e", "email", memoize=True)) is None
+
+    def test_key_depends_on_resolved_inputs(self):
+        memoizer = NodeMemoizer()
+        node = make_node("ai", "ai-processor", prompt="Summarize {{outputs.fetch.text}}", name="Summary")
+        first = {"variables": {}, "outputs": {"fetch": {"text": "a"}}}
+        second = {"variables": {}, "outputs": {"fetch": {"text": "b"}}}
+
+        key = memoizer.key(node, node_inputs(node, first, resolve))
+        assert key == memoizer.key(node, node_inputs(node, dict(first), resolve))
+        assert key != memoizer.key(node, node_inputs(node, second, resolve))
+
+        renamed = make_node("ai2", "ai-processor", prompt="Summarize {{outputs.fetch.text}}", name="Other")
+        assert key == memoizer.key(renamed, node_inputs(renamed, first, resolve))
+
+
+class TestExecutorMemoization:
+    """Repeat executions on identical inputs reuse the stored result"""
+
+    @pytest.mark.asyncio
+    async def test_result_is_reused_across_runs(self):
+        executor = WorkflowExecutor()
+        cache = FakeCache()
+        executor.memoizer = NodeMemoizer(ttls={"transformer": 60}, cache_provider=lambda: cache)
+        node = make_node("t1", "transformer", source="users", transform_type="select", fields=["name"])
+        context = {"variables": {"users": [{"name": "Ann", "age": 3}]}, "outputs": {}}
+
+        with patch.object(executor, "_dispatch_node", wraps=executor._dispatch_node) as dispatch:
+            first = await executor._execute_node(node, context, run=None)
+            second = await executor._execute_node(node, context, run=None)
+
+            changed = {"variables": {"users": [{"name": "Bob"}]}, "outputs": {}}
+            third = await executor._execute_node(node, changed, run=None)
+
+        assert dispatch.call_count == 2
+        assert second["output"] == first["output"] == [{"name": "Ann"}]
+        assert second["memoized"] is True
+        assert third["output"] == [{"name": "Bob"}]
+        assert executor.memoizer.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_streamed_sources_are_not_memoized(self):
+        executor = WorkflowExecutor()
+        cache = FakeCache()
+        executor.memoizer = NodeMemoizer(ttls={"filter": 60}, cache_provider=lambda: cache)
+        node = make_node("f1", "filter", source="fetch", condition="age > 1")
+
+        def stream_of(*names):
+            async def batches():
+                yield [{"name": name, "age": 3} for name in names]
+            return RecordStream(batches())
+
+        first = await executor._execute_node(node, {"variables": {}, "outputs": {"fetch": stream_of("Ann")}}, run=None)
+        second = await executor._execute_node(node, {"variables": {}, "outputs": {"fetch": stream_of("Bob")}}, run=None)
+
+        assert first["output"] == [{"name": "Ann", "age": 3}]
+        assert second["output"] == [{"name": "Bob", "age": 3}]
+        assert "memoized" not in second
+        assert cache.data == {}
@@ -0,0 +1,90 @@
+"""
+Test cases for the node handler registry and custom node types.
+"""
+
+import sys
+import threading
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from datetime import datetime
+
+from app.models.workflow import Node, Edge, ExecutionStatus
+from app.services.execution.registry import NodeRegistry, node_registry
+from app.services.execution.streams import plan_streams
+from app.services.workflow_executor import WorkflowExecutor
+
+
+def make_node(node_id, node_type, **config):
+    return Node(id=node_id, type=node_type, position={"x": 0, "y": 0}, config=config)
+
+
+def shout(executor, node, context, run):
+    """Custom node type handler (sync, CPU-bound)"""
+    text = executor._interpolate_variables(node.config.get("text", ""), context)
+    return {"status": "completed", "output": text.upper(), "thread": threading.current_thread().name}
+
+
+class TestNodeRegistry:
+    """Built-in and custom node types dispatch through the registry"""
+
+    def test_builtin_capabilities(self):
+        assert node_registry.is_cacheable("Transformer")
+        assert not node_registry.is_cacheable("email")
+        assert node_registry.produces_stream("data-source")
+        assert node_registry.consumes_stream("map")
+        assert node_registry.get("unknown") is None
+
+        registry = NodeRegistry()
+        registry.register("shout", shout)
+        with pytest.raises(ValueError):
+            registry.register("SHOUT", shout)
+
+    def test_plugins_load_lazily(self):
+        module = "tests.test_node_registry"
+        registry = NodeRegistry()
+        registry.load_plugins({"shout": {"handler": f"{module}:shout", "cpu_bound": True}})
+
+        spec = registry.get("shout")
+        assert spec.cpu_bound and spec._resolved is None
+        assert spec.resolve() is sys.modules[module].shout
+
+    @pytest.mark.asyncio
+    async def test_custom_node_type_runs_in_workflow(self):
+        node_registry.register("shout", shout, cpu_bound=True)
+        try:
+            executor = WorkflowExecutor()
+            workflow = SimpleNamespace(
+                id="wf-custom",
+                name="Custom node",
+                metadata=None,
+                nodes=[make_node("greet", "shout", text="hello {{name}}"), make_node("done", "end")],
+                edges=[Edge(**{"from": "greet", "to": "done"})]
+            )
+            run = SimpleNamespace(
+                id=None, execution_id="run-custom", status=ExecutionStatus.QUEUED,
+                start_time=datetime.utcnow(), end_time=None, variables={"name": "ada"}, node_states={},
+                logs=[], errors=[], communication_log=[], save=AsyncMock()
+            )
+
+            await executor.execute(workflow, run)
+        finally:
+            node_registry.unregister("shout")
+
+        assert run.status == ExecutionStatus.SUCCESS
+        assert run.node_states["greet"]["output"] == "HELLO ADA"
+        assert run.node_states["greet"]["thread"] != threading.main_thread().name
+
+    def test_streaming_follows_registered_capabilities(self):
+        nodes = [
+            make_node("fetch", "data-source", stream=True),
+            make_node("sink", "batch-sink", source="fetch"),
+        ]
+        edges = [Edge(**{"from": "fetch", "to": "sink"})]
+        assert plan_streams(nodes, edges) == set()
+
+        node_registry.register("batch-sink", shout, consumes_stream=True)
+        try:
+            assert plan_streams(nodes, edges) == {"fetch"}
+        finally:
+            node_registry.unregister("batch-sink")
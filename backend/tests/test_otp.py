@@ -164,23 +164,22 @@ async def test_clear_user_otp(mock_db: AsyncIOMotorDatabase):
 @pytest.mark.asyncio
 async def test_send_otp_email_success():
     """Test successful OTP email sending."""
-    with patch('app.utils.email.aiosmtplib.send', new_callable=AsyncMock) as mock_send:
-        mock_send.return_value = True
+    with patch('app.utils.email.smtp_pool.send', new_callable=AsyncMock) as mock_send:
         result = await send_otp_email(TEST_EMAIL, "123456")
         
         assert result is True
         mock_send.assert_called_once()
         
-        # Verify email parameters
-        call_args = mock_send.call_args[1]
-        assert call_args["hostname"] == "smtp.gmail.com"
-        assert call_args["port"] == 587
-        assert call_args["use_tls"] is True
+        # Verify SMTP server parameters
+        smtp_config = mock_send.call_args[0][1]
+        assert smtp_config["hostname"] == "smtp.gmail.com"
+        assert smtp_config["port"] == 587
+        assert smtp_config["use_tls"] is True
 
 @pytest.mark.asyncio
 async def test_send_otp_email_failure():
     """Test OTP email sending failure."""
-    with patch('app.utils.email.aiosmtplib.send', new_callable=AsyncMock) as mock_send:
+    with patch('app.utils.email.smtp_pool.send', new_callable=AsyncMock) as mock_send:
         mock_send.side_effect = Exception("SMTP error")
         result = await send_otp_email(TEST_EMAIL, "123456")
         
@@ -0,0 +1,100 @@
+"""
+Test cases for releasing node outputs once their last reader has finished.
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from datetime import datetime
+
+from app.models.workflow import Node, Edge, ExecutionStatus
+from app.services.execution.liveness import OutputLiveness
+from app.services.execution.persistence import RunStateWriter
+from app.services.execution.plan import compile_plan
+from app.services.workflow_executor import WorkflowExecutor
+
+
+def make_node(node_id, node_type="transformer", **config):
+    return Node(id=node_id, type=node_type, position={"x": 0, "y": 0}, config=config)
+
+
+def make_workflow(nodes, edges, **metadata):
+    return SimpleNamespace(
+        id="wf-live",
+        name="Liveness",
+        metadata=metadata or None,
+        nodes=nodes,
+        edges=[Edge(**{"from": source, "to": target}) for source, target in edges]
+    )
+
+
+PIPELINE = [
+    make_node("fetch", "data-source"),
+    make_node("clean", source="fetch"),
+    make_node("score", source="clean"),
+    make_node("report", "end", summary="{{outputs.fetch}} {{outputs.score}}"),
+]
+EDGES = [("fetch", "clean"), ("clean", "score"), ("score", "report")]
+
+
+class TestOutputLiveness:
+    """Outputs live until their producer and all of their readers finish"""
+
+    def test_release_order(self):
+        liveness = OutputLiveness.from_plan(compile_plan(make_workflow(PIPELINE, EDGES)))
+
+        assert liveness.finished("fetch") == []
+        assert liveness.finished("clean") == []
+        assert liveness.finished("score") == ["clean"]
+        assert sorted(liveness.finished("report")) == ["fetch", "report", "score"]
+
+    def test_unknown_readers_release_nothing(self):
+        plan = compile_plan(make_workflow(PIPELINE, EDGES, infer_dependencies=False))
+        assert OutputLiveness.from_plan(plan) is None
+
+        dynamic = PIPELINE + [make_node("pick", "condition", condition="outputs[variables.key] > 1")]
+        liveness = OutputLiveness.from_plan(compile_plan(make_workflow(dynamic, EDGES)))
+        for node_id in ("fetch", "clean", "score", "report"):
+            assert liveness.finished(node_id) == []
+        assert "fetch" in liveness.finished("pick")
+
+    def test_opaque_nodes_keep_upstream_outputs(self):
+        # "notify" references no output, so it may read anything upstream of it
+        nodes = PIPELINE[:3] + [
+            make_node("notify", "webhook", url="https://example.com/hook"),
+            make_node("done", "end")
+        ]
+        edges = EDGES[:2] + [("score", "notify"), ("notify", "done")]
+        liveness = OutputLiveness.from_plan(compile_plan(make_workflow(nodes, edges)))
+
+        assert liveness.finished("fetch") == []
+        assert liveness.finished("clean") == []
+        assert liveness.finished("score") == []
+        assert sorted(liveness.finished("notify")) == ["clean", "fetch", "notify", "score"]
+        assert liveness.finished("done") == ["done"]
+
+    @pytest.mark.asyncio
+    async def test_run_holds_only_live_outputs(self):
+        executor = WorkflowExecutor()
+        live = {}
+
+        async def fake_execute_node(node, context, run):
+            live[node.id] = sorted(context["outputs"])
+            return {"status": "completed", "output": [node.id] * 1000}
+
+        run = SimpleNamespace(
+            id="persisted", execution_id="run-live", status=ExecutionStatus.QUEUED,
+            start_time=datetime.utcnow(), end_time=None, variables={}, node_states={},
+            logs=[], errors=[], communication_log=[], save=AsyncMock()
+        )
+
+        with patch.object(executor, "_execute_node", side_effect=fake_execute_node), \
+                patch.object(RunStateWriter, "load_sequence", AsyncMock()), \
+                patch.object(RunStateWriter, "flush", AsyncMock()):
+            await executor.execute(make_workflow(PIPELINE, EDGES), run)
+
+        assert run.status == ExecutionStatus.SUCCESS
+        assert live["score"] == ["clean", "fetch"]
+        assert live["report"] == ["fetch", "score"]  # "clean" was released
+        assert run.node_states["clean"]["output_released"]
+        assert run.node_states["clean"]["output"] is None
@@ -0,0 +1,131 @@
+"""
+Test cases for circuit breakers and adaptive retries of outbound calls.
+"""
+
+import time
+import pytest
+
+from app.services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    HTTPStatusError,
+    call_with_retry,
+    circuit_breakers,
+    classify_http_error,
+    deadline_scope,
+    retry_after_seconds
+)
+
+
+class FlakyTarget:
+    """Raises the queued errors, then succeeds"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+@pytest.fixture(autouse=True)
+def reset_breakers():
+    circuit_breakers.reset()
+    yield
+    circuit_breakers.reset()
+
+
+class TestCircuitBreaker:
+    """Consecutive failures open the circuit; a trial call closes it"""
+
+    def test_open_half_open_closed(self):
+        breaker = CircuitBreaker("http:example.com", failure_threshold=2, recovery_timeout=0.05)
+
+        breaker.allow()
+        breaker.record_failure()
+        breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+
+        time.sleep(0.06)
+        assert breaker.state == CircuitState.HALF_OPEN
+        breaker.allow()
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()  # Only one trial call at a time
+
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.get_stats()["rejected"] == 2
+
+    def test_retry_after_parsing(self):
+        assert retry_after_seconds("7") == 7.0
+        assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert retry_after_seconds("soon") is None
+
+
+class TestCallWithRetry:
+    """Transient failures are retried, permanent ones and open circuits fail fast"""
+
+    @pytest.mark.asyncio
+    async def test_transient_failures_are_retried(self):
+        target = FlakyTarget(ConnectionError("reset"), HTTPStatusError(503, "HTTP 503"))
+
+        result, attempts = await call_with_retry(target, "http:flaky", retries=3, base_delay=0.01)
+
+        assert (result, attempts) == ("ok", 3)
+        assert circuit_breakers.get_stats()["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        target = FlakyTarget(HTTPStatusError(404, "HTTP 404"))
+
+        with pytest.raises(HTTPStatusError):
+            await call_with_retry(target, "http:gone", retries=3, base_delay=0.01, classify=classify_http_error)
+
+        assert target.calls == 1
+        assert circuit_breakers.get("http:gone").state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_honoured(self):
+        target = FlakyTarget(HTTPStatusError(429, "HTTP 429", retry_after=0.2))
+        started = time.monotonic()
+
+        _, attempts = await call_with_retry(
+            target, "http:busy", retries=1, base_delay=0.01, classify=classify_http_error
+        )
+
+        assert attempts == 2
+        assert time.monotonic() - started >= 0.2
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self):
+        breaker = circuit_breakers.get("http:down")
+        breaker.failure_threshold = 2
+        target = FlakyTarget(*[ConnectionError("refused")] * 10)
+
+        with pytest.raises(CircuitOpenError):
+            await call_with_retry(target, "http:down", retries=5, base_delay=0.01)
+        assert target.calls == 2
+
+        with pytest.raises(CircuitOpenError):
+            await call_with_retry(target, "http:down", retries=5, base_delay=0.01)
+        assert target.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_retries_stop_at_deadline(self):
+        target = FlakyTarget(HTTPStatusError(429, "HTTP 429", retry_after=5))
+
+        with deadline_scope(1.0):
+            with pytest.raises(HTTPStatusError):
+                await call_with_retry(
+                    target, "http:slow", retries=3, base_delay=0.01, classify=classify_http_error
+                )
+
+        assert target.calls == 1
+        assert circuit_breakers.get_stats()["deadline_exhausted"] == 1
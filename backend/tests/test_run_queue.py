@@ -0,0 +1,223 @@
+"""
+Test cases for the durable workflow run queue.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from datetime import datetime, timedelta
+
+from app.models.workflow import ExecutionStatus
+from app.services.execution.persistence import RunStateWriter
+from app.services.run_queue import RunQueue, RunQueueClosedError, RunQueueFullError
+
+
+@pytest.fixture(name="runs_collection")
+def runs_collection_fixture(monkeypatch):
+    """Run queue backed by a mongomock-motor database"""
+    from mongomock_motor import AsyncMongoMockClient
+
+    db = AsyncMongoMockClient().db
+    monkeypatch.setattr("app.services.run_queue.get_database", AsyncMock(return_value=db))
+    monkeypatch.setattr("app.services.run_queue.WorkflowRun.get", AsyncMock(side_effect=lambda run_id: run_id))
+    return db["workflow_runs"]
+
+
+def make_run(execution_id="run-1"):
+    return SimpleNamespace(
+        id=None,
+        execution_id=execution_id,
+        workflow_id="wf-1",
+        status=ExecutionStatus.IDLE,
+        priority=0,
+        queued_at=None,
+        claimed_at=None,
+        worker_id=None,
+        insert=AsyncMock(),
+        save=AsyncMock()
+    )
+
+
+class TestRunQueue:
+    """Test cases for enqueueing, backpressure and metrics"""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_marks_run_queued(self):
+        """Enqueued runs are persisted with queue bookkeeping"""
+        queue = RunQueue(worker_count=1, max_depth=10)
+        run = make_run()
+
+        with patch.object(queue, "depth", new_callable=AsyncMock, return_value=0):
+            await queue.enqueue(run, priority=5)
+
+        run.insert.assert_awaited_once()
+        assert run.status == ExecutionStatus.QUEUED
+        assert run.priority == 5
+        assert isinstance(run.queued_at, datetime)
+
+    @pytest.mark.asyncio
+    async def test_enqueue_rejects_when_full(self):
+        """Backpressure: runs beyond max_depth are rejected, not started"""
+        queue = RunQueue(worker_count=1, max_depth=2)
+        run = make_run()
+
+        with patch.object(queue, "depth", new_callable=AsyncMock, return_value=2):
+            with pytest.raises(RunQueueFullError):
+                await queue.enqueue(run)
+
+        run.insert.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_then_interrupts_runs(self):
+        """Shutdown rejects new runs and interrupts runs exceeding the drain timeout"""
+        queue = RunQueue(worker_count=1, max_depth=0, drain_timeout=0.05, heartbeat_interval=3600)
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def long_execution(workflow, run):
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        claims = [make_run("run-long")]
+        with patch.object(queue, "claim", new=AsyncMock(side_effect=lambda worker_id: claims.pop() if claims else None)), \
+                patch("app.services.run_queue.Workflow.get", new=AsyncMock(return_value=object())), \
+                patch("app.services.run_queue.workflow_executor.execute", new=long_execution):
+            await queue.start()
+            await asyncio.wait_for(started.wait(), timeout=1)
+            await queue.stop()
+
+        assert cancelled.is_set()
+        assert queue._interrupted == 1
+        with pytest.raises(RunQueueClosedError):
+            await queue.enqueue(make_run())
+
+    @pytest.mark.asyncio
+    async def test_stats_report_wait_times(self):
+        """Queue stats include depth and wait-time percentiles"""
+        queue = RunQueue(worker_count=3, max_depth=0)
+        queue._wait_times_ms.extend([10.0, 20.0, 30.0, 40.0])
+
+        with patch.object(queue, "depth", new_callable=AsyncMock, return_value=7):
+            stats = await queue.get_stats()
+
+        assert stats["depth"] == 7
+        assert stats["workers"] == 3
+        assert stats["wait_time_ms"]["samples"] == 4
+        assert stats["wait_time_ms"]["max"] == 40.0
+        assert stats["wait_time_ms"]["avg"] == 25.0
+
+    @pytest.mark.asyncio
+    async def test_missing_workflow_is_recorded_as_error_event(self):
+        """Runs of deleted workflows fail with an error event, like executor failures"""
+        queue = RunQueue(worker_count=1, max_depth=10)
+        run = make_run()
+        run.id = "persisted"
+
+        with patch("app.services.run_queue.Workflow.get", AsyncMock(return_value=None)), \
+                patch.object(RunStateWriter, "load_sequence", AsyncMock()), \
+                patch.object(RunStateWriter, "flush", autospec=True) as flush:
+            await queue.process(run)
+
+        writer = flush.call_args.args[0]
+        assert [(event["kind"], event["node_id"], event["data"]) for event in writer._events] == [
+            ("error", "workflow", {"error": "Workflow not found"})
+        ]
+        assert writer._set["status"] == ExecutionStatus.ERROR.value
+        assert run.status == ExecutionStatus.ERROR
+        run.save.assert_not_awaited()
+        assert queue._failed == 1
+
+
+class TestStaleRuns:
+    """RUNNING runs are only taken over once their worker stopped heartbeating"""
+
+    @pytest.mark.asyncio
+    async def test_reclaim_skips_runs_with_fresh_heartbeat(self, runs_collection):
+        queue = RunQueue(worker_count=1, max_depth=0, stale_after=60)
+        now = datetime.utcnow()
+        await runs_collection.insert_many([
+            {"_id": "live", "execution_id": "run-live", "status": "running", "worker_id": "worker-a",
+             "claimed_at": now - timedelta(minutes=10), "heartbeat_at": now - timedelta(seconds=5)},
+            {"_id": "dead", "execution_id": "run-dead", "status": "running", "worker_id": "worker-b",
+             "claimed_at": now - timedelta(minutes=10), "heartbeat_at": now - timedelta(minutes=5)},
+        ])
+
+        assert await queue.claim_run("run-live", "worker-c", reclaim=True) is None
+        assert await queue.claim_run("run-dead", "worker-c", reclaim=True) == "dead"
+
+        live = await runs_collection.find_one({"_id": "live"})
+        assert live["worker_id"] == "worker-a"
+        assert await queue.is_running("run-live")
+
+    @pytest.mark.asyncio
+    async def test_live_run_entry_is_left_pending(self):
+        from app.worker import StreamWorker
+
+        stream = SimpleNamespace(ack=AsyncMock())
+        worker = StreamWorker(stream, concurrency=1)
+
+        with patch("app.worker.run_queue") as queue:
+            queue.claim_run = AsyncMock(return_value=None)
+            queue.is_running = AsyncMock(return_value=True)
+            queue.process = AsyncMock()
+            await worker._handle("1-0", {"execution_id": "run-42"}, reclaimed=True)
+
+        queue.process.assert_not_awaited()
+        stream.ack.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_recover_requeues_runs_claimed_but_never_started(self, runs_collection):
+        queue = RunQueue(worker_count=1, max_depth=0, stale_after=60)
+        now = datetime.utcnow()
+        await runs_collection.insert_many([
+            # The worker died between claiming the run and starting it
+            {"_id": "orphan", "execution_id": "run-orphan", "status": "running", "worker_id": "worker-a",
+             "claimed_at": now - timedelta(minutes=5), "start_time": None, "heartbeat_at": None},
+            {"_id": "fresh", "execution_id": "run-fresh", "status": "running", "worker_id": "worker-b",
+             "claimed_at": now - timedelta(seconds=5), "start_time": None, "heartbeat_at": None},
+        ])
+
+        assert await queue.recover() == ["run-orphan"]
+        orphan = await runs_collection.find_one({"_id": "orphan"})
+        assert orphan["status"] == "queued" and orphan["worker_id"] is None
+
+
+class TestStreamWorker:
+    """Test cases for the standalone Redis Stream worker"""
+
+    @pytest.mark.asyncio
+    async def test_entry_acked_after_run(self):
+        """Entries are acknowledged only after the run was executed"""
+        from app.worker import StreamWorker
+
+        stream = SimpleNamespace(ack=AsyncMock())
+        worker = StreamWorker(stream, concurrency=1)
+        run = make_run("run-42")
+
+        with patch("app.worker.run_queue") as queue:
+            queue.claim_run = AsyncMock(return_value=run)
+            queue.process = AsyncMock()
+            await worker._handle("1-0", {"execution_id": "run-42"}, reclaimed=True)
+
+            queue.claim_run.assert_awaited_once_with("run-42", worker.consumer, reclaim=True)
+            queue.process.assert_awaited_once_with(run)
+        stream.ack.assert_awaited_once_with("1-0")
+
+    @pytest.mark.asyncio
+    async def test_failed_entry_left_pending(self):
+        """Entries whose processing crashed stay pending for reclaiming"""
+        from app.worker import StreamWorker
+
+        stream = SimpleNamespace(ack=AsyncMock())
+        worker = StreamWorker(stream, concurrency=1)
+
+        with patch("app.worker.run_queue") as queue:
+            queue.claim_run = AsyncMock(side_effect=ConnectionError("mongo down"))
+            await worker._handle("1-0", {"execution_id": "run-42"}, reclaimed=False)
+
+        stream.ack.assert_not_awaited()
@@ -0,0 +1,132 @@
+"""
+Test cases for write-behind run state persistence.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from pymongo.errors import BulkWriteError
+
+from app.models.workflow import RunEventKind
+from app.services.execution.persistence import RunStateWriter
+
+
+def make_collection():
+    collection = MagicMock()
+    collection.update_one = AsyncMock()
+    collection.insert_many = AsyncMock()
+    db = MagicMock()
+    db.__getitem__.return_value = collection
+    return db, collection
+
+
+class TestRunStateWriter:
+    """Buffered updates are coalesced into targeted writes"""
+
+    @pytest.mark.asyncio
+    async def test_updates_are_coalesced(self):
+        db, collection = make_collection()
+        run = SimpleNamespace(id="run-id", execution_id="exec-1")
+        writer = RunStateWriter(run, flush_interval=0.01)
+
+        with patch("app.services.execution.persistence.get_database", AsyncMock(return_value=db)):
+            writer.set("status", "running")
+            writer.set("status", "success")
+            writer.set_node_state("n1", {"status": "completed"})
+            writer.push("logs", {"message": "a"})
+            writer.push("logs", {"message": "b"})
+            await asyncio.sleep(0.05)
+
+        collection.update_one.assert_awaited_once_with(
+            {"_id": "run-id"},
+            {
+                "$set": {"status": "success", "node_states.n1": {"status": "completed"}},
+                "$push": {"logs": {"$each": [{"message": "a"}, {"message": "b"}]}}
+            }
+        )
+        assert writer.writes == 1
+        assert writer.operations == 5
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_immediately(self):
+        db, collection = make_collection()
+        run = SimpleNamespace(id="run-id", execution_id="exec-1")
+        writer = RunStateWriter(run, flush_interval=60)
+
+        with patch("app.services.execution.persistence.get_database", AsyncMock(return_value=db)):
+            writer.set("status", "error")
+            await writer.close()
+
+        collection.update_one.assert_awaited_once_with({"_id": "run-id"}, {"$set": {"status": "error"}})
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried(self):
+        db, collection = make_collection()
+        collection.update_one.side_effect = [ConnectionError("down"), None]
+        run = SimpleNamespace(id="run-id", execution_id="exec-1")
+        writer = RunStateWriter(run, flush_interval=60)
+
+        with patch("app.services.execution.persistence.get_database", AsyncMock(return_value=db)):
+            writer.push("errors", {"error": "boom"})
+            with pytest.raises(ConnectionError):
+                await writer.flush()
+            writer.set("status", "error")
+            await writer.close()
+
+        assert collection.update_one.await_args.args[1] == {
+            "$set": {"status": "error"},
+            "$push": {"errors": {"$each": [{"error": "boom"}]}}
+        }
+
+
+class TestRunEvents:
+    """Logs, errors and communication go to the append-only event collection"""
+
+    @pytest.mark.asyncio
+    async def test_events_are_bulk_inserted_in_sequence(self):
+        db, collection = make_collection()
+        run = SimpleNamespace(id="run-id", execution_id="exec-1")
+        writer = RunStateWriter(run, flush_interval=60)
+
+        with patch("app.services.execution.persistence.get_database", AsyncMock(return_value=db)):
+            writer.append_event(RunEventKind.LOG, "n1", {"message": "started"})
+            writer.append_event(RunEventKind.ERROR, "n1", {"error": "boom"})
+            await writer.close()
+
+        events = collection.insert_many.await_args.args[0]
+        assert collection.insert_many.await_args.kwargs == {"ordered": False}
+        assert [(e["seq"], e["kind"], e["data"]) for e in events] == [
+            (0, "log", {"message": "started"}),
+            (1, "error", {"error": "boom"})
+        ]
+        collection.update_one.assert_not_awaited()
+        assert writer.events_written == 2
+
+    @pytest.mark.asyncio
+    async def test_duplicate_events_from_retries_are_ignored(self):
+        db, collection = make_collection()
+        collection.insert_many.side_effect = BulkWriteError({
+            "writeErrors": [{"index": 0, "code": 11000, "errmsg": "duplicate key"}]
+        })
+        run = SimpleNamespace(id="run-id", execution_id="exec-1")
+        writer = RunStateWriter(run, flush_interval=60)
+
+        with patch("app.services.execution.persistence.get_database", AsyncMock(return_value=db)):
+            writer.append_event(RunEventKind.LOG, "n1", {"message": "started"})
+            await writer.close()
+
+        assert writer.events_written == 1
+
+    @pytest.mark.asyncio
+    async def test_sequence_continues_after_previous_attempt(self):
+        db, collection = make_collection()
+        collection.find_one = AsyncMock(return_value={"seq": 41})
+        run = SimpleNamespace(id="run-id", execution_id="exec-1")
+        writer = RunStateWriter(run, flush_interval=60)
+
+        with patch("app.services.execution.persistence.get_database", AsyncMock(return_value=db)):
+            await writer.load_sequence()
+            event = writer.append_event(RunEventKind.LOG, None, {"message": "resumed"})
+
+        assert event["seq"] == 42
@@ -0,0 +1,145 @@
+"""
+Test cases for the dependency-aware DAG scheduler used by the workflow executor.
+"""
+
+import asyncio
+import pytest
+
+from app.models.workflow import Node, Edge
+from app.services.execution.scheduler import DAGScheduler, GraphCycleError
+
+
+def make_node(node_id: str, node_type: str = "transformer") -> Node:
+    return Node(id=node_id, type=node_type, position={"x": 0, "y": 0}, config={})
+
+
+def make_edges(*pairs):
+    return [Edge(**{"from": source, "to": target}) for source, target in pairs]
+
+
+class TestDAGScheduler:
+    """Test cases for scheduling order and concurrency"""
+
+    @pytest.fixture
+    def diamond(self):
+        """start -> (a, b) -> end"""
+        nodes = [make_node("start", "start"), make_node("a"), make_node("b"), make_node("end", "end")]
+        edges = make_edges(("start", "a"), ("start", "b"), ("a", "end"), ("b", "end"))
+        return nodes, edges
+
+    def test_topological_order(self, diamond):
+        """Dependencies come before dependents, ties keep node order"""
+        nodes, edges = diamond
+        scheduler = DAGScheduler(nodes, edges)
+        assert [node.id for node in scheduler.order] == ["start", "a", "b", "end"]
+
+    def test_cycle_detection(self):
+        """Cyclic graphs are rejected up front"""
+        nodes = [make_node("a"), make_node("b")]
+        edges = make_edges(("a", "b"), ("b", "a"))
+        with pytest.raises(GraphCycleError):
+            DAGScheduler(nodes, edges)
+
+    def test_dangling_edges_ignored(self):
+        """Edges pointing at unknown nodes do not break scheduling"""
+        nodes = [make_node("a"), make_node("b")]
+        edges = make_edges(("a", "b"), ("b", "missing"))
+        scheduler = DAGScheduler(nodes, edges)
+        assert [node.id for node in scheduler.order] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_independent_branches_overlap(self, diamond):
+        """Independent branches run concurrently instead of adding latencies"""
+        nodes, edges = diamond
+        scheduler = DAGScheduler(nodes, edges)
+        finished = []
+
+        async def execute(node):
+            if node.id in ("a", "b"):
+                await asyncio.sleep(0.2)
+            finished.append(node.id)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await scheduler.run(execute)
+        elapsed = loop.time() - started
+
+        assert finished[0] == "start"
+        assert finished[-1] == "end"
+        assert elapsed < 0.35
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        """No more than max_concurrency nodes run at once"""
+        nodes = [make_node(f"n{i}") for i in range(6)]
+        scheduler = DAGScheduler(nodes, [], max_concurrency=2)
+        active = 0
+        peak = 0
+
+        async def execute(node):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        await scheduler.run(execute)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_stops_downstream(self, diamond):
+        """A failing node aborts the run and its dependents never execute"""
+        nodes, edges = diamond
+        scheduler = DAGScheduler(nodes, edges)
+        executed = []
+
+        async def execute(node):
+            executed.append(node.id)
+            if node.id == "a":
+                raise RuntimeError("boom")
+            await asyncio.sleep(0.05)
+
+        with pytest.raises(RuntimeError):
+            await scheduler.run(execute)
+        assert "end" not in executed
+
+
+class TestBranching:
+    """Condition results choose outgoing edges; unreachable nodes are skipped"""
+
+    @pytest.fixture
+    def approval(self):
+        """check -(true)-> approve -> notify, check -(false)-> reject -> archive, (approve, reject) -> done"""
+        nodes = [make_node(node_id) for node_id in ("check", "approve", "notify", "reject", "archive", "done")]
+        edges = [
+            Edge(**{"from": "check", "to": "approve", "branch": "true"}),
+            Edge(**{"from": "check", "to": "reject", "branch": "false"}),
+        ] + make_edges(("approve", "notify"), ("reject", "archive"), ("approve", "done"), ("reject", "done"))
+        return nodes, edges
+
+    @pytest.mark.asyncio
+    async def test_untaken_branch_is_skipped(self, approval):
+        nodes, edges = approval
+        executed, skipped_seen = [], []
+
+        async def execute(node):
+            executed.append(node.id)
+            return {"status": "completed", "branch": "true"} if node.id == "check" else {"status": "completed"}
+
+        skipped = await DAGScheduler(nodes, edges).run(execute, on_skip=lambda node: skipped_seen.append(node.id))
+
+        assert executed[0] == "check"
+        assert set(executed) == {"check", "approve", "notify", "done"}
+        assert set(skipped) == set(skipped_seen) == {"reject", "archive"}
+
+    @pytest.mark.asyncio
+    async def test_halt_prunes_unlabelled_edges(self):
+        nodes = [make_node("filter"), make_node("email"), make_node("audit")]
+        edges = make_edges(("filter", "email"), ("email", "audit"))
+
+        async def execute(node):
+            return {"status": "completed", "halt": node.id == "filter"}
+
+        skipped = await DAGScheduler(nodes, edges).run(execute)
+
+        assert skipped == ["email", "audit"]
@@ -0,0 +1,131 @@
+"""
+Test cases for pooled SMTP sessions and per-domain throttling.
+"""
+
+import asyncio
+import time
+import pytest
+from email.mime.text import MIMEText
+
+from app.services.smtp_pool import DomainThrottle, SMTPPool
+
+
+class FakeSMTPServer:
+    """Minimal in-process SMTP server counting connections and messages"""
+
+    def __init__(self):
+        self.connections = 0
+        self.logins = 0
+        self.messages = []
+        self.server = None
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        writer.write(b"220 localhost ESMTP\r\n")
+        in_data = False
+        lines = []
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if in_data:
+                if line == b".\r\n":
+                    self.messages.append(b"".join(lines))
+                    in_data, lines = False, []
+                    writer.write(b"250 OK\r\n")
+                else:
+                    lines.append(line)
+                continue
+
+            command = line.decode().strip().upper()
+            if command.startswith("EHLO"):
+                writer.write(b"250-localhost\r\n250 AUTH PLAIN\r\n")
+            elif command.startswith("AUTH"):
+                self.logins += 1
+                writer.write(b"235 Authenticated\r\n")
+            elif command.startswith("DATA"):
+                in_data = True
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+            elif command.startswith("QUIT"):
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+def make_message(to):
+    message = MIMEText("Hello", "plain")
+    message["From"] = "noreply@example.com"
+    message["To"] = to
+    message["Subject"] = "Hi"
+    return message
+
+
+class TestSMTPPool:
+    """Authenticated sessions are reused across messages"""
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_reused(self):
+        server = FakeSMTPServer()
+        port = await server.start()
+        pool = SMTPPool(size=2, idle_timeout=60, max_messages=0)
+        smtp_config = {
+            "hostname": "127.0.0.1", "port": port, "username": "user", "password": "secret",
+            "use_tls": False, "use_ssl": False
+        }
+        try:
+            await asyncio.gather(*(
+                pool.send(make_message(f"user{i}@example.com"), smtp_config) for i in range(20)
+            ))
+        finally:
+            await pool.close()
+            await server.stop()
+
+        assert len(server.messages) == 20
+        assert server.connections <= 2
+        assert server.logins == server.connections
+        stats = pool.get_stats()
+        assert stats["messages_sent"] == 20
+        assert stats["sessions_created"] == server.connections
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_recycled_after_max_messages(self):
+        server = FakeSMTPServer()
+        port = await server.start()
+        pool = SMTPPool(size=1, idle_timeout=60, max_messages=3)
+        smtp_config = {"hostname": "127.0.0.1", "port": port, "use_tls": False, "use_ssl": False}
+        try:
+            for i in range(7):
+                await pool.send(make_message(f"user{i}@example.com"), smtp_config)
+        finally:
+            await pool.close()
+            await server.stop()
+
+        assert len(server.messages) == 7
+        assert server.connections == 3
+
+
+class TestDomainThrottle:
+    """Sends to one domain are spaced, other domains are not held up"""
+
+    @pytest.mark.asyncio
+    async def test_per_domain_spacing(self):
+        throttle = DomainThrottle(rate=20)
+        started = time.monotonic()
+
+        await asyncio.gather(*(throttle.wait(f"user{i}@example.com") for i in range(4)))
+        await throttle.wait("someone@other.org")
+
+        assert time.monotonic() - started >= 0.14
+        assert time.monotonic() - started < 1.0
@@ -0,0 +1,139 @@
+"""
+Test cases for streaming node-to-node pipelines.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from datetime import datetime
+
+from app.models.workflow import Node, Edge, ExecutionStatus
+from app.services.execution.streams import RecordStream, plan_streams
+from app.services.workflow_executor import WorkflowExecutor
+
+
+def make_node(node_id, node_type, **config):
+    return Node(id=node_id, type=node_type, position={"x": 0, "y": 0}, config=config)
+
+
+def make_edge(source, target, branch=None):
+    return Edge(**{"from": source, "to": target, "branch": branch})
+
+
+async def numbered_batches(count, size=10):
+    for start in range(0, count, size):
+        yield [{"n": n} for n in range(start, min(start + size, count))]
+
+
+class FakeCursor:
+    """Minimal Motor cursor stand-in"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.read = 0
+
+    def sort(self, field, order):
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    async def _iterate(self):
+        for doc in self.docs:
+            await asyncio.sleep(0)
+            self.read += 1
+            yield dict(doc)
+
+    def __aiter__(self):
+        return self._iterate()
+
+
+class TestRecordStream:
+    """Bounded buffering between one producer and one consumer"""
+
+    @pytest.mark.asyncio
+    async def test_producer_waits_for_slow_consumer(self):
+        stream = RecordStream(numbered_batches(1000), max_buffered_batches=2)
+        stream.start()
+        await asyncio.sleep(0.01)
+
+        assert stream.batches_produced <= 3
+
+        records = await stream.collect()
+        assert len(records) == 1000
+        assert stream.batches_produced == 100
+
+    @pytest.mark.asyncio
+    async def test_pipe_and_errors(self):
+        evens = RecordStream(numbered_batches(50)).pipe(lambda batch: [r for r in batch if r["n"] % 2 == 0])
+        assert len(await evens.collect()) == 25
+
+        async def failing():
+            yield [1]
+            raise ConnectionError("cursor lost")
+
+        with pytest.raises(ConnectionError):
+            await RecordStream(failing()).collect()
+
+        stream = RecordStream(numbered_batches(10))
+        await stream.collect()
+        with pytest.raises(RuntimeError):
+            await stream.collect()
+
+    def test_only_single_stream_consumers_are_streamed_to(self):
+        nodes = [
+            make_node("fetch", "data-source", stream=True),
+            make_node("each", "map", source="fetch"),
+            make_node("fetch2", "data-source", stream=True),
+            make_node("shape", "transformer", source="fetch2"),
+        ]
+        edges = [make_edge("fetch", "each"), make_edge("fetch2", "shape")]
+
+        assert plan_streams(nodes, edges) == {"fetch"}
+
+
+class TestStreamingExecution:
+    """A streamed data source feeds its consumer as batches arrive"""
+
+    @pytest.mark.asyncio
+    async def test_data_source_streams_into_filter_and_map(self):
+        executor = WorkflowExecutor()
+        cursor = FakeCursor([{"_id": i, "n": i} for i in range(200)])
+        db = {"users": SimpleNamespace(find=lambda query, projection: cursor)}
+        workflow = SimpleNamespace(
+            id="wf-stream",
+            name="Streaming",
+            metadata=None,
+            nodes=[
+                make_node("fetch", "data-source", source_type="mongodb", collection="users",
+                          limit=150, stream=True, batch_size=20),
+                make_node("evens", "filter", source="fetch", condition="n % 2 == 0", stream=True),
+                make_node("each", "map", source="evens", concurrency=4),
+                make_node("check", "condition", condition="item.n >= 100"),
+            ],
+            edges=[
+                make_edge("fetch", "evens"),
+                make_edge("evens", "each"),
+                make_edge("each", "check", "each"),
+            ]
+        )
+        run = SimpleNamespace(
+            id=None, execution_id="run-stream", status=ExecutionStatus.QUEUED,
+            start_time=datetime.utcnow(), end_time=None, variables={}, node_states={},
+            logs=[], errors=[], communication_log=[], save=AsyncMock()
+        )
+
+        with patch("app.core.database.get_database", new=AsyncMock(return_value=db)):
+            await executor.execute(workflow, run)
+
+        assert run.status == ExecutionStatus.SUCCESS
+        assert run.node_states["fetch"]["streamed"] is True
+        assert run.node_states["fetch"]["output"] is None
+        assert run.node_states["each"]["items"] == 75
+        assert run.node_states["each"]["output"] == [n >= 100 for n in range(0, 150, 2)]
+        assert cursor.read == 150
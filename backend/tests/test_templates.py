@@ -0,0 +1,60 @@
+"""
+Test cases for the compiled template engine.
+"""
+
+from app.services.execution.templates import compile_template, render_template, render_value
+
+
+CONTEXT = {
+    "variables": {
+        "name": "Ada",
+        "user": {"address": {"city": "London"}},
+        "app.version": "2.1"
+    },
+    "outputs": {
+        "mongodb-fetch-1": [
+            {"email": "a@example.com", "name": "Ann"},
+            {"email": "b@example.com", "name": "Bob"}
+        ],
+        "ai-1": "Generated text",
+        "http-1": {"json": {"items": [{"id": 7}]}}
+    }
+}
+
+
+class TestRenderTemplate:
+    """Placeholders resolve variables, outputs and dotted paths"""
+
+    def test_variables_and_outputs(self):
+        assert render_template("Hi {{name}}: {{outputs.ai-1}}", CONTEXT) == "Hi Ada: Generated text"
+
+    def test_dotted_paths(self):
+        assert render_template("{{user.address.city}}", CONTEXT) == "London"
+        assert render_template("{{outputs.http-1.json.items.0.id}}", CONTEXT) == "7"
+        assert render_template("{{app.version}}", CONTEXT) == "2.1"
+
+    def test_list_projection(self):
+        rendered = render_template("{{outputs.mongodb-fetch-1.email}}", CONTEXT)
+        assert rendered == "a@example.com, b@example.com"
+        assert render_template("{{outputs.mongodb-fetch-1.1.name}}", CONTEXT) == "Bob"
+
+    def test_unresolved_placeholders_are_kept(self):
+        template = "{{missing}} {{outputs.none.x}} {{outputs.ai-1.__class__}}"
+        assert render_template(template, CONTEXT) == template
+
+    def test_only_referenced_outputs_are_read(self):
+        class Exploding:
+            def __str__(self):
+                raise AssertionError("unreferenced output was stringified")
+
+        context = {"variables": {"name": "Ada"}, "outputs": {"big": Exploding()}}
+        assert render_template("Hi {{name}}", context) == "Hi Ada"
+
+    def test_templates_are_compiled_once(self):
+        template = "cached {{name}}"
+        assert compile_template(template) is compile_template(template)
+        assert render_template("", CONTEXT) == ""
+
+    def test_render_value_recurses(self):
+        data = {"to": "{{name}}", "items": [{"id": "{{outputs.http-1.json.items.0.id}}"}, 3]}
+        assert render_value(data, CONTEXT) == {"to": "Ada", "items": [{"id": "7"}, 3]}
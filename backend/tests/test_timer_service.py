@@ -0,0 +1,109 @@
+"""
+Test cases for durable timers and delay nodes parking their run.
+"""
+
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from datetime import datetime, timedelta
+
+from app.models.workflow import Node, Edge, ExecutionStatus
+from app.services.timer_service import TimerService
+from app.services.workflow_executor import WorkflowExecutor
+
+
+def make_node(node_id, node_type="start", **config):
+    return Node(id=node_id, type=node_type, position={"x": 0, "y": 0}, config=config)
+
+
+def make_run(node_states=None):
+    return SimpleNamespace(
+        id=None,
+        execution_id="run-drip",
+        status=ExecutionStatus.QUEUED,
+        start_time=datetime.utcnow(),
+        end_time=None,
+        variables={},
+        node_states=node_states or {},
+        logs=[],
+        errors=[],
+        communication_log=[],
+        save=AsyncMock()
+    )
+
+
+class TestTimerService:
+    """Local index wakes runs in wake-up order"""
+
+    @pytest.mark.asyncio
+    async def test_due_runs_in_order(self):
+        timers = TimerService()
+        now = datetime.utcnow()
+        await timers.schedule("later", now + timedelta(hours=1))
+        await timers.schedule("second", now - timedelta(seconds=1))
+        await timers.schedule("first", now - timedelta(seconds=5))
+        await timers.schedule("cancelled", now - timedelta(seconds=3))
+        await timers.cancel("cancelled")
+
+        assert await timers.due() == ["first", "second"]
+        assert await timers.due() == []
+        assert await timers.due(now=time.time() + 7200) == ["later"]
+
+    @pytest.mark.asyncio
+    async def test_failed_wake_is_retried(self):
+        timers = TimerService(poll_interval=0)
+        wake = AsyncMock(side_effect=[ConnectionError("mongo down"), True])
+        timers._wake = wake
+        await timers.schedule("run-1", datetime.utcnow())
+
+        assert await timers.tick() == []
+        assert await timers.tick() == ["run-1"]
+        stats = await timers.get_stats()
+        assert (stats["woken"], stats["wake_failures"], stats["pending"]) == (1, 1, 0)
+
+
+class TestParkedRuns:
+    """A long delay parks the run instead of sleeping in memory"""
+
+    WORKFLOW = SimpleNamespace(
+        id="wf-drip",
+        name="Drip campaign",
+        metadata=None,
+        nodes=[
+            make_node("start"),
+            make_node("wait", "delay", delay_seconds=3 * 24 * 3600),
+            make_node("follow-up", "end"),
+            make_node("audit", "end"),
+        ],
+        edges=[
+            Edge(**{"from": "start", "to": "wait"}),
+            Edge(**{"from": "wait", "to": "follow-up"}),
+            Edge(**{"from": "start", "to": "audit"}),
+        ]
+    )
+
+    @pytest.mark.asyncio
+    async def test_delay_parks_and_resumes(self):
+        executor = WorkflowExecutor()
+        run = make_run()
+
+        with patch("app.services.workflow_executor.timer_service.schedule", new_callable=AsyncMock) as schedule:
+            await executor.execute(self.WORKFLOW, run)
+
+        assert run.status == ExecutionStatus.WAITING
+        assert run.wake_at - datetime.utcnow() > timedelta(days=2)
+        schedule.assert_awaited_once_with("run-drip", run.wake_at)
+        assert run.node_states["wait"]["status"] == "waiting"
+        assert run.node_states["audit"]["status"] == "completed"
+        assert "follow-up" not in run.node_states
+        assert executor.active_contexts == {}
+
+        # Woken by the timer once due: the delay completes without sleeping again
+        run.node_states["wait"]["wake_at"] = (datetime.utcnow() - timedelta(seconds=1)).isoformat()
+        run.status = ExecutionStatus.QUEUED
+        await executor.execute(self.WORKFLOW, run)
+
+        assert run.status == ExecutionStatus.SUCCESS
+        assert run.node_states["wait"]["status"] == "completed"
+        assert run.node_states["follow-up"]["status"] == "completed"
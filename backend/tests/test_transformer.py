@@ -0,0 +1,164 @@
+"""
+Test cases for the vectorized transformer engine.
+"""
+
+import pytest
+
+from app.models.workflow import Node
+from app.services.execution.transformer import TransformError, apply_transforms
+from app.services.workflow_executor import workflow_executor
+
+
+USERS = [
+    {"_id": "u1", "name": "Ann", "age": 31, "plan": "pro"},
+    {"_id": "u2", "name": "Bob", "age": 17, "plan": "free"},
+    {"_id": "u3", "name": "Cid", "age": 45, "plan": "pro"},
+    {"_id": "u4", "name": "Dee", "plan": "team"},
+]
+
+ORDERS = [
+    {"user_id": "u1", "amount": 10},
+    {"user_id": "u1", "amount": 5},
+    {"user_id": "u3", "amount": 7},
+]
+
+CONTEXT = {"variables": {"min_age": 18}, "outputs": {"users": USERS, "orders": ORDERS}}
+
+
+def run(operations, records=USERS):
+    return apply_transforms(records, operations, CONTEXT)
+
+
+class TestTransforms:
+    """Individual operations over list-of-dict data"""
+
+    def test_select_rename_map(self):
+        result = run([
+            {"op": "select", "fields": ["name", "age"]},
+            {"op": "rename", "mapping": {"name": "full_name"}},
+            {"op": "map", "fields": {"label": "upper(full_name) + '!'", "adult": "age >= min_age"}}
+        ])
+        assert result[0] == {"full_name": "Ann", "age": 31, "label": "ANN!", "adult": True}
+        assert result[3] == {"full_name": "Dee", "age": None, "label": "DEE!", "adult": None}
+
+    def test_filter(self):
+        result = run([{"op": "filter", "condition": "age >= min_age and plan != 'free'"}])
+        assert [user["name"] for user in result] == ["Ann", "Cid"]
+
+    def test_group_by_and_aggregate(self):
+        result = run([{
+            "op": "group_by",
+            "by": "plan",
+            "aggregations": {
+                "users": "count",
+                "avg_age": {"field": "age", "func": "mean"},
+                "names": {"field": "name", "func": "list"},
+                "oldest": {"field": "age", "func": "max"}
+            }
+        }])
+        assert result == [
+            {"plan": "pro", "users": 2, "avg_age": 38.0, "names": ["Ann", "Cid"], "oldest": 45},
+            {"plan": "free", "users": 1, "avg_age": 17.0, "names": ["Bob"], "oldest": 17},
+            {"plan": "team", "users": 1, "avg_age": None, "names": ["Dee"], "oldest": None},
+        ]
+
+        total = apply_transforms(ORDERS, [
+            {"op": "aggregate", "aggregations": {"total": {"field": "amount", "func": "sum"}, "orders": "count"}}
+        ], CONTEXT)
+        assert total == [{"total": 22, "orders": 3}]
+
+    def test_join(self):
+        inner = run([
+            {"op": "join", "with": "orders", "on": {"left": "_id", "right": "user_id"}},
+            {"op": "select", "fields": ["name", "amount"]}
+        ])
+        assert inner == [
+            {"name": "Ann", "amount": 10},
+            {"name": "Ann", "amount": 5},
+            {"name": "Cid", "amount": 7},
+        ]
+
+        left = run([{"op": "join", "with": "orders", "on": {"left": "_id", "right": "user_id"}, "how": "left"}])
+        assert [(row["name"], row["amount"]) for row in left] == [
+            ("Ann", 10), ("Ann", 5), ("Bob", None), ("Cid", 7), ("Dee", None)
+        ]
+
+    def test_sort_and_limit(self):
+        result = run([
+            {"op": "sort", "by": ["plan", "name"], "descending": True},
+            {"op": "limit", "count": 2}
+        ])
+        assert [user["name"] for user in result] == ["Dee", "Cid"]
+
+    def test_sort_keeps_missing_values_last(self):
+        records = [{"name": "a", "score": 2}, {"name": "b", "score": None}, {"name": "c", "score": 5}]
+        for descending, expected in ((False, ["a", "c", "b"]), (True, ["c", "a", "b"])):
+            result = run([{"op": "sort", "by": "score", "descending": descending}], records)
+            assert [row["name"] for row in result] == expected
+
+        floats = [{"name": "a", "score": 0.5}, {"name": "b", "score": float("nan")}, {"name": "c", "score": 1.5}]
+        result = run([{"op": "sort", "by": "score", "descending": True}], floats)
+        assert [row["name"] for row in result] == ["c", "a", "b"]
+
+    def test_sort_orders_mixed_numbers_on_one_scale(self):
+        records = [{"score": score} for score in (3, None, 2.5, 1)]
+        ascending = run([{"op": "sort", "by": "score"}], records)
+        descending = run([{"op": "sort", "by": "score", "descending": True}], records)
+
+        assert [row["score"] for row in ascending] == [1, 2.5, 3, None]
+        assert [row["score"] for row in descending] == [3, 2.5, 1, None]
+
+    def test_ints_pass_through_mixed_columns_unchanged(self):
+        records = [{"id": 1, "score": 2}, {"id": 2, "score": 0.5}]
+        result = run([{"op": "sort", "by": "score"}, {"op": "select", "fields": ["id", "score"]}], records)
+
+        assert result == [{"id": 2, "score": 0.5}, {"id": 1, "score": 2}]
+        assert type(result[1]["score"]) is int
+        # Arithmetic over the column still works
+        doubled = run([{"op": "map", "fields": {"double": "score * 2"}}], records)
+        assert [row["double"] for row in doubled] == [4, 1]
+
+    def test_large_input(self):
+        records = [{"id": i, "group": i % 7, "value": i * 0.5} for i in range(50000)]
+        result = apply_transforms(records, [
+            {"op": "filter", "condition": "value >= 100"},
+            {"op": "group_by", "by": "group", "aggregations": {"n": "count", "total": {"field": "value", "func": "sum"}}},
+            {"op": "sort", "by": "group"}
+        ], CONTEXT)
+        assert len(result) == 7
+        assert sum(row["n"] for row in result) == 50000 - 200
+
+    def test_invalid_operation(self):
+        with pytest.raises(TransformError):
+            run([{"op": "explode"}])
+
+
+class TestTransformerNode:
+    """Executor transformer handler"""
+
+    @pytest.mark.asyncio
+    async def test_transformer_node_pipeline(self):
+        node = Node(id="t1", type="transformer", position={"x": 0, "y": 0}, config={
+            "source": "users",
+            "operations": [
+                {"op": "filter", "condition": "plan == 'pro'"},
+                {"op": "select", "fields": ["name"]}
+            ]
+        })
+
+        result = await workflow_executor._execute_transformer_node(node, CONTEXT)
+
+        assert result["status"] == "completed"
+        assert result["output"] == [{"name": "Ann"}, {"name": "Cid"}]
+
+    @pytest.mark.asyncio
+    async def test_transformer_node_single_operation(self):
+        node = Node(id="t2", type="transformer", position={"x": 0, "y": 0}, config={
+            "source": "users",
+            "transform_type": "select",
+            "fields": ["_id"]
+        })
+
+        result = await workflow_executor._execute_transformer_node(node, CONTEXT)
+
+        assert result["output"] == [{"_id": user["_id"]} for user in USERS]
@@ -0,0 +1,197 @@
+"""
+Test cases for WorkflowExecutor run orchestration.
+
+Workflows and runs are lightweight stand-ins so the executor can be exercised
+without a MongoDB connection.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from datetime import datetime
+
+from app.models.workflow import Node, Edge, ExecutionStatus
+from app.services.workflow_executor import WorkflowExecutor, WorkflowExecutionError
+
+
+def make_workflow(workflow_id, nodes, edges, **options):
+    return SimpleNamespace(
+        id=workflow_id,
+        name=f"Workflow {workflow_id}",
+        nodes=nodes,
+        edges=[Edge(**{"from": source, "to": target}) for source, target in edges],
+        metadata=options or None
+    )
+
+
+def make_run(execution_id, variables=None):
+    return SimpleNamespace(
+        id=None,
+        execution_id=execution_id,
+        status=ExecutionStatus.QUEUED,
+        start_time=datetime.utcnow(),
+        end_time=None,
+        variables=variables or {},
+        node_states={},
+        logs=[],
+        errors=[],
+        communication_log=[],
+        save=AsyncMock()
+    )
+
+
+def make_node(node_id, node_type="transformer", **config):
+    return Node(id=node_id, type=node_type, position={"x": 0, "y": 0}, config=config)
+
+
+class TestConcurrentRuns:
+    """Concurrent runs on one executor must not share state"""
+
+    @pytest.mark.asyncio
+    async def test_runs_are_isolated(self):
+        executor = WorkflowExecutor()
+        seen = {}
+
+        async def fake_execute_node(node, context, run):
+            await executor.set_shared_context(node.id, "owner", run.execution_id)
+            await asyncio.sleep(0.05)
+            seen[run.execution_id] = (
+                executor.current_run.execution_id,
+                executor.get_shared_context("owner"),
+                set(executor.node_registry)
+            )
+            return {"status": "completed", "output": context["variables"]["name"]}
+
+        workflow_a = make_workflow("wf-a", [make_node("a1")], [])
+        workflow_b = make_workflow("wf-b", [make_node("b1")], [])
+        run_a = make_run("run-a", {"name": "alice"})
+        run_b = make_run("run-b", {"name": "bob"})
+
+        with patch.object(executor, "_execute_node", side_effect=fake_execute_node):
+            await asyncio.gather(
+                executor.execute(workflow_a, run_a),
+                executor.execute(workflow_b, run_b)
+            )
+
+        assert seen["run-a"] == ("run-a", "run-a", {"a1"})
+        assert seen["run-b"] == ("run-b", "run-b", {"b1"})
+        assert run_a.node_states["a1"]["output"] == "alice"
+        assert run_b.node_states["b1"]["output"] == "bob"
+        assert run_a.status == ExecutionStatus.SUCCESS
+        assert run_b.status == ExecutionStatus.SUCCESS
+        assert executor.active_contexts == {}
+        assert executor.current_run is None
+
+
+class TestBranching:
+    """Condition nodes choose which branch of the workflow runs"""
+
+    @pytest.mark.asyncio
+    async def test_untaken_branch_is_recorded_as_skipped(self):
+        executor = WorkflowExecutor()
+        workflow = make_workflow(
+            "wf-branch",
+            [
+                make_node("check", "condition", condition="amount > 100"),
+                make_node("approve", "end"),
+                make_node("reject", "end")
+            ],
+            []
+        )
+        workflow.edges = [
+            Edge(**{"from": "check", "to": "approve", "branch": "true"}),
+            Edge(**{"from": "check", "to": "reject", "branch": "false"})
+        ]
+        run = make_run("run-branch", {"amount": 250})
+
+        await executor.execute(workflow, run)
+
+        assert run.node_states["check"]["branch"] == "true"
+        assert run.node_states["approve"]["status"] == "completed"
+        assert run.node_states["reject"]["status"] == "skipped"
+        assert run.status == ExecutionStatus.SUCCESS
+
+
+class TestNodeTimeout:
+    """The whole-node budget is separate from node settings named timeout"""
+
+    @pytest.mark.asyncio
+    async def test_node_timeout_bounds_the_node(self):
+        executor = WorkflowExecutor()
+
+        async def slow_execute_node(node, context, run):
+            await asyncio.sleep(0.05)
+            return {"status": "completed", "output": node.id}
+
+        workflow = make_workflow(
+            "wf-timeout",
+            [
+                make_node("hook", "webhook", url="https://example.com/hook", timeout=0.01),
+                make_node("slow", node_timeout=0.01)
+            ],
+            [("hook", "slow")]
+        )
+        run = make_run("run-timeout")
+
+        with patch.object(executor, "_execute_node", side_effect=slow_execute_node):
+            with pytest.raises(WorkflowExecutionError, match="slow execution timeout"):
+                await executor.execute(workflow, run)
+
+        assert run.node_states["hook"]["status"] == "completed"
+        assert "slow" not in run.node_states
+        assert run.status == ExecutionStatus.ERROR
+
+
+class TestCheckpointResume:
+    """Completed nodes of an earlier attempt are restored, not executed again"""
+
+    @pytest.mark.asyncio
+    async def test_resume_runs_only_incomplete_nodes(self):
+        executor = WorkflowExecutor()
+        executed = []
+
+        async def fake_execute_node(node, context, run):
+            executed.append(node.id)
+            return {"status": "completed", "output": f"{context['outputs'].get('llm')}-sent"}
+
+        workflow = make_workflow(
+            "wf-resume",
+            [make_node("llm"), make_node("webhook"), make_node("end")],
+            [("llm", "webhook"), ("webhook", "end")]
+        )
+        run = make_run("run-resume")
+        run.node_states = {
+            "llm": {"status": "completed", "output": "summary"},
+            "webhook": {"status": "error", "error": "timeout"}
+        }
+
+        with patch.object(executor, "_execute_node", side_effect=fake_execute_node):
+            await executor.execute(workflow, run)
+
+        assert executed == ["webhook", "end"]
+        assert run.node_states["webhook"]["output"] == "summary-sent"
+        assert run.status == ExecutionStatus.SUCCESS
+
+    @pytest.mark.asyncio
+    async def test_interrupted_run_is_left_resumable(self):
+        executor = WorkflowExecutor()
+        started = asyncio.Event()
+
+        async def slow_execute_node(node, context, run):
+            started.set()
+            await asyncio.sleep(60)
+
+        workflow = make_workflow("wf-interrupt", [make_node("slow")], [])
+        run = make_run("run-interrupt")
+
+        with patch.object(executor, "_execute_node", side_effect=slow_execute_node):
+            task = asyncio.create_task(executor.execute(workflow, run))
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert run.status == ExecutionStatus.PAUSED
+        assert isinstance(run.interrupted_at, datetime)
+        assert executor.active_contexts == {}